@@ -1,5 +1,14 @@
-from . import core, parsing
+import importlib
+from types import ModuleType
 
 __all__ = ["parsing", "core"]
 
 __version__ = "0.0.0-dev0"
+
+
+def __getattr__(name: str) -> ModuleType:
+    # subpackages are imported on first access, `import sirocco.parsing` does not import the core
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
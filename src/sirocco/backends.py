@@ -0,0 +1,43 @@
+"""
+Backends turning the unrolled workflow into something else, registered as entry points
+
+The backends depend on optional packages (AiiDA for `workgraph`, graphviz for `vizgraph`) and are only imported
+when loaded, so that `sirocco.parsing` and `sirocco.core` stay light. Other packages can provide backends by
+registering a module in the `sirocco.backends` entry point group.
+"""
+
+from functools import cache
+from importlib.metadata import EntryPoint, entry_points
+from types import ModuleType
+
+BACKENDS_GROUP = "sirocco.backends"
+
+
+@cache
+def _entry_points() -> dict[str, EntryPoint]:
+    return {entry_point.name: entry_point for entry_point in entry_points(group=BACKENDS_GROUP)}
+
+
+def available_backends() -> list[str]:
+    """Names of the registered backends, whether their optional dependencies are installed or not"""
+    return sorted(_entry_points())
+
+
+def load_backend(name: str) -> ModuleType:
+    """
+    Import the module of a backend
+
+    Raises a KeyError for unknown backends and an ImportError naming the extra to install
+    if optional dependencies are missing.
+    """
+    if (entry_point := _entry_points().get(name)) is None:
+        msg = f"Unknown backend {name!r}, available backends are {available_backends()}."
+        raise KeyError(msg)
+    try:
+        return entry_point.load()
+    except ImportError as e:
+        if not entry_point.extras:
+            raise
+        extras = ",".join(entry_point.extras)
+        msg = f"Backend {name!r} requires optional dependencies, install them with `pip install 'sirocco[{extras}]'`."
+        raise ImportError(msg) from e
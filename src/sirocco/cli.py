@@ -1,13 +1,23 @@
+import sys
+from contextlib import nullcontext
+from datetime import datetime
+from enum import Enum
+from io import StringIO
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import typer
-from aiida.manage.configuration import load_profile
 from rich.console import Console
 from rich.traceback import install as install_rich_traceback
+from ruamel.yaml import YAML
 
-from sirocco import core, parsing, pretty_print, vizgraph
-from sirocco.workgraph import AiidaWorkGraph
+from sirocco import backends
+
+# Each command imports the modules it needs, so that the help, shell completion and the commands
+# which do not run the workflow neither wait for nor require AiiDA and graphviz.
+if TYPE_CHECKING:
+    from sirocco import core
+    from sirocco.workgraph import AiidaWorkGraph
 
 # --- Typer App and Rich Console Setup ---
 # Print tracebacks with syntax highlighting and rich formatting
@@ -21,22 +31,126 @@ app = typer.Typer(
 
 # Create a Rich console instance for printing
 console = Console()
+# Status messages go to stderr when stdout carries data
+err_console = Console(stderr=True)
+
+# --- Options shared between commands ---
+
+TargetsOption = Annotated[
+    list[str] | None,
+    typer.Option(
+        "--target",
+        "-t",
+        help="Name of a task or data to produce. Only the part of the workflow it depends on is considered. "
+        "Can be repeated.",
+    ),
+]
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]
+StartOption = Annotated[
+    datetime | None,
+    typer.Option("--from", formats=DATE_FORMATS, help="Only consider cycle points starting from this date."),
+]
+StopOption = Annotated[
+    datetime | None,
+    typer.Option("--to", formats=DATE_FORMATS, help="Only consider cycle points starting before this date."),
+]
+TasksOption = Annotated[
+    list[str] | None,
+    typer.Option("--task", help="Name of a task to consider. Can be repeated."),
+]
+ParametersOption = Annotated[
+    list[str] | None,
+    typer.Option("--param", help="Parameter value to consider, given as 'name=value'. Can be repeated."),
+]
+ExtendOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--extend",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Previous version of the workflow file, whose stop dates were moved forward. "
+        "Only the new cycle points are considered.",
+    ),
+]
+
+
+class VisualizeFormat(str, Enum):
+    SVG = "svg"
+    HTML = "html"
+
+
+class RepresentFormat(str, Enum):
+    TEXT = "text"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
+def parse_parameter_values(specs: list[str] | None) -> dict[str, list] | None:
+    """Convert 'name=value' specifications to parameter values, parsing values as in the config file."""
+    if specs is None:
+        return None
+    reader = YAML(typ="safe", pure=True)
+    parameter_values: dict[str, list] = {}
+    for spec in specs:
+        name, sep, value = spec.partition("=")
+        if not sep:
+            msg = f"Parameter specification {spec!r} is not of the form 'name=value'."
+            raise typer.BadParameter(msg)
+        parameter_values.setdefault(name.strip(), []).append(reader.load(StringIO(value)))
+    return parameter_values
+
+
+def workflow_scope(
+    targets: list[str] | None = None,
+    start: datetime | None = None,
+    stop: datetime | None = None,
+    tasks: list[str] | None = None,
+    parameters: list[str] | None = None,
+) -> dict[str, Any]:
+    """Keyword arguments restricting the unrolled part of the workflow, see core.Workflow."""
+    return {
+        "targets": targets,
+        "start": start,
+        "stop": stop,
+        "task_names": tasks,
+        "parameter_values": parse_parameter_values(parameters),
+    }
+
+
+def create_core_workflow(workflow_file: Path, extend: Path | None = None, **scope: Any) -> "core.Workflow":
+    """Helper to unroll the workflow file, possibly as an extension of a previous version of it."""
+    from sirocco import core, parsing
+
+    config_workflow = parsing.ConfigWorkflow.from_config_file(str(workflow_file))
+    if extend is None:
+        return core.Workflow.from_config_workflow(config_workflow, **scope)
+    previous_config_workflow = parsing.ConfigWorkflow.from_config_file(str(extend))
+    return core.Workflow.from_config_extension(previous_config_workflow, config_workflow, **scope)
 
 
-def _create_aiida_workflow(workflow_file: Path) -> AiidaWorkGraph:
+def _create_aiida_workflow(workflow_file: Path, extend: Path | None = None, **scope: Any) -> "AiidaWorkGraph":
+    workgraph = backends.load_backend("workgraph")
+    from aiida.manage.configuration import load_profile
+
     load_profile()
-    config_workflow = parsing.ConfigWorkflow.from_config_file(str(workflow_file))
-    core_wf = core.Workflow.from_config_workflow(config_workflow)
-    return AiidaWorkGraph(core_wf)
+    core_wf = create_core_workflow(workflow_file, extend=extend, **scope)
+    return workgraph.AiidaWorkGraph(core_wf)
 
 
-def create_aiida_workflow(workflow_file: Path) -> AiidaWorkGraph:
+def create_aiida_workflow(workflow_file: Path, extend: Path | None = None, **scope: Any) -> "AiidaWorkGraph":
     """Helper to prepare AiidaWorkGraph from workflow file."""
 
+    try:
+        backends.load_backend("workgraph")
+    except ImportError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1) from e
     from aiida.common import ProfileConfigurationError
 
     try:
-        aiida_wg = _create_aiida_workflow(workflow_file=workflow_file)
+        aiida_wg = _create_aiida_workflow(workflow_file=workflow_file, extend=extend, **scope)
         console.print(f"⚙️ Workflow [magenta]'{aiida_wg._workgraph.name}'[/magenta] prepared for AiiDA execution.")  # noqa: SLF001 | private-member-access
         return aiida_wg  # noqa: TRY300 | try-consider-else -> shouldn't move this to `else` block
     except ProfileConfigurationError as e:
@@ -72,6 +186,8 @@ def verify(
     """
     console.print(f"🔍 Verifying workflow file: [cyan]{workflow_file!s}[/cyan]")
     try:
+        from sirocco import parsing
+
         # Attempt to load and validate the configuration
         parsing.ConfigWorkflow.from_config_file(str(workflow_file))
         console.print("[green]✅ Workflow definition is valid.[/green]")
@@ -95,6 +211,7 @@ def visualize(
             help="Path to the workflow definition YAML file.",
         ),
     ],
+    *,
     output_file: Annotated[
         Path | None,
         typer.Option(
@@ -103,34 +220,102 @@ def visualize(
             writable=True,
             file_okay=True,
             dir_okay=False,
-            help="Optional path to save the output SVG file.",
+            help="Optional path to save the output SVG or HTML file.",
+        ),
+    ] = None,
+    output_format: Annotated[
+        VisualizeFormat,
+        typer.Option(
+            "--format",
+            "-f",
+            case_sensitive=False,
+            help="SVG laid out by graphviz, or self-contained HTML viewer rendering the visible region only, "
+            "for large workflows.",
+        ),
+    ] = VisualizeFormat.SVG,
+    collapse: Annotated[
+        bool,
+        typer.Option(
+            "--collapse",
+            help="Collapse the cycle points of each cycle into one representative cycle, "
+            "with instance counts and lags. Recommended for large workflows. "
+            "With the HTML format, all cycles start collapsed.",
+        ),
+    ] = False,
+    collapsed_parameters: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--collapse-param",
+            help="Name of a parameter whose values are collapsed into a single node. Implies --collapse. "
+            "Can be repeated.",
+        ),
+    ] = None,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--cache-dir",
+            envvar="SIROCCO_VIZ_CACHE_DIR",
+            file_okay=False,
+            dir_okay=True,
+            help="Directory of rendered SVG files, reused as long as the workflow and the rendering are unchanged.",
         ),
     ] = None,
+    processes: Annotated[
+        int | None,
+        typer.Option(
+            "--processes",
+            "-j",
+            min=1,
+            help="Lay out each cycle on its own in a pool of this many processes and place the cycles along "
+            "the time axis. Scales to many cycles, at the price of a less compact layout.",
+        ),
+    ] = None,
+    targets: TargetsOption = None,
+    start: StartOption = None,
+    stop: StopOption = None,
+    tasks: TasksOption = None,
+    parameters: ParametersOption = None,
+    extend: ExtendOption = None,
 ):
     """
-    Generate an interactive SVG visualization of the unrolled workflow.
+    Generate an interactive SVG or HTML visualization of the unrolled workflow.
     """
     console.print(f"📊 Visualizing workflow from: [cyan]{workflow_file!s}[/cyan]")
     try:
-        # Load configuration
-        config_workflow = parsing.ConfigWorkflow.from_config_file(str(workflow_file))
-
-        # Create the core workflow representation (unrolls parameters/cycles)
-        core_workflow = core.Workflow.from_config_workflow(config_workflow)
-
-        # Create the visualization graph
-        viz_graph = vizgraph.VizGraph.from_core_workflow(core_workflow)
+        # Load configuration and create the core workflow representation (unrolls parameters/cycles)
+        core_workflow = create_core_workflow(
+            workflow_file, extend=extend, **workflow_scope(targets, start, stop, tasks, parameters)
+        )
 
         # Determine output path
-        output_path = workflow_file.parent / f"{core_workflow.name}.svg" if output_file is None else output_file
+        default_path = workflow_file.parent / f"{core_workflow.name}.{output_format.value}"
+        output_path = default_path if output_file is None else output_file
 
         # Ensure the output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Draw the graph
-        viz_graph.draw(file_path=output_path)
+        if output_format is VisualizeFormat.HTML:
+            from sirocco import graph_viewer
+
+            # the graph is laid out in the browser
+            graph_viewer.write_html(core_workflow, output_path, collapsed=collapse)
+            cached = False
+        else:
+            vizgraph = backends.load_backend("vizgraph")
+
+            # Create the visualization graph
+            if collapse or collapsed_parameters:
+                viz_graph = vizgraph.CollapsedVizGraph.from_core_workflow(
+                    core_workflow, collapsed_parameters=collapsed_parameters or ()
+                )
+            else:
+                viz_graph = vizgraph.VizGraph.from_core_workflow(core_workflow)
 
-        console.print(f"[green]✅ Visualization saved to:[/green] [cyan]{output_path.resolve()}[/cyan]")
+            # Draw the graph, or take it from the cache
+            cached = viz_graph.draw(file_path=output_path, cache_dir=cache_dir, processes=processes)
+
+        from_cache = " (from cache)" if cached else ""
+        console.print(f"[green]✅ Visualization saved to{from_cache}:[/green] [cyan]{output_path.resolve()}[/cyan]")
 
     except Exception as e:
         console.print("[bold red]❌ Failed to generate visualization:[/bold red]")
@@ -151,22 +336,115 @@ def represent(
             help="Path to the workflow definition YAML file.",
         ),
     ],
+    output_format: Annotated[
+        RepresentFormat,
+        typer.Option(
+            "--format",
+            "-f",
+            case_sensitive=False,
+            help="Text representation, or one record per task, data and edge as JSON Lines or Parquet.",
+        ),
+    ] = RepresentFormat.TEXT,
+    output_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--output",
+            "-o",
+            writable=True,
+            file_okay=True,
+            dir_okay=False,
+            help="Path to save the representation to, required for Parquet. Defaults to stdout.",
+        ),
+    ] = None,
+    targets: TargetsOption = None,
+    start: StartOption = None,
+    stop: StopOption = None,
+    tasks: TasksOption = None,
+    parameters: ParametersOption = None,
+    extend: ExtendOption = None,
 ):
     """
-    Display the text representation of the unrolled workflow graph.
+    Display the text representation of the unrolled workflow graph, or export it as records.
     """
-    console.print(f"📄 Representing workflow from: [cyan]{workflow_file}[/cyan]")
+    status_console = console if output_format is RepresentFormat.TEXT and output_file is None else err_console
+    status_console.print(f"📄 Representing workflow from: [cyan]{workflow_file}[/cyan]")
+    parquet_file: Path | None = None
+    if output_format is RepresentFormat.PARQUET:
+        if output_file is None:
+            msg = "Writing Parquet requires an output file."
+            raise typer.BadParameter(msg, param_hint="--output")
+        parquet_file = output_file
     try:
-        config_workflow = parsing.ConfigWorkflow.from_config_file(str(workflow_file))
-        core_workflow = core.Workflow.from_config_workflow(config_workflow)
+        core_workflow = create_core_workflow(
+            workflow_file, extend=extend, **workflow_scope(targets, start, stop, tasks, parameters)
+        )
+
+        if parquet_file is not None:
+            from sirocco import export as sirocco_export
+
+            parquet_file.parent.mkdir(parents=True, exist_ok=True)
+            sirocco_export.write_parquet(core_workflow, parquet_file)
+        else:
+            with nullcontext(sys.stdout) if output_file is None else output_file.open("w") as sink:
+                if output_format is RepresentFormat.JSONL:
+                    from sirocco import export as sirocco_export
 
-        printer = pretty_print.PrettyPrinter(colors=False)
-        output_from_printer = printer.format(core_workflow)
+                    sirocco_export.write_jsonl(core_workflow, sink)
+                else:
+                    from sirocco import pretty_print
 
-        console.print(output_from_printer)
+                    # stream the representation rather than building it as a whole
+                    printer = pretty_print.PrettyPrinter(colors=False)
+                    printer.write(core_workflow, sink)
+                    sink.write("\n")
+        if output_file is not None:
+            status_console.print(f"[green]✅ Representation saved to:[/green] [cyan]{output_file.resolve()}[/cyan]")
 
     except Exception as e:
-        console.print("[bold red]❌ Failed to represent workflow:[/bold red]")
+        status_console.print("[bold red]❌ Failed to represent workflow:[/bold red]")
+        status_console.print_exception()
+        raise typer.Exit(code=1) from e
+
+
+@app.command()
+def diff(
+    old_workflow_file: Annotated[
+        Path,
+        typer.Argument(
+            ...,
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+            help="Path to the previous version of the workflow definition YAML file.",
+        ),
+    ],
+    new_workflow_file: Annotated[
+        Path,
+        typer.Argument(
+            ...,
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+            help="Path to the new version of the workflow definition YAML file.",
+        ),
+    ],
+):
+    """
+    Show the tasks, data, edges and namelist entries added, removed or modified between two workflow versions.
+    """
+    console.print(f"🔀 Comparing [cyan]{old_workflow_file}[/cyan] to [cyan]{new_workflow_file}[/cyan]")
+    try:
+        from sirocco import diff as sirocco_diff
+
+        workflow_diff = sirocco_diff.diff_workflows(
+            create_core_workflow(old_workflow_file), create_core_workflow(new_workflow_file)
+        )
+        console.print(workflow_diff.format(), markup=False, highlight=False)
+
+    except Exception as e:
+        console.print("[bold red]❌ Failed to compare workflows:[/bold red]")
         console.print_exception()
         raise typer.Exit(code=1) from e
 
@@ -184,8 +462,16 @@ def run(
             help="Path to the workflow definition YAML file.",
         ),
     ],
+    targets: TargetsOption = None,
+    start: StartOption = None,
+    stop: StopOption = None,
+    tasks: TasksOption = None,
+    parameters: ParametersOption = None,
+    extend: ExtendOption = None,
 ):
-    aiida_wg = create_aiida_workflow(workflow_file)
+    aiida_wg = create_aiida_workflow(
+        workflow_file, extend=extend, **workflow_scope(targets, start, stop, tasks, parameters)
+    )
     console.print(
         f"▶️ Running workflow [magenta]'{aiida_wg._core_workflow.name}'[/magenta] directly (blocking)..."  # noqa: SLF001 | private-member-access
     )
@@ -211,10 +497,18 @@ def submit(
             help="Path to the workflow definition YAML file.",
         ),
     ],
+    targets: TargetsOption = None,
+    start: StartOption = None,
+    stop: StopOption = None,
+    tasks: TasksOption = None,
+    parameters: ParametersOption = None,
+    extend: ExtendOption = None,
 ):
     """Submit the workflow to the AiiDA daemon."""
 
-    aiida_wg = create_aiida_workflow(workflow_file)
+    aiida_wg = create_aiida_workflow(
+        workflow_file, extend=extend, **workflow_scope(targets, start, stop, tasks, parameters)
+    )
     try:
         console.print(
             f"🚀 Submitting workflow [magenta]'{aiida_wg._core_workflow.name}'[/magenta] to AiiDA daemon..."  # noqa: SLF001 | private-member-access
@@ -1,13 +1,28 @@
 from ._tasks import IconTask, ShellTask
-from .graph_items import AvailableData, Cycle, Data, GeneratedData, GraphItem, MpiCmdPlaceholder, Task
-from .workflow import Workflow
+from .coordinates import Coordinates
+from .graph_arrays import GraphArrays
+from .graph_items import (
+    AvailableData,
+    Cycle,
+    Data,
+    ExistingData,
+    GeneratedData,
+    GraphItem,
+    MpiCmdPlaceholder,
+    Task,
+)
+from .workflow import LazyWorkflow, Workflow
 
 __all__ = [
     "Workflow",
+    "LazyWorkflow",
     "GraphItem",
+    "Coordinates",
+    "GraphArrays",
     "Data",
     "AvailableData",
     "GeneratedData",
+    "ExistingData",
     "Task",
     "Cycle",
     "ShellTask",
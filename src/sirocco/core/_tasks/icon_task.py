@@ -9,8 +9,11 @@ from sirocco.parsing import yaml_data_models as models
 from sirocco.parsing.cycling import DateCyclePoint
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
+    from sirocco.core.graph_items import Data, Store
+
 
 @dataclass(kw_only=True)
 class IconTask(models.ConfigIconTaskSpecs, Task):
@@ -66,6 +69,17 @@ class IconTask(models.ConfigIconTaskSpecs, Task):
         # restart port must be present and nonempty
         return bool(self.inputs.get(self._AIIDA_ICON_RESTART_FILE_PORT_NAME, False))
 
+    def iter_fingerprint_lines(self) -> Iterator[str]:
+        yield from super().iter_fingerprint_lines()
+        for namelist in self.namelists:
+            yield f"namelist {namelist.name}"
+            yield namelist.render()
+
+    def link_inputs(self, datastore: Store[Data]) -> None:
+        super().link_inputs(datastore)
+        # the restart settings depend on the inputs
+        self.update_icon_namelists_from_workflow()
+
     def update_icon_namelists_from_workflow(self):
         if not isinstance(self.cycle_point, DateCyclePoint):
             msg = "ICON task must have a DateCyclePoint"
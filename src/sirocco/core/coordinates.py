@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DATE_DIM = "date"
+_EPOCH = datetime(1970, 1, 1)  # noqa: DTZ001 config dates are naive
+_MICROSECOND = timedelta(microseconds=1)
+
+
+_DATE_CACHE_SIZE = 1 << 16
+
+
+class _Axis:
+    """
+    Table of the values taken along one coordinate dimension, shared by all coordinates
+
+    Values are keyed by type as well, so that equal values of different types, such as 3 and 3.0 or 1 and True,
+    keep their own code and are decoded as given.
+    """
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self) -> None:
+        self.codes: dict[tuple[type, Any], int] = {}
+        self.values: list[Any] = []
+
+    def encode(self, value: Any) -> int:
+        key = (type(value), value)
+        if (code := self.codes.get(key)) is None:
+            code = self.codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> Any:
+        return self.values[code]
+
+    def lookup(self, value: Any) -> int | None:
+        """Code of value if it has one, without adding it to the table"""
+        try:
+            return self.codes.get((type(value), value))
+        except TypeError:  # unhashable values have no code
+            return None
+
+
+class _DateAxis(_Axis):
+    """
+    Dates are encoded as int64 microseconds since the epoch, which keeps codes ordered like dates
+
+    Codes are computed rather than stored, so that the table doesn't grow with the dates of all the workflows
+    of a process, only recent conversions are cached. Dates are decoded as naive UTC datetimes.
+    """
+
+    __slots__ = ()
+
+    def encode(self, value: Any) -> int:
+        return _encode_date(value)
+
+    def decode(self, code: int) -> datetime:
+        return _decode_date(code)
+
+    def lookup(self, value: Any) -> int | None:
+        return _encode_date(value) if isinstance(value, datetime) else None
+
+
+@lru_cache(maxsize=_DATE_CACHE_SIZE)
+def _encode_date(value: Any) -> int:
+    if not isinstance(value, datetime):
+        msg = f"coordinate {DATE_DIM!r} must be a datetime, got {value!r}"
+        raise TypeError(msg)
+    naive = value if value.tzinfo is None else value.astimezone(UTC).replace(tzinfo=None)
+    return (naive - _EPOCH) // _MICROSECOND
+
+
+@lru_cache(maxsize=_DATE_CACHE_SIZE)
+def _decode_date(code: int) -> datetime:
+    return _EPOCH + code * _MICROSECOND
+
+
+_AXES: dict[str, _Axis] = {DATE_DIM: _DateAxis()}
+_DIMS: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def axis(dim: str) -> _Axis:
+    if (dim_axis := _AXES.get(dim)) is None:
+        dim_axis = _AXES[dim] = _Axis()
+    return dim_axis
+
+
+def encode(dim: str, value: Any) -> int:
+    """Integer code of value along dimension dim"""
+    return axis(dim).encode(value)
+
+
+def decode(dim: str, code: int) -> Any:
+    """Value of the integer code along dimension dim"""
+    return _AXES[dim].decode(code)
+
+
+class Coordinates(Mapping[str, Any]):
+    """
+    Frozen and hashable coordinates of a graph item
+
+    Values are stored as integer codes into per dimension tables, dates as microseconds since the epoch.
+    It behaves as a read-only dict, including its representation, except that values are compared by type
+    and value like the codes, whether with other coordinates or with mappings.
+
+    Example:
+
+        >>> coordinates = Coordinates({"foo": 0, "date": datetime(2026, 1, 1)})
+        >>> coordinates
+        {'foo': 0, 'date': datetime.datetime(2026, 1, 1, 0, 0)}
+        >>> coordinates["date"], coordinates.codes[1]
+        (datetime.datetime(2026, 1, 1, 0, 0), 1767225600000000)
+        >>> coordinates == {"date": datetime(2026, 1, 1), "foo": 0}
+        True
+        >>> coordinates == {"date": datetime(2026, 1, 1), "foo": 0.0}
+        False
+    """
+
+    __slots__ = ("_codes", "_dims", "_hash")
+
+    def __init__(self, values: Mapping[str, Any] | None = None) -> None:
+        values = {} if values is None else values
+        dims = tuple(values)
+        self._dims: tuple[str, ...] = _DIMS.setdefault(dims, dims)
+        self._codes: tuple[int, ...] = tuple(axis(dim).encode(value) for dim, value in values.items())
+
+    @classmethod
+    def from_codes(cls, dims: tuple[str, ...], codes: tuple[int, ...]) -> Coordinates:
+        """Build coordinates from codes obtained with `encode`, skipping the encoding"""
+        new = object.__new__(cls)
+        new._dims = _DIMS.setdefault(dims, dims)  # noqa: SLF001 alternative constructor, bypassing __init__
+        new._codes = codes  # noqa: SLF001 same as above
+        return new
+
+    @property
+    def dims(self) -> tuple[str, ...]:
+        return self._dims
+
+    @property
+    def codes(self) -> tuple[int, ...]:
+        return self._codes
+
+    def __getitem__(self, dim: str) -> Any:
+        try:
+            index = self._dims.index(dim)
+        except ValueError:
+            raise KeyError(dim) from None
+        return _AXES[dim].decode(self._codes[index])
+
+    def __contains__(self, dim: object) -> bool:
+        return dim in self._dims
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dims)
+
+    def __len__(self) -> int:
+        return len(self._dims)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Coordinates):
+            if self._dims is other._dims:
+                return self._codes == other._codes
+            return dict(zip(self._dims, self._codes, strict=True)) == dict(zip(other._dims, other._codes, strict=True))
+        if isinstance(other, Mapping):
+            return len(other) == len(self._dims) and all(
+                dim in other and _AXES[dim].lookup(other[dim]) == code
+                for dim, code in zip(self._dims, self._codes, strict=True)
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:  # computed on first use only
+            self._hash: int = hash(frozenset(zip(self._dims, self._codes, strict=True)))
+            return self._hash
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self) -> tuple[type[Coordinates], tuple[dict[str, Any]]]:
+        # codes are only valid in the tables of the current process
+        return (Coordinates, (dict(self.items()),))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+from itertools import chain
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from sirocco.core.graph_items import Cycle, Data, GraphItem, Task
+
+
+def node_key(item: GraphItem) -> str:
+    """Name and coordinates identifying a node within its kind"""
+    return f"{item.name}{dict(item.coordinates.items())!r}"
+
+
+def iter_edges(task: Task) -> Iterator[tuple[str, str | None, GraphItem]]:
+    """Edges of a task as (kind, port, neighbour), kind being one of input, output and wait_on"""
+    for port, data in task.input_data_items():
+        yield "input", port, data
+    for output_port, data in task.output_data_items():
+        yield "output", output_port, data
+    for waited in task.wait_on:
+        yield "wait_on", None, waited
+
+
+def _digest(lines: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for line in lines:
+        digest.update(line.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class Fingerprints:
+    """
+    Merkle-style hashes of an unrolled workflow, computed while it is unrolled and linked
+
+    The hash of a task covers the task itself, see `GraphItem.iter_fingerprint_lines`, and the ports and
+    hashes of its inputs and of the tasks it waits on. The hash of a data node covers the node itself and, for
+    generated data, the port and the hash of its producer. A node hash thus covers everything upstream of the
+    node, and a change of a task reaches the hashes of all the nodes depending on it.
+
+    Data which are not produced in the workflow are hashed when they are added, tasks when they are linked,
+    as soon as the hashes of their upstream nodes are known, and the data they produce right after them.
+    Cycle hashes combine the hashes of their tasks and of the data these produce, and the root hash combines
+    the cycle hashes with the hashes of the data produced outside of any cycle. Two workflows can thus be
+    compared from the root down to the cycles and nodes which differ.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: dict[int, str] = {}
+        # linked tasks waiting for the hashes of upstream nodes, by id of these nodes
+        self._blocked: dict[int, list[Task]] = {}
+        self._n_missing: dict[int, int] = {}
+
+    def add_source(self, data: Data) -> None:
+        """Hash data which is not produced in the workflow: available data and outputs of previous runs"""
+        ready: list[Task] = []
+        self._set(data, _digest(data.iter_fingerprint_lines()), ready)
+        self._hash_tasks(ready)
+
+    def add_task(self, task: Task) -> None:
+        """Hash a task whose inputs and wait_on tasks are linked, or once its upstream nodes are hashed"""
+        upstream = chain(task.input_data_nodes(), task.wait_on)
+        missing = {id(node) for node in upstream if id(node) not in self._hashes}
+        if not missing:
+            self._hash_tasks([task])
+            return
+        self._n_missing[id(task)] = len(missing)
+        for node_id in missing:
+            self._blocked.setdefault(node_id, []).append(task)
+
+    def _hash_tasks(self, ready: list[Task]) -> None:
+        # iterative rather than recursive, chains of restarts are as long as the cycling
+        while ready:
+            task = ready.pop()
+            task_hash = _digest(
+                chain(
+                    task.iter_fingerprint_lines(),
+                    (f"input {port} {self._hashes[id(data)]}" for port, data in task.input_data_items()),
+                    (f"wait_on {self._hashes[id(waited)]}" for waited in task.wait_on),
+                )
+            )
+            self._set(task, task_hash, ready)
+            for port, data in task.output_data_items():
+                self._set(data, _digest(chain(data.iter_fingerprint_lines(), [f"output {port} {task_hash}"])), ready)
+
+    def _set(self, node: Task | Data, node_hash: str, ready: list[Task]) -> None:
+        self._hashes[id(node)] = node_hash
+        for task in self._blocked.pop(id(node), ()):
+            self._n_missing[id(task)] -= 1
+            if not self._n_missing[id(task)]:
+                del self._n_missing[id(task)]
+                ready.append(task)
+
+    def __getitem__(self, node: Task | Data) -> str:
+        try:
+            return self._hashes[id(node)]
+        except KeyError:
+            msg = f"{node.name} {node.coordinates} has no fingerprint, it is not linked in the workflow"
+            raise KeyError(msg) from None
+
+    def cycle_hash(self, cycle: Cycle) -> str:
+        return _digest(
+            chain(
+                cycle.iter_fingerprint_lines(),
+                (self[task] for task in cycle.tasks),
+                (self[data] for task in cycle.tasks for data in task.output_data_nodes()),
+            )
+        )
+
+    def root_hash(self, cycles: Iterable[Cycle], data: Iterable[Data]) -> str:
+        cycles = list(cycles)
+        produced = {id(node) for cycle in cycles for task in cycle.tasks for node in task.output_data_nodes()}
+        return _digest(
+            chain(
+                (self.cycle_hash(cycle) for cycle in cycles),
+                (self[node] for node in data if id(node) not in produced),
+            )
+        )
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from sirocco.core.coordinates import DATE_DIM, decode
+from sirocco.core.graph_items import Task
+
+if TYPE_CHECKING:
+    from sirocco.core.graph_items import GraphItem
+    from sirocco.core.workflow import Workflow
+
+
+TASK_NODE = 0
+DATA_NODE = 1
+
+
+@dataclass(frozen=True, eq=False)
+class GraphArrays:
+    """
+    Unrolled graph of a workflow as flat NumPy arrays, for vectorized graph algorithms
+
+    Nodes are the tasks followed by the data, node ids being their positions in `nodes`. Per node arrays give
+    the type (TASK_NODE or DATA_NODE), the index of the name in `names`, the index of the cycle in the
+    iteration order of `Workflow.cycles` (-1 for data not produced in the workflow) and the coordinates along
+    `dims`, given as indices in the tables of `values` (-1 if missing, see also `has_coordinate`). Dates are
+    listed in chronological order and parameter values in order of appearance, so that the arrays only depend
+    on the workflow, not on the coordinate tables of the process they were built in.
+
+    Edges are stored in compressed sparse row (CSR) format, from the dependency to the dependent node:
+    the successors of node i are `data_indices[data_indptr[i]:data_indptr[i + 1]]`. Data edges go from input
+    data to consumer tasks and from producer tasks to output data, `wait_on` edges from the awaited tasks to
+    the waiting ones. All arrays are contiguous and can be shared with other processes without copy.
+    """
+
+    nodes: list[GraphItem]
+    names: tuple[str, ...]
+    dims: tuple[str, ...]
+    values: tuple[tuple[Any, ...], ...]
+    node_type: np.ndarray
+    name_index: np.ndarray
+    cycle_index: np.ndarray
+    coordinates: np.ndarray
+    has_coordinate: np.ndarray
+    data_indptr: np.ndarray
+    data_indices: np.ndarray
+    wait_on_indptr: np.ndarray
+    wait_on_indices: np.ndarray
+    _node_ids: dict[int, int] = field(repr=False)
+
+    @classmethod
+    def from_workflow(cls, workflow: Workflow) -> GraphArrays:
+        nodes: list[GraphItem] = [*workflow.tasks, *workflow.data]
+        node_ids = {id(node): node_id for node_id, node in enumerate(nodes)}
+        n_nodes = len(nodes)
+
+        names: dict[str, int] = {}
+        dims: dict[str, int] = {}
+        for node in nodes:
+            names.setdefault(node.name, len(names))
+            for dim in node.coordinates.dims:
+                dims.setdefault(dim, len(dims))
+
+        node_type = np.array([TASK_NODE if isinstance(node, Task) else DATA_NODE for node in nodes], dtype=np.int8)
+        name_index = np.array([names[node.name] for node in nodes], dtype=np.int32)
+        codes = np.zeros((n_nodes, len(dims)), dtype=np.int64)
+        has_coordinate = np.zeros((n_nodes, len(dims)), dtype=bool)
+        for node_id, node in enumerate(nodes):
+            columns = [dims[dim] for dim in node.coordinates.dims]
+            codes[node_id, columns] = node.coordinates.codes
+            has_coordinate[node_id, columns] = True
+        # recode from the process wide coordinate tables to tables of the workflow values
+        coordinates = np.full((n_nodes, len(dims)), -1, dtype=np.int64)
+        values = []
+        for dim, column in dims.items():
+            mask = has_coordinate[:, column]
+            unique_codes, first, inverse = np.unique(codes[mask, column], return_index=True, return_inverse=True)
+            # date codes are ordered like dates, other values are ordered by first appearance among the nodes
+            order = np.arange(len(unique_codes)) if dim == DATE_DIM else np.argsort(first, kind="stable")
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            coordinates[mask, column] = rank[inverse.ravel()]
+            values.append(tuple(decode(dim, int(code)) for code in unique_codes[order]))
+
+        cycle_index = np.full(n_nodes, -1, dtype=np.int32)
+        for index, cycle in enumerate(workflow.cycles):
+            for task in cycle.tasks:
+                cycle_index[node_ids[id(task)]] = index
+
+        data_edges: list[tuple[int, int]] = []
+        wait_on_edges: list[tuple[int, int]] = []
+        for task in workflow.tasks:
+            task_id = node_ids[id(task)]
+            data_edges.extend((node_ids[id(data)], task_id) for data in task.input_data_nodes())
+            for data in task.output_data_nodes():
+                data_id = node_ids[id(data)]
+                data_edges.append((task_id, data_id))
+                cycle_index[data_id] = cycle_index[task_id]
+            # awaited tasks pruned out of a partial workflow are not in it anymore
+            wait_on_edges.extend((node_ids[id(waited)], task_id) for waited in task.wait_on if id(waited) in node_ids)
+
+        data_indptr, data_indices = _to_csr(data_edges, n_nodes)
+        wait_on_indptr, wait_on_indices = _to_csr(wait_on_edges, n_nodes)
+        return cls(
+            nodes=nodes,
+            names=tuple(names),
+            dims=tuple(dims),
+            values=tuple(values),
+            node_type=node_type,
+            name_index=name_index,
+            cycle_index=cycle_index,
+            coordinates=coordinates,
+            has_coordinate=has_coordinate,
+            data_indptr=data_indptr,
+            data_indices=data_indices,
+            wait_on_indptr=wait_on_indptr,
+            wait_on_indices=wait_on_indices,
+            _node_ids=node_ids,
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def node_id(self, node: GraphItem) -> int:
+        """Position of node in the arrays"""
+        try:
+            return self._node_ids[id(node)]
+        except KeyError:
+            msg = f"node {node.name} {node.coordinates} is not part of the graph"
+            raise KeyError(msg) from None
+
+    def successors(self, node_id: int) -> np.ndarray:
+        """Ids of the nodes depending on node_id, through data and wait_on edges"""
+        return np.concatenate(
+            [
+                self.data_indices[self.data_indptr[node_id] : self.data_indptr[node_id + 1]],
+                self.wait_on_indices[self.wait_on_indptr[node_id] : self.wait_on_indptr[node_id + 1]],
+            ]
+        )
+
+
+def _to_csr(edges: list[tuple[int, int]], n_nodes: int) -> tuple[np.ndarray, np.ndarray]:
+    """Row pointers and column indices of the edges (source, target), keeping their order per source"""
+    if not edges:
+        return np.zeros(n_nodes + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    sources, targets = (np.array(column, dtype=np.int64) for column in zip(*edges, strict=True))
+    order = np.argsort(sources, kind="stable")
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=n_nodes))])
+    return indptr, targets[order]
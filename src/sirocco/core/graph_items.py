@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import enum
-from dataclasses import dataclass, field
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field, fields
+from functools import partial
 from itertools import chain, product
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar, Self, TypeVar, cast
 
+from sirocco.core.coordinates import DATE_DIM, Coordinates, encode
+from sirocco.parsing.cycling import DateCyclePoint
 from sirocco.parsing.target_cycle import DateList, LagList, NoTargetCycle
 from sirocco.parsing.yaml_data_models import (
     ConfigAvailableData,
@@ -15,19 +20,28 @@ from sirocco.parsing.yaml_data_models import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
-    from pathlib import Path
+    from collections.abc import Callable, Container, Iterable, Iterator
+    from datetime import datetime
 
-    from sirocco.parsing.cycling import CyclePoint
+    from sirocco.parsing.cycling import CyclePoint, CycleTimeline
     from sirocco.parsing.yaml_data_models import (
         ConfigBaseData,
         ConfigCycleTask,
+        ConfigCycleTaskInput,
         ConfigCycleTaskWaitOn,
         ConfigTask,
         TargetNodesBaseModel,
     )
 
 
+class MissingItemError(KeyError):
+    """Items referenced from a cycle spec are not in the Array or Store, e.g. not created yet"""
+
+
+class LagOutOfRangeError(ValueError):
+    """A lag from a cycle spec leads out of the cycle points the targeted items are unrolled on"""
+
+
 class MpiCmdPlaceholder(enum.Enum):
     """Placeholdes in the mpi_cmd"""
 
@@ -42,7 +56,46 @@ class GraphItem:
     color: ClassVar[str]
 
     name: str
-    coordinates: dict
+    coordinates: Coordinates
+
+    def __post_init__(self):
+        if not isinstance(self.coordinates, Coordinates):
+            self.coordinates = Coordinates(self.coordinates)
+
+    def settings(self) -> dict[str, Any]:
+        """Fields describing the node itself, apart from its name, coordinates and edges"""
+        return {
+            item_field.name: self._fingerprint_value(getattr(self, item_field.name))
+            for item_field in fields(self)
+            if item_field.name not in _NOT_FINGERPRINTED
+        }
+
+    def iter_fingerprint_lines(self) -> Iterator[str]:
+        """Description of the node itself, without its edges, hashed into its fingerprint"""
+        yield f"{type(self).__name__} {self.name} {dict(self.coordinates.items())!r}"
+        for name, value in self.settings().items():
+            yield f"{name}={value!r}"
+
+    def _fingerprint_value(self, value: Any) -> Any:
+        return value
+
+
+# Fields which are edges, bookkeeping or fingerprinted separately
+_NOT_FINGERPRINTED = frozenset(
+    {
+        "name",
+        "coordinates",
+        "inputs",
+        "outputs",
+        "wait_on",
+        "tasks",
+        "cycle_point",
+        "config_rootdir",
+        "namelists",
+        "_wait_on_specs",
+        "_input_specs",
+    }
+)
 
 
 GRAPH_ITEM_T = TypeVar("GRAPH_ITEM_T", bound=GraphItem)
@@ -55,7 +108,7 @@ class Data(ConfigBaseDataSpecs, GraphItem):
     color: ClassVar[str] = field(default="light_blue", repr=False)
 
     @classmethod
-    def from_config(cls, config: ConfigBaseData, coordinates: dict) -> AvailableData | GeneratedData:
+    def from_config(cls, config: ConfigBaseData, coordinates: Coordinates) -> AvailableData | GeneratedData:
         data_class = AvailableData if isinstance(config, ConfigAvailableData) else GeneratedData
         config_kwargs = dict(config)
         del config_kwargs["parameters"]
@@ -71,6 +124,26 @@ class AvailableData(Data, ConfigAvailableDataSpecs):
 class GeneratedData(Data, ConfigGeneratedDataSpecs): ...
 
 
+@dataclass(kw_only=True)
+class ExistingData(GeneratedData):
+    """Generated data whose producing task is not part of the unrolled workflow
+
+    It refers to the output of a previous run of the producing task instance, which has
+    the same name as `producer` and the same coordinates as the data node.
+    """
+
+    producer: str
+    port: str | None = None
+
+    @classmethod
+    def from_config_output(
+        cls, config: ConfigBaseData, coordinates: Coordinates, producer: str, port: str | None = None
+    ) -> ExistingData:
+        config_kwargs = dict(config)
+        del config_kwargs["parameters"]
+        return cls(coordinates=coordinates, producer=producer, port=port, **config_kwargs)
+
+
 @dataclass(kw_only=True)
 class Task(ConfigBaseTaskSpecs, GraphItem):
     """Internal representation of a task node"""
@@ -85,9 +158,16 @@ class Task(ConfigBaseTaskSpecs, GraphItem):
     cycle_point: CyclePoint
 
     _wait_on_specs: list[ConfigCycleTaskWaitOn] = field(default_factory=list, repr=False)
+    _input_specs: list[ConfigCycleTaskInput] = field(default_factory=list, repr=False)
 
     def __post_init__(self):
-        pass
+        super().__post_init__()
+
+    def _fingerprint_value(self, value: Any) -> Any:
+        # paths inside the config directory don't depend on its location
+        if isinstance(value, Path) and value.is_relative_to(self.config_rootdir):
+            return value.relative_to(self.config_rootdir)
+        return value
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -114,15 +194,24 @@ class Task(ConfigBaseTaskSpecs, GraphItem):
         config: ConfigTask,
         config_rootdir: Path,
         cycle_point: CyclePoint,
-        coordinates: dict[str, Any],
+        coordinates: Coordinates,
         datastore: Store,
         graph_spec: ConfigCycleTask,
+        pending: list[Task] | None = None,
     ) -> Task:
-        inputs: dict[str, list[Data]] = {}
-        for input_spec in graph_spec.inputs:
-            if input_spec.port not in inputs:
-                inputs[input_spec.port] = []
-            inputs[input_spec.port].extend(datastore.iter_from_cycle_spec(input_spec, coordinates))
+        """Create the task, resolving its inputs and outputs in datastore
+
+        If pending is given, a task whose inputs are not all in datastore yet is created without inputs and
+        appended to pending, its inputs have to be linked with link_inputs() once all data are created.
+        """
+        try:
+            inputs = cls.resolve_inputs(graph_spec.inputs, coordinates, cycle_point, datastore)
+            is_pending = False
+        except MissingItemError:
+            if pending is None:
+                raise
+            inputs = {input_spec.port: [] for input_spec in graph_spec.inputs}
+            is_pending = True
 
         outputs: dict[str | None, list[Data]] = {}
         for output_spec in graph_spec.outputs:
@@ -147,20 +236,41 @@ class Task(ConfigBaseTaskSpecs, GraphItem):
         new._wait_on_specs = graph_spec.wait_on  # noqa: SLF001 we don't have access to self in a dataclass
         #                                                and setting an underscored attribute from
         #                                                the class itself raises SLF001
+        new._input_specs = graph_spec.inputs  # noqa: SLF001 same as above
+        if is_pending and pending is not None:
+            pending.append(new)
 
         return new
 
+    @staticmethod
+    def resolve_inputs(
+        input_specs: list[ConfigCycleTaskInput], coordinates: Coordinates, cycle_point: CyclePoint, datastore: Store
+    ) -> dict[str, list[Data]]:
+        inputs: dict[str, list[Data]] = {}
+        for input_spec in input_specs:
+            if input_spec.port not in inputs:
+                inputs[input_spec.port] = []
+            inputs[input_spec.port].extend(
+                datastore.iter_from_cycle_spec(input_spec, coordinates, cycle_point=cycle_point)
+            )
+        return inputs
+
+    def link_inputs(self, datastore: Store[Data]) -> None:
+        self.inputs = self.resolve_inputs(self._input_specs, self.coordinates, self.cycle_point, datastore)
+
     @classmethod
     def build_from_config(cls: type[Self], config: ConfigTask, config_rootdir: Path, **kwargs: Any) -> Self:
         config_kwargs = dict(config)
         del config_kwargs["parameters"]
         return cls(config_rootdir=config_rootdir, **kwargs, **config_kwargs)
 
-    def link_wait_on_tasks(self, taskstore: Store[Task]) -> None:
+    def link_wait_on_tasks(self, taskstore: Store[Task], *, missing_ok: bool = False) -> None:
         self.wait_on = list(
             chain(
                 *(
-                    taskstore.iter_from_cycle_spec(wait_on_spec, self.coordinates)
+                    taskstore.iter_from_cycle_spec(
+                        wait_on_spec, self.coordinates, cycle_point=self.cycle_point, missing_ok=missing_ok
+                    )
                     for wait_on_spec in self._wait_on_specs
                 )
             )
@@ -176,48 +286,93 @@ class Cycle(GraphItem):
     tasks: list[Task]
 
 
-class Array[GRAPH_ITEM_T]:
-    """Dictionnary of GRAPH_ITEM_T objects accessed by arbitrary dimensions"""
+def timeline_position(cycle_point: CyclePoint | None, ref_coordinates: Coordinates) -> tuple[CycleTimeline, int] | None:
+    """Timeline and index of cycle_point, if it is the date cycle point of ref_coordinates"""
+    if (
+        isinstance(cycle_point, DateCyclePoint)
+        and cycle_point.timeline is not None
+        and cycle_point.index is not None
+        and cycle_point.chunk_start_date == ref_coordinates.get("date")
+    ):
+        return cycle_point.timeline, cycle_point.index
+    return None
+
+
+def _declared_rank(ranks: dict[Any, int], value: Any) -> int:
+    """Rank of a parameter value in its declaration, undeclared values coming last"""
+    return ranks.get(value, len(ranks))
+
 
-    def __init__(self, name: str) -> None:
+class Array[GRAPH_ITEM_T]:
+    """
+    Dictionnary of GRAPH_ITEM_T objects accessed by arbitrary dimensions
+
+    Axes are ordered, dates chronologically and parameters by their declared values if given,
+    in insertion order otherwise, so that fanning out over an axis is reproducible.
+    The timeline of the cycle the items are unrolled on, if given, resolves lags by index, see
+    `CycleTimeline.lag_indices`.
+    """
+
+    def __init__(
+        self, name: str, parameters: dict[str, list] | None = None, timeline: CycleTimeline | None = None
+    ) -> None:
         self._name = name
+        self._parameters = {} if parameters is None else parameters
+        self._timeline = timeline
         self._dims: tuple[str, ...] = ()
-        self._axes: dict[str, set] = {}
-        self._dict: dict[tuple, GRAPH_ITEM_T] = {}
+        self._axes: dict[str, list] = {}
+        self._axis_values: dict[str, set] = {}
+        self._axis_keys: dict[str, Callable[[Any], Any] | None] = {}
+        self._dict: dict[tuple[int, ...], GRAPH_ITEM_T] = {}
+
+    def _axis_key(self, dim: str) -> Callable[[Any], Any] | None:
+        if dim == "date":
+            return None
+        # partial rather than lambda to keep arrays picklable
+        return partial(_declared_rank, {value: rank for rank, value in enumerate(self._parameters.get(dim, []))})
+
+    def _key(self, coordinates: Coordinates | dict) -> tuple[int, ...]:
+        """Internal key: the coordinate codes, in the order of self._dims to ensure reproducibility"""
+        input_dims = coordinates.dims if isinstance(coordinates, Coordinates) else tuple(coordinates.keys())
+        if self._dims != input_dims:
+            msg = f"Array {self._name}: coordinate names {input_dims} don't match Array dimensions {self._dims}"
+            raise KeyError(msg)
+        if isinstance(coordinates, Coordinates):
+            return coordinates.codes
+        return tuple(encode(dim, coordinates[dim]) for dim in self._dims)
 
-    def __setitem__(self, coordinates: dict, value: GRAPH_ITEM_T) -> None:
+    def __setitem__(self, coordinates: Coordinates | dict, value: GRAPH_ITEM_T) -> None:
         # First access: set axes and initialize dictionnary
-        input_dims = tuple(coordinates.keys())
         if self._dims == ():
-            self._dims = input_dims
-            self._axes = {k: set() for k in self._dims}
+            self._dims = tuple(coordinates.keys())
+            self._axes = {k: [] for k in self._dims}
+            self._axis_values = {k: set() for k in self._dims}
+            self._axis_keys = {k: self._axis_key(k) for k in self._dims}
             self._dict = {}
-        # check dimensions
-        elif self._dims != input_dims:
-            msg = f"Array {self._name}: coordinate names {input_dims} don't match Array dimensions {self._dims}"
-            raise KeyError(msg)
-        # Build internal key
-        # use the order of self._dims instead of param_keys to ensure reproducibility
-        key = tuple(coordinates[dim] for dim in self._dims)
+        key = self._key(coordinates)
         # Check if slot already taken
         if key in self._dict:
-            msg = f"Array {self._name}: key {key} already used, cannot set item twice"
+            msg = f"Array {self._name}: key {tuple(coordinates.values())} already used, cannot set item twice"
             raise KeyError(msg)
         # Store new axes values
         for dim in self._dims:
-            self._axes[dim].add(coordinates[dim])
+            if (axis_value := coordinates[dim]) not in self._axis_values[dim]:
+                self._axis_values[dim].add(axis_value)
+                insort(self._axes[dim], axis_value, key=self._axis_keys[dim])
         # Set item
         self._dict[key] = value
 
-    def __getitem__(self, coordinates: dict) -> GRAPH_ITEM_T:
-        if self._dims != (input_dims := tuple(coordinates.keys())):
-            msg = f"Array {self._name}: coordinate names {input_dims} don't match Array dimensions {self._dims}"
-            raise KeyError(msg)
-        # use the order of self._dims instead of param_keys to ensure reproducibility
-        key = tuple(coordinates[dim] for dim in self._dims)
-        return self._dict[key]
-
-    def iter_from_cycle_spec(self, spec: TargetNodesBaseModel, ref_coordinates: dict) -> Iterator[GRAPH_ITEM_T]:
+    def __getitem__(self, coordinates: Coordinates | dict) -> GRAPH_ITEM_T:
+        return self._dict[self._key(coordinates)]
+
+    def iter_from_cycle_spec(
+        self,
+        spec: TargetNodesBaseModel,
+        ref_coordinates: Coordinates,
+        *,
+        cycle_point: CyclePoint | None = None,
+        missing_ok: bool = False,
+    ) -> Iterator[GRAPH_ITEM_T]:
         # Check date references
         if "date" not in self._dims and isinstance(spec.target_cycle, DateList | LagList):
             msg = f"Array {self._name} has no date dimension, cannot be referenced by dates"
@@ -226,10 +381,38 @@ class Array[GRAPH_ITEM_T]:
             msg = f"Array {self._name} has a date dimension, must be referenced by dates"
             raise ValueError(msg)
 
-        for key in product(*(self._resolve_target_dim(spec, dim, ref_coordinates) for dim in self._dims)):
-            yield self._dict[key]
-
-    def _resolve_target_dim(self, spec: TargetNodesBaseModel, dim: str, ref_coordinates: Any) -> Iterator[Any]:
+        dim_values = [
+            list(self._resolve_target_dim(spec, dim, ref_coordinates, cycle_point, missing_ok=missing_ok))
+            for dim in self._dims
+        ]
+        if "date" in self._dims and not missing_ok:
+            dates = dim_values[self._dims.index("date")]
+            if out_of_range := [date for date in dates if date not in self._axis_values["date"]]:
+                msg = (
+                    f"Array {self._name}: dates {[str(date) for date in out_of_range]} referenced from "
+                    f"{ref_coordinates.get('date')} are out of the range of the array"
+                )
+                raise MissingItemError(msg)
+
+        dim_codes = [
+            [encode(dim, value) for value in values] for dim, values in zip(self._dims, dim_values, strict=True)
+        ]
+        for key in product(*dim_codes):
+            if (item := self._dict.get(key)) is not None:
+                yield item
+            elif not missing_ok:
+                msg = f"Array {self._name}: no item at {dict(Coordinates.from_codes(self._dims, key).items())}"
+                raise MissingItemError(msg)
+
+    def _resolve_target_dim(
+        self,
+        spec: TargetNodesBaseModel,
+        dim: str,
+        ref_coordinates: Any,
+        cycle_point: CyclePoint | None,
+        *,
+        missing_ok: bool = False,
+    ) -> Iterator[Any]:
         if dim == "date":
             match spec.target_cycle:
                 case NoTargetCycle():
@@ -237,40 +420,223 @@ class Array[GRAPH_ITEM_T]:
                 case DateList():
                     yield from spec.target_cycle.dates
                 case LagList():
-                    for lag in spec.target_cycle.lags:
-                        yield ref_coordinates["date"] + lag
+                    # Use the lag tables of the cycle timelines instead of Duration arithmetic when possible
+                    target = self._timeline
+                    if target is not None and (position := timeline_position(cycle_point, ref_coordinates)) is not None:
+                        timeline, index = position
+                        for lag in spec.target_cycle.lags:
+                            if (target_index := timeline.lag_indices(lag, target)[index]) >= 0:
+                                yield target.chunk_start_dates[target_index]
+                            elif not missing_ok:
+                                msg = (
+                                    f"Array {self._name}: lag {lag} from {ref_coordinates['date']} leads out of the "
+                                    f"cycle points from {target.start_date} to {target.stop_date} by {target.period}"
+                                )
+                                raise LagOutOfRangeError(msg)
+                    else:
+                        for lag in spec.target_cycle.lags:
+                            yield ref_coordinates["date"] + lag
         elif spec.parameters.get(dim) == "single":
             yield ref_coordinates[dim]
         else:
             yield from self._axes[dim]
 
+    def __len__(self) -> int:
+        return len(self._dict)
+
+    def evict_before(self, date: datetime, keep: Container[datetime] = ()) -> list[GRAPH_ITEM_T]:
+        """Remove the items dated before date, except at the dates in keep, and return them"""
+        if "date" not in self._dims:
+            return []
+        dates = self._axes["date"]
+        evicted_dates = {item_date for item_date in dates[: bisect_left(dates, date)] if item_date not in keep}
+        if not evicted_dates:
+            return []
+        index = self._dims.index("date")
+        evicted_codes = {encode("date", item_date) for item_date in evicted_dates}
+        evicted = [item for key, item in self._dict.items() if key[index] in evicted_codes]
+        self._dict = {key: item for key, item in self._dict.items() if key[index] not in evicted_codes}
+        self._axes["date"] = [item_date for item_date in dates if item_date not in evicted_dates]
+        self._axis_values["date"] -= evicted_dates
+        return evicted
+
     def __iter__(self) -> Iterator[GRAPH_ITEM_T]:
         yield from self._dict.values()
 
 
 class Store[GRAPH_ITEM_T]:
-    """Container for GRAPH_ITEM_T Arrays"""
-
-    def __init__(self) -> None:
+    """
+    Container for GRAPH_ITEM_T Arrays
+
+    Items are also indexed by coordinate value, with the dates kept sorted, see `select`. The index is only
+    built on the first selection, so that filling a store costs nothing more than its Arrays, and is then
+    kept up to date.
+    The declared parameter values, if given, set the order of the parameter axes, and the timelines the
+    items are unrolled on, by name, resolve their lags, see `Array`.
+    """
+
+    def __init__(
+        self, parameters: dict[str, list] | None = None, timelines: dict[str, CycleTimeline] | None = None
+    ) -> None:
+        self._parameters = parameters
+        self._timelines = {} if timelines is None else timelines
         self._dict: dict[str, Array[GRAPH_ITEM_T]] = {}
+        # items by (dimension, coordinate code), each bucket keyed by item id for O(1) removal,
+        # None until the first selection
+        self._index: dict[tuple[str, int], dict[int, GRAPH_ITEM_T]] | None = None
+        # sorted codes of the dates in the index, codes being ordered like dates
+        self._date_codes: list[int] = []
 
     def add(self, item: GRAPH_ITEM_T) -> None:
-        graph_item = cast(GraphItem, item)  # mypy can somehow not deduce this
+        graph_item = cast("GraphItem", item)  # mypy can somehow not deduce this
         name, coordinates = graph_item.name, graph_item.coordinates
         if name not in self._dict:
-            self._dict[name] = Array[GRAPH_ITEM_T](name)
+            self._dict[name] = Array[GRAPH_ITEM_T](name, self._parameters, self._timelines.get(name))
         self._dict[name][coordinates] = item
-
-    def __getitem__(self, key: tuple[str, dict]) -> GRAPH_ITEM_T:
+        if self._index is not None:
+            self._add_to_index(self._index, item)
+
+    def _build_index(self) -> dict[tuple[str, int], dict[int, GRAPH_ITEM_T]]:
+        index: dict[tuple[str, int], dict[int, GRAPH_ITEM_T]] = {}
+        self._date_codes = []
+        for item in self:
+            self._add_to_index(index, item)
+        self._index = index
+        return index
+
+    def _add_to_index(self, index: dict[tuple[str, int], dict[int, GRAPH_ITEM_T]], item: GRAPH_ITEM_T) -> None:
+        coordinates = cast("GraphItem", item).coordinates
+        for key in zip(coordinates.dims, coordinates.codes, strict=True):
+            if (bucket := index.get(key)) is None:
+                bucket = index[key] = {}
+                if key[0] == DATE_DIM:
+                    insort(self._date_codes, key[1])
+            bucket[id(item)] = item
+
+    def _remove_from_index(self, index: dict[tuple[str, int], dict[int, GRAPH_ITEM_T]], item: GRAPH_ITEM_T) -> None:
+        coordinates = cast("GraphItem", item).coordinates
+        for key in zip(coordinates.dims, coordinates.codes, strict=True):
+            bucket = index[key]
+            del bucket[id(item)]
+            if not bucket:
+                del index[key]
+                if key[0] == DATE_DIM:
+                    self._date_codes.remove(key[1])
+
+    def __getitem__(self, key: tuple[str, Coordinates | dict]) -> GRAPH_ITEM_T:
         name, coordinates = key
         if name not in self._dict:
             msg = f"entry {name} not found in Store"
             raise KeyError(msg)
         return self._dict[name][coordinates]
 
-    def iter_from_cycle_spec(self, spec: TargetNodesBaseModel, ref_coordinates: dict) -> Iterator[GRAPH_ITEM_T]:
-        if spec.when.is_active(ref_coordinates.get("date")):
-            yield from self._dict[spec.name].iter_from_cycle_spec(spec, ref_coordinates)
+    def select(
+        self, name: str | None = None, date: datetime | slice | None = None, **parameters: Any
+    ) -> list[GRAPH_ITEM_T]:
+        """
+        Items matching all the given criteria
+
+        :param name: name of the items
+        :param date: date of the items, or slice(start, stop) of dates in [start, stop), bounds being optional
+        :param parameters: parameter values of the items, e.g. member=3
+
+        Each criterion is looked up in an index and the items matching the most selective one are filtered
+        by the others, so the cost is O(log(number of dates)) plus the number of items matching that criterion.
+        Items are returned in insertion order, and in date order as well when selecting by a date slice.
+        """
+        date_range: tuple[int | None, int | None, bool] | None = None
+        if isinstance(date, slice):
+            if date.step is not None:
+                msg = "date slices with steps are not supported"
+                raise ValueError(msg)
+            date_range = (
+                None if date.start is None else encode(DATE_DIM, date.start),
+                None if date.stop is None else encode(DATE_DIM, date.stop),
+                False,
+            )
+        elif date is not None:
+            code = encode(DATE_DIM, date)
+            date_range = (code, code, True)
+
+        index = self._build_index() if self._index is None else self._index
+        candidates: list[tuple[int, Iterable[GRAPH_ITEM_T]]] = []
+        if name is not None:
+            if (array := self._dict.get(name)) is None:
+                return []
+            candidates.append((len(array), array))
+        if date_range is not None:
+            start, stop, include_stop = date_range
+            first = 0 if start is None else bisect_left(self._date_codes, start)
+            if stop is None:
+                last = len(self._date_codes)
+            else:
+                last = (bisect_right if include_stop else bisect_left)(self._date_codes, stop)
+            buckets = [index[DATE_DIM, code] for code in self._date_codes[first:last]]
+            candidates.append((sum(map(len, buckets)), chain.from_iterable(bucket.values() for bucket in buckets)))
+        parameter_codes = {dim: encode(dim, value) for dim, value in parameters.items()}
+        for key in parameter_codes.items():
+            bucket = index.get(key, {})
+            candidates.append((len(bucket), bucket.values()))
+        if not candidates:
+            return list(self)
+
+        _, items = min(candidates, key=lambda candidate: candidate[0])
+        return [item for item in items if self._matches(cast("GraphItem", item), name, date_range, parameter_codes)]
+
+    @staticmethod
+    def _matches(
+        item: GraphItem,
+        name: str | None,
+        date_range: tuple[int | None, int | None, bool] | None,
+        parameter_codes: dict[str, int],
+    ) -> bool:
+        if name is not None and item.name != name:
+            return False
+        codes = dict(zip(item.coordinates.dims, item.coordinates.codes, strict=True))
+        if date_range is not None:
+            start, stop, include_stop = date_range
+            if (code := codes.get(DATE_DIM)) is None:
+                return False
+            if (start is not None and code < start) or (
+                stop is not None and (code > stop if include_stop else code >= stop)
+            ):
+                return False
+        return all(codes.get(dim) == code for dim, code in parameter_codes.items())
+
+    def iter_from_cycle_spec(
+        self,
+        spec: TargetNodesBaseModel,
+        ref_coordinates: Coordinates,
+        *,
+        cycle_point: CyclePoint | None = None,
+        missing_ok: bool = False,
+    ) -> Iterator[GRAPH_ITEM_T]:
+        """Iterate over the items targeted by spec from ref_coordinates
+
+        The cycle point of ref_coordinates, if given, is used to resolve lags and `when` conditions
+        from precomputed tables over its timeline.
+        With missing_ok, targeted items which are not in the store are skipped instead of raising an error.
+        """
+        if missing_ok and spec.name not in self._dict:
+            return
+        if (position := timeline_position(cycle_point, ref_coordinates)) is not None:
+            timeline, index = position
+            is_active = bool(timeline.activity_mask(spec.when)[index])
+        else:
+            is_active = spec.when.is_active(ref_coordinates.get("date"))
+        if is_active:
+            if (array := self._dict.get(spec.name)) is None:
+                msg = f"entry {spec.name} not found in Store"
+                raise MissingItemError(msg)
+            yield from array.iter_from_cycle_spec(spec, ref_coordinates, cycle_point=cycle_point, missing_ok=missing_ok)
+
+    def evict_before(self, date: datetime, keep: Container[datetime] = ()) -> list[GRAPH_ITEM_T]:
+        """Remove the items dated before date, except at the dates in keep, and return them"""
+        evicted = list(chain.from_iterable(array.evict_before(date, keep) for array in self._dict.values()))
+        if self._index is not None:
+            for item in evicted:
+                self._remove_from_index(self._index, item)
+        return evicted
 
     def __iter__(self) -> Iterator[GRAPH_ITEM_T]:
         yield from chain(*(self._dict.values()))
@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass, field
+from io import StringIO
 from pathlib import Path
 from typing import Any, Self
 
@@ -50,6 +51,12 @@ class NamelistFile(models.ConfigNamelistFileSpec):
             nml_section = self.namelist[section_name] if k is None else self.namelist[section_name][k]
             nml_section.update(params)
 
+    def render(self) -> str:
+        """Text of the namelist, as dumped"""
+        stream = StringIO()
+        self.namelist.write(stream)
+        return stream.getvalue()
+
     def dump(self, path: Path) -> None:
         if path.is_file():
             path.unlink()
@@ -1,29 +1,50 @@
 from __future__ import annotations
 
+import heapq
+from dataclasses import dataclass
+from functools import cached_property
 from itertools import chain, product
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, Any, Self, cast
 
-from sirocco.core.graph_items import Cycle, Data, Store, Task
-from sirocco.parsing.cycling import DateCyclePoint, OneOffPoint
+from sirocco.core.coordinates import DATE_DIM, Coordinates, encode
+from sirocco.core.fingerprint import Fingerprints
+from sirocco.core.graph_arrays import GraphArrays
+from sirocco.core.graph_items import AvailableData, Cycle, Data, ExistingData, Store, Task
+from sirocco.parsing.cycling import DateCyclePoint, DateCycling, OneOffPoint
+from sirocco.parsing.target_cycle import DateList, LagList
 from sirocco.parsing.yaml_data_models import (
     ConfigBaseData,
     ConfigWorkflow,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterable, Iterator
+    from datetime import datetime
     from pathlib import Path
 
-    from sirocco.parsing.cycling import CyclePoint
+    from isoduration.types import Duration
+
+    from sirocco.parsing.cycling import CyclePoint, CycleTimeline, Cycling
+    from sirocco.parsing.target_cycle import TargetCycle
     from sirocco.parsing.yaml_data_models import (
+        ConfigAvailableData,
         ConfigCycle,
+        ConfigCycleTask,
         ConfigData,
         ConfigTask,
     )
 
 
 class Workflow:
-    """Internal representation of a workflow"""
+    """Internal representation of a workflow
+
+    The unrolling can be restricted to a part of the workflow: the nodes some targets depend on, the cycle points
+    starting in [start, stop), some tasks or some parameter values. Generated data consumed by the unrolled tasks
+    but produced outside of this part are represented by `ExistingData` nodes.
+
+    Nodes are queried with `Store.select` and edges are looked up backwards with `producer`, `consumers`
+    and `cycle_of`.
+    """
 
     def __init__(
         self,
@@ -33,84 +54,527 @@ class Workflow:
         config_tasks: list[ConfigTask],
         config_data: ConfigData,
         parameters: dict[str, list],
+        *,
+        targets: Iterable[str] | None = None,
+        start: datetime | None = None,
+        stop: datetime | None = None,
+        task_names: Iterable[str] | None = None,
+        parameter_values: dict[str, list] | None = None,
     ) -> None:
         self.name: str = name
         self._config_rootdir: Path = config_rootdir
-
-        self.tasks: Store[Task] = Store()
-        self.data: Store[Data] = Store()
-        self.cycles: Store[Cycle] = Store()
+        # Keep the configuration to unroll other parts of the workflow, see subgraph()
+        self._config_cycles = config_cycles
+        self._config_tasks = config_tasks
+        self._config_data = config_data
+        self._parameters = parameters
+        self._targets = None if targets is None else list(targets)
+        self._fingerprints = Fingerprints()
 
         config_data_dict: dict[str, ConfigBaseData] = {
             data.name: data for data in chain(config_data.available, config_data.generated)
         }
         config_task_dict: dict[str, ConfigTask] = {task.name: task for task in config_tasks}
 
-        # Function to iterate over date and parameter combinations
-        def iter_coordinates(cycle_point: CyclePoint, param_refs: list[str]) -> Iterator[dict]:
-            axes = {k: parameters[k] for k in param_refs}
-            if isinstance(cycle_point, DateCyclePoint):
-                axes["date"] = [cycle_point.chunk_start_date]
-            yield from (dict(zip(axes.keys(), x, strict=False)) for x in product(*axes.values()))
+        # 0 - only keep the cycle tasks required to produce the targets
+        target_names = None if self._targets is None else set(self._targets)
+        if target_names is not None:
+            if unknown_targets := target_names - config_data_dict.keys() - config_task_dict.keys():
+                msg = f"targets {sorted(unknown_targets)} are neither tasks nor data of workflow {name}"
+                raise ValueError(msg)
+            config_cycles = self._prune_config_cycles(config_cycles, target_names)
+
+        selected_task_names = None if task_names is None else set(task_names)
+        if selected_task_names is not None and (unknown_tasks := selected_task_names - config_task_dict.keys()):
+            msg = f"tasks {sorted(unknown_tasks)} are not tasks of workflow {name}"
+            raise ValueError(msg)
+        if parameter_values is not None and (unknown_parameters := parameter_values.keys() - parameters.keys()):
+            msg = f"parameters {sorted(unknown_parameters)} are not parameters of workflow {name}"
+            raise ValueError(msg)
+        is_partial = any(arg is not None for arg in (start, stop, task_names, parameter_values))
+        self._is_partial = is_partial
+        self._stop = stop
+        self._task_names = selected_task_names
+
+        unroller = _Unroller(
+            config_rootdir=config_rootdir,
+            config_cycles=config_cycles,
+            config_available_data=config_data.available,
+            config_data_dict=config_data_dict,
+            config_task_dict=config_task_dict,
+            parameters=parameters,
+            start=start,
+            stop=stop,
+            task_names=selected_task_names,
+            parameter_values=parameter_values,
+        )
+        self._task_timelines = unroller.task_timelines
+        self._data_timelines = unroller.data_timelines
+        self.tasks: Store[Task] = Store(parameters, self._task_timelines)
+        self.data: Store[Data] = Store(parameters, self._data_timelines)
+        self.cycles: Store[Cycle] = Store(parameters)
 
         # 1 - create availalbe data nodes
-        for available_data_config in config_data.available:
-            for coordinates in iter_coordinates(OneOffPoint(), available_data_config.parameters):
-                self.data.add(Data.from_config(config=available_data_config, coordinates=coordinates))
+        for data in unroller.iter_available_data():
+            self._add_data(data)
+
+        # 2 - unroll the cycle points
+        pending_tasks = self._unroll(unroller, is_partial=is_partial)
+
+        # 3 - Link forward references: pending inputs and wait on tasks,
+        #     tasks outside of the unrolled part are considered done.
+        #     Tasks are fingerprinted as soon as they are linked, see Fingerprints
+        for task in pending_tasks:
+            task.link_inputs(self.data)
+        for task in self.tasks:
+            task.link_wait_on_tasks(self.tasks, missing_ok=is_partial)
+            self._fingerprints.add_task(task)
+
+        # 4 - prune unrolled nodes not required by the targets or by the unrolled tasks
+        if target_names is not None or is_partial:
+            self._prune(target_names)
+
+        # 5 - index the edges for the reverse lookups
+        self._index_edges()
+
+    def _add_data(self, data: Data) -> None:
+        self.data.add(data)
+        if isinstance(data, AvailableData | ExistingData):
+            # not produced in the workflow, fingerprinted right away
+            self._fingerprints.add_source(data)
+
+    def _unroll(self, unroller: _Unroller, *, is_partial: bool) -> list[Task]:
+        """Single pass over the cycle points of the data window
 
-        # 2 - create output data nodes
+        The output data nodes of each cycle point are created first, then its tasks and its cycle if the cycle
+        point lies in the window. Returns the tasks with inputs produced later in the pass, still to be linked.
+        """
+        pending_tasks: list[Task] = []
+        for cycle_config in unroller.config_cycles:
+            for cycle_point in unroller.iter_data_window_points(cycle_config.cycling):
+                for data in unroller.iter_output_data(cycle_config, cycle_point):
+                    self._add_data(data)
+                if unroller.in_window(cycle_point):
+                    cycle_tasks = unroller.create_tasks(cycle_config, cycle_point, self.data, pending=pending_tasks)
+                    self._add_cycle(cycle_config.name, cycle_point, cycle_tasks, is_partial=is_partial)
+        return pending_tasks
+
+    def _add_cycle(
+        self, cycle_name: str, cycle_point: CyclePoint, cycle_tasks: list[Task], *, is_partial: bool
+    ) -> None:
+        for task in cycle_tasks:
+            self.tasks.add(task)
+        if is_partial and not cycle_tasks:
+            return
+        self.cycles.add(
+            Cycle(
+                name=cycle_name,
+                tasks=cycle_tasks,
+                coordinates=Coordinates({DATE_DIM: cycle_point.chunk_start_date})
+                if isinstance(cycle_point, DateCyclePoint)
+                else Coordinates(),
+            )
+        )
+
+    @staticmethod
+    def _prune_config_cycles(config_cycles: list[ConfigCycle], targets: set[str]) -> list[ConfigCycle]:
+        """Restrict the cycle tasks to the ones the targets transitively depend on
+
+        This is a conservative pass on names only, ignoring dates, parameters and `when`
+        conditions, so that the tasks which can never contribute are not unrolled at all.
+        """
+        producers: dict[str, set[str]] = {}
+        task_inputs: dict[str, set[str]] = {}
+        task_wait_on: dict[str, set[str]] = {}
         for cycle_config in config_cycles:
-            for cycle_point in cycle_config.cycling.iter_cycle_points():
-                for task_ref in cycle_config.tasks:
-                    for data_ref in task_ref.outputs:
-                        data_config = config_data_dict[data_ref.name]
-                        for coordinates in iter_coordinates(cycle_point, data_config.parameters):
-                            self.data.add(Data.from_config(config=data_config, coordinates=coordinates))
-
-        # 3 - create cycles and tasks
+            for task_graph_spec in cycle_config.tasks:
+                task_name = task_graph_spec.name
+                task_inputs.setdefault(task_name, set()).update(spec.name for spec in task_graph_spec.inputs)
+                task_wait_on.setdefault(task_name, set()).update(spec.name for spec in task_graph_spec.wait_on)
+                for output_spec in task_graph_spec.outputs:
+                    producers.setdefault(output_spec.name, set()).add(task_name)
+
+        required_tasks: set[str] = set()
+        visited_data: set[str] = set()
+        task_stack = [name for name in targets if name in task_inputs]
+        data_stack = list(targets)
+        while task_stack or data_stack:
+            if data_stack:
+                if (data_name := data_stack.pop()) not in visited_data:
+                    visited_data.add(data_name)
+                    task_stack.extend(producers.get(data_name, ()))
+                continue
+            if (task_name := task_stack.pop()) not in required_tasks:
+                required_tasks.add(task_name)
+                data_stack.extend(task_inputs[task_name])
+                task_stack.extend(task_wait_on[task_name])
+
+        pruned_cycles = []
         for cycle_config in config_cycles:
-            cycle_name = cycle_config.name
-            for cycle_point in cycle_config.cycling.iter_cycle_points():
-                cycle_tasks = []
-                for task_graph_spec in cycle_config.tasks:
-                    task_name = task_graph_spec.name
-                    task_config = config_task_dict[task_name]
-                    for coordinates in iter_coordinates(cycle_point, task_config.parameters):
-                        task = Task.from_config(
-                            config=task_config,
-                            config_rootdir=self._config_rootdir,
-                            cycle_point=cycle_point,
-                            coordinates=coordinates,
-                            datastore=self.data,
-                            graph_spec=task_graph_spec,
-                        )
-                        self.tasks.add(task)
-                        cycle_tasks.append(task)
-                self.cycles.add(
-                    Cycle(
-                        name=cycle_name,
-                        tasks=cycle_tasks,
-                        coordinates={"date": cycle_point.chunk_start_date}
-                        if isinstance(cycle_point, DateCyclePoint)
-                        else {},
-                    )
-                )
+            cycle_tasks = [task for task in cycle_config.tasks if task.name in required_tasks]
+            if cycle_tasks:
+                pruned_cycles.append(cycle_config.model_copy(update={"tasks": cycle_tasks}))
+        return pruned_cycles
 
-        # 4 - Link wait on tasks
+    def _prune(self, targets: set[str] | None) -> None:
+        """Only keep the unrolled nodes the targets transitively depend on
+
+        Without targets, all tasks are kept and only the data they don't use are removed.
+        """
+        required_tasks: dict[int, Task] = {}
+        if targets is None:
+            required_tasks = {id(task): task for task in self.tasks}
+        else:
+            producers = {id(data): task for task in self.tasks for data in task.output_data_nodes()}
+            stack = [task for task in self.tasks if task.name in targets]
+            stack.extend(producers[id(data)] for data in self.data if data.name in targets and id(data) in producers)
+            while stack:
+                task = stack.pop()
+                if id(task) in required_tasks:
+                    continue
+                required_tasks[id(task)] = task
+                stack.extend(producers[id(data)] for data in task.input_data_nodes() if id(data) in producers)
+                stack.extend(task.wait_on)
+
+        required_data = set() if targets is None else {id(data) for data in self.data if data.name in targets}
+        for task in required_tasks.values():
+            required_data.update(id(data) for data in chain(task.input_data_nodes(), task.output_data_nodes()))
+
+        tasks: Store[Task] = Store(self._parameters, self._task_timelines)
         for task in self.tasks:
-            task.link_wait_on_tasks(self.tasks)
+            if id(task) in required_tasks:
+                tasks.add(task)
+        data: Store[Data] = Store(self._parameters, self._data_timelines)
+        for data_node in self.data:
+            if id(data_node) in required_data:
+                data.add(data_node)
+        cycles: Store[Cycle] = Store(self._parameters)
+        for cycle in self.cycles:
+            cycle.tasks = [task for task in cycle.tasks if id(task) in required_tasks]
+            if cycle.tasks:
+                cycles.add(cycle)
+        self.tasks, self.data, self.cycles = tasks, data, cycles
+
+    def _index_edges(self) -> None:
+        """Maps from data to their producer and consumers and from tasks to their cycle, keyed by node id"""
+        self._producers: dict[int, Task] = {}
+        self._consumers: dict[int, list[Task]] = {}
+        self._task_cycles: dict[int, Cycle] = {}
+        for task in self.tasks:
+            for data in task.output_data_nodes():
+                self._producers[id(data)] = task
+            for data in task.input_data_nodes():
+                self._consumers.setdefault(id(data), []).append(task)
+        for cycle in self.cycles:
+            for task in cycle.tasks:
+                self._task_cycles[id(task)] = cycle
+
+    def producer(self, data: Data) -> Task | None:
+        """Task producing data, None for available data and data produced outside of the unrolled part"""
+        return self._producers.get(id(data))
+
+    def consumers(self, data: Data) -> list[Task]:
+        """Tasks taking data as input"""
+        return self._consumers.get(id(data), [])
+
+    def cycle_of(self, task: Task) -> Cycle:
+        """Cycle the task belongs to"""
+        return self._task_cycles[id(task)]
+
+    @cached_property
+    def _config_consumers(self) -> dict[str, list[str]]:
+        """Names of the cycle tasks taking each data as input in the configuration"""
+        consumers: dict[str, list[str]] = {}
+        for cycle_config in self._config_cycles:
+            for task_graph_spec in cycle_config.tasks:
+                for input_spec in task_graph_spec.inputs:
+                    names = consumers.setdefault(input_spec.name, [])
+                    if task_graph_spec.name not in names:
+                        names.append(task_graph_spec.name)
+        return consumers
+
+    def outside_consumers(self, data: Data) -> list[str]:
+        """
+        Names of the tasks taking data as input in the configuration but not in the unrolled part of a subgraph
+
+        This is worked out on names: a consumer is reported when none of its instances takes data as input and
+        it is either not selected or may fall after the stop date. Empty for complete workflows.
+        """
+        if not self._is_partial:
+            return []
+        unrolled = {task.name for task in self.consumers(data)}
+        return [
+            name
+            for name in self._config_consumers.get(data.name, [])
+            if name not in unrolled
+            and (self._stop is not None or (self._task_names is not None and name not in self._task_names))
+        ]
+
+    @cached_property
+    def graph_arrays(self) -> GraphArrays:
+        """Unrolled graph as NumPy arrays with CSR edges, built on first access"""
+        return GraphArrays.from_workflow(self)
+
+    @cached_property
+    def structural_hash(self) -> str:
+        """
+        Root of the Merkle-style fingerprint of the unrolled graph, reproducible across runs and processes
+
+        It covers the types, names, coordinates and settings of the nodes, the rendered namelists, the ports
+        and the edges, see `Fingerprints`. The node hashes are computed while unrolling and are available
+        through `node_hash` and `cycle_hash` to locate the parts which differ between two workflows.
+        """
+        return self._fingerprints.root_hash(self.cycles, self.data)
+
+    def node_hash(self, node: Task | Data) -> str:
+        return self._fingerprints[node]
+
+    def cycle_hash(self, cycle: Cycle) -> str:
+        return self._fingerprints.cycle_hash(cycle)
 
     @property
     def config_rootdir(self) -> Path:
         return self._config_rootdir
 
+    def subgraph(
+        self,
+        start: datetime | None = None,
+        stop: datetime | None = None,
+        tasks: Iterable[str] | None = None,
+        parameters: dict[str, list] | None = None,
+    ) -> Self:
+        """
+        Unrolls a part of the workflow, e.g. to rebuild and resubmit a slice of a run.
+
+        Only cycle points starting in [start, stop), the given tasks and the given parameter values
+        are unrolled, so the cost scales with the size of that part rather than with the whole run.
+        Inputs produced outside of it become `ExistingData` nodes referring to outputs of a previous run.
+
+        :param start: first date of the window, one-off cycles are only unrolled without a start date
+        :param stop: end date of the window (excluded)
+        :param tasks: names of the tasks to unroll
+        :param parameters: values of the parameters to unroll, e.g. {"member": [3]}
+        """
+        return type(self)(
+            name=self.name,
+            config_rootdir=self._config_rootdir,
+            config_cycles=self._config_cycles,
+            config_tasks=self._config_tasks,
+            config_data=self._config_data,
+            parameters=self._parameters,
+            targets=self._targets,
+            start=start,
+            stop=stop,
+            task_names=tasks,
+            parameter_values=parameters,
+        )
+
     @classmethod
-    def from_config_file(cls: type[Self], config_path: str) -> Self:
+    def from_config_file(cls: type[Self], config_path: str, **kwargs: Any) -> Self:
         """
         Loads a python representation of a workflow config file.
 
         :param config_path: the string to the config yaml file containing the workflow definition
+        :param kwargs: restrictions of the unrolled part of the workflow, see Workflow
+        """
+        return cls.from_config_workflow(ConfigWorkflow.from_config_file(config_path), **kwargs)
+
+    @classmethod
+    def from_config_workflow(cls: type[Self], config_workflow: ConfigWorkflow, **kwargs: Any) -> Self:
+        return cls(
+            name=config_workflow.name,
+            config_rootdir=config_workflow.rootdir,
+            config_cycles=config_workflow.cycles,
+            config_tasks=config_workflow.tasks,
+            config_data=config_workflow.data,
+            parameters=config_workflow.parameters,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_config_extension(
+        cls: type[Self], previous_config_workflow: ConfigWorkflow, config_workflow: ConfigWorkflow, **kwargs: Any
+    ) -> Self:
         """
+        Unrolls the cycle points added to a previous version of a workflow by moving its stop dates forward.
+
+        Inputs of the new cycle points produced by the previous run, like lagged restart files, are
+        `ExistingData` nodes, so that the resulting workflow can be submitted as a delta of the previous run.
+
+        :param previous_config_workflow: the previous version of the workflow
+        :param config_workflow: the extended version of the workflow
+        :param kwargs: further restrictions of the unrolled part of the workflow, see Workflow
+        """
+        if kwargs.get("start") is not None:
+            msg = "The start of an extension is given by the stop date of the previous workflow."
+            raise ValueError(msg)
+        start = config_workflow.extension_start_date(previous_config_workflow)
+        return cls.from_config_workflow(config_workflow, **(kwargs | {"start": start}))
+
+
+class LazyWorkflow:
+    """Workflow unrolled on demand, for runs too long to be held in memory
+
+    `iter_cycles` is a generator of the unrolled cycles in chronological order: first the one-off cycles which
+    don't refer to dated nodes, then the cycle points of all date cycles merged by date, each one as soon as
+    the tasks it waits on exist, and finally the one-off cycles referring to dated nodes. Only a sliding
+    horizon of tasks and data nodes is kept in `tasks` and `data`, given by the extremal lags of the `inputs`
+    and `wait_on` specifications, together with the nodes at the dates explicitly targeted. Older nodes are
+    evicted and the `wait_on` lists of the evicted tasks are cleared, so that memory stays flat regardless of
+    the stop dates as long as the yielded cycles are not retained.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config_rootdir: Path,
+        config_cycles: list[ConfigCycle],
+        config_tasks: list[ConfigTask],
+        config_data: ConfigData,
+        parameters: dict[str, list],
+    ) -> None:
+        self.name: str = name
+        self._config_rootdir: Path = config_rootdir
+        self.tasks: Store[Task] = Store(parameters)
+        self.data: Store[Data] = Store(parameters)
+        self._unroller = _Unroller(
+            config_rootdir=config_rootdir,
+            config_cycles=config_cycles,
+            config_available_data=config_data.available,
+            config_data_dict={data.name: data for data in chain(config_data.available, config_data.generated)},
+            config_task_dict={task.name: task for task in config_tasks},
+            parameters=parameters,
+        )
+        self._input_lags: list[Duration] = []
+        self._wait_on_lags: list[Duration] = []
+        self._pinned_dates: set[datetime] = set()
+        for cycle_config in config_cycles:
+            for task_graph_spec in cycle_config.tasks:
+                for input_spec in task_graph_spec.inputs:
+                    self._add_reach(input_spec.target_cycle, self._input_lags)
+                for wait_on_spec in task_graph_spec.wait_on:
+                    self._add_reach(wait_on_spec.target_cycle, self._wait_on_lags)
+
+    def _add_reach(self, target_cycle: TargetCycle, lags: list[Duration]) -> None:
+        match target_cycle:
+            case LagList():
+                lags.extend(target_cycle.lags)
+            case DateList():
+                self._pinned_dates.update(target_cycle.dates)
+
+    @property
+    def config_rootdir(self) -> Path:
+        return self._config_rootdir
+
+    def iter_cycles(self) -> Iterator[Cycle]:
+        """Unroll the workflow one cycle point at a time, see LazyWorkflow"""
+        unroller = self._unroller
+        for data in unroller.iter_available_data():
+            self.data.add(data)
+
+        one_off_cycles = [cycle for cycle in unroller.config_cycles if not isinstance(cycle.cycling, DateCycling)]
+        for cycle_config in one_off_cycles:
+            if not self._refers_to_dates(cycle_config):
+                yield self._unroll_one_off(cycle_config)
+
+        # Data nodes are created ahead of the tasks, as far as the inputs can reach forward. Unrolled cycles
+        # are held back until all the tasks they can wait on exist, that is once a date after the latest
+        # of them is reached. Held back cycles are ordered by this release date, then by unrolling order.
+        data_points = self._iter_date_points()
+        next_data_point = next(data_points, None)
+        held_back: list[tuple[datetime, int, datetime, Cycle]] = []
+        for position, (date, _, cycle_config, cycle_point) in enumerate(self._iter_date_points()):
+            while held_back and held_back[0][0] < date:
+                yield self._release(heapq.heappop(held_back)[3])
+            self._evict(min([date, *(held_date for _, _, held_date, _ in held_back)]))
+            data_horizon = self._reach_forward(date, self._input_lags)
+            while next_data_point is not None and next_data_point[0] <= data_horizon:
+                _, _, data_cycle_config, data_cycle_point = next_data_point
+                for data in unroller.iter_output_data(data_cycle_config, data_cycle_point):
+                    self.data.add(data)
+                next_data_point = next(data_points, None)
+            cycle_tasks = unroller.create_tasks(cycle_config, cycle_point, self.data)
+            for task in cycle_tasks:
+                self.tasks.add(task)
+            cycle = Cycle(name=cycle_config.name, tasks=cycle_tasks, coordinates=Coordinates({DATE_DIM: date}))
+            heapq.heappush(held_back, (self._release_date(cycle_config, date), position, date, cycle))
+        while held_back:
+            yield self._release(heapq.heappop(held_back)[3])
+
+        for cycle_config in one_off_cycles:
+            if self._refers_to_dates(cycle_config):
+                yield self._unroll_one_off(cycle_config)
+
+    def _iter_date_points(self) -> Iterator[tuple[datetime, int, ConfigCycle, DateCyclePoint]]:
+        """Cycle points of all date cycles, merged by date and then by cycle order"""
+        return heapq.merge(
+            *(
+                self._iter_cycle_date_points(cycle_index, cycle_config)
+                for cycle_index, cycle_config in enumerate(self._unroller.config_cycles)
+                if isinstance(cycle_config.cycling, DateCycling)
+            ),
+            key=lambda entry: entry[:2],
+        )
+
+    @staticmethod
+    def _iter_cycle_date_points(
+        cycle_index: int, cycle_config: ConfigCycle
+    ) -> Iterator[tuple[datetime, int, ConfigCycle, DateCyclePoint]]:
+        # a function of its own to bind the cycle of each iterator
+        cycling = cast("DateCycling", cycle_config.cycling)
+        for point in cycling.stream_cycle_points():
+            yield point.chunk_start_date, cycle_index, cycle_config, point
+
+    @staticmethod
+    def _reach_forward(date: datetime, lags: list[Duration]) -> datetime:
+        return max([date, *(date + lag for lag in lags)])
+
+    @staticmethod
+    def _release_date(cycle_config: ConfigCycle, date: datetime) -> datetime:
+        """Date of the latest task the tasks of a cycle point at date can wait on"""
+        reach = [date]
+        for task_graph_spec in cycle_config.tasks:
+            for wait_on_spec in task_graph_spec.wait_on:
+                match wait_on_spec.target_cycle:
+                    case LagList():
+                        reach.extend(date + lag for lag in wait_on_spec.target_cycle.lags)
+                    case DateList():
+                        reach.extend(wait_on_spec.target_cycle.dates)
+        return max(reach)
+
+    @staticmethod
+    def _refers_to_dates(cycle_config: ConfigCycle) -> bool:
+        target_cycles = [
+            spec.target_cycle
+            for task_graph_spec in cycle_config.tasks
+            for spec in [*task_graph_spec.inputs, *task_graph_spec.wait_on]
+        ]
+        return any(isinstance(target_cycle, DateList) for target_cycle in target_cycles)
+
+    def _unroll_one_off(self, cycle_config: ConfigCycle) -> Cycle:
+        cycle_point = OneOffPoint()
+        for data in self._unroller.iter_output_data(cycle_config, cycle_point):
+            self.data.add(data)
+        cycle_tasks = self._unroller.create_tasks(cycle_config, cycle_point, self.data)
+        for task in cycle_tasks:
+            self.tasks.add(task)
+        return self._release(Cycle(name=cycle_config.name, tasks=cycle_tasks, coordinates=Coordinates()))
+
+    def _release(self, cycle: Cycle) -> Cycle:
+        for task in cycle.tasks:
+            task.link_wait_on_tasks(self.tasks)
+        return cycle
+
+    def _evict(self, frontier: datetime) -> None:
+        """Evict the nodes no task unrolled from the frontier date on can refer to"""
+        threshold = min([frontier, *(frontier + lag for lag in chain(self._input_lags, self._wait_on_lags))])
+        self.data.evict_before(threshold, keep=self._pinned_dates)
+        for task in self.tasks.evict_before(threshold, keep=self._pinned_dates):
+            # break the chains of tasks waiting on each other
+            task.wait_on = []
+
+    @classmethod
+    def from_config_file(cls: type[Self], config_path: str) -> Self:
         return cls.from_config_workflow(ConfigWorkflow.from_config_file(config_path))
 
     @classmethod
@@ -123,3 +587,153 @@ class Workflow:
             config_data=config_workflow.data,
             parameters=config_workflow.parameters,
         )
+
+
+@dataclass(kw_only=True)
+class _Unroller:
+    """Unrolling of the data and tasks of single cycle points"""
+
+    config_rootdir: Path
+    config_cycles: list[ConfigCycle]
+    config_available_data: list[ConfigAvailableData]
+    config_data_dict: dict[str, ConfigBaseData]
+    config_task_dict: dict[str, ConfigTask]
+    parameters: dict[str, list]
+    start: datetime | None = None
+    stop: datetime | None = None
+    task_names: set[str] | None = None
+    parameter_values: dict[str, list] | None = None
+
+    def __post_init__(self) -> None:
+        self.data_start, self.data_stop, self.data_dates = self.data_window(self.config_cycles, self.start, self.stop)
+
+    @cached_property
+    def parameter_codes(self) -> dict[str, list[int]]:
+        return {k: [encode(k, value) for value in values] for k, values in self.parameters.items()}
+
+    def unrolling_timelines(self, names: Callable[[ConfigCycleTask], Iterable[str]]) -> dict[str, CycleTimeline]:
+        """
+        Timelines of the date cyclings the items named by names are unrolled on, by name
+
+        Items unrolled in several cyclings are left out, their lags are resolved by date arithmetic.
+        """
+        timelines: dict[str, CycleTimeline | None] = {}
+        for cycle_config in self.config_cycles:
+            timeline = cycle_config.cycling.timeline if isinstance(cycle_config.cycling, DateCycling) else None
+            for task_graph_spec in cycle_config.tasks:
+                for name in names(task_graph_spec):
+                    timelines[name] = timeline if timelines.get(name, timeline) is timeline else None
+        return {name: timeline for name, timeline in timelines.items() if timeline is not None}
+
+    @cached_property
+    def task_timelines(self) -> dict[str, CycleTimeline]:
+        return self.unrolling_timelines(lambda task_graph_spec: [task_graph_spec.name])
+
+    @cached_property
+    def data_timelines(self) -> dict[str, CycleTimeline]:
+        return self.unrolling_timelines(lambda task_graph_spec: [spec.name for spec in task_graph_spec.outputs])
+
+    @staticmethod
+    def data_window(
+        config_cycles: list[ConfigCycle], start: datetime | None, stop: datetime | None
+    ) -> tuple[datetime | None, datetime | None, set[datetime]]:
+        """Dates of the data the tasks starting in [start, stop) can consume
+
+        Returns the bounds of the window extended by the extremal lags as well
+        as the dates explicitly targeted as inputs.
+        """
+        lags = []
+        dates = set()
+        for cycle_config in config_cycles:
+            for task_graph_spec in cycle_config.tasks:
+                for input_spec in task_graph_spec.inputs:
+                    match input_spec.target_cycle:
+                        case LagList():
+                            lags.extend(input_spec.target_cycle.lags)
+                        case DateList():
+                            dates.update(input_spec.target_cycle.dates)
+        data_start = None if start is None else min([start, *(start + lag for lag in lags)])
+        data_stop = None if stop is None else max([stop, *(stop + lag for lag in lags)])
+        return data_start, data_stop, dates
+
+    def iter_coordinates(self, cycle_point: CyclePoint, param_refs: list[str]) -> Iterator[Coordinates]:
+        """Iterate over date and parameter combinations"""
+        axes = {k: self.parameter_codes[k] for k in param_refs}
+        if isinstance(cycle_point, DateCyclePoint):
+            axes[DATE_DIM] = [encode(DATE_DIM, cycle_point.chunk_start_date)]
+        dims = tuple(axes.keys())
+        yield from (Coordinates.from_codes(dims, codes) for codes in product(*axes.values()))
+
+    # Functions to restrict unrolling to a part of the workflow, looking up the windows in the cycle timelines.
+    # One-off cycles have no date and are considered to lie before any start date.
+    def iter_data_window_points(self, cycling: Cycling) -> Iterator[CyclePoint]:
+        if not isinstance(cycling, DateCycling):
+            yield from cycling.iter_cycle_points()
+            return
+        timeline = cycling.timeline
+        indices = set(timeline.index_range(self.data_start, self.data_stop, include_stop=True))
+        indices.update(index for date in self.data_dates if (index := timeline.index(date)) is not None)
+        for index in sorted(indices):
+            yield timeline.cycle_point(index)
+
+    def in_window(self, cycle_point: CyclePoint) -> bool:
+        if isinstance(cycle_point, DateCyclePoint):
+            date = cycle_point.chunk_start_date
+            return (self.start is None or date >= self.start) and (self.stop is None or date < self.stop)
+        return self.start is None
+
+    def is_selected(self, task_name: str, coordinates: Coordinates) -> bool:
+        if self.task_names is not None and task_name not in self.task_names:
+            return False
+        if self.parameter_values is None:
+            return True
+        return all(coordinates[k] in values for k, values in self.parameter_values.items() if k in coordinates)
+
+    def iter_available_data(self) -> Iterator[Data]:
+        for config in self.config_available_data:
+            for coordinates in self.iter_coordinates(OneOffPoint(), config.parameters):
+                yield Data.from_config(config=config, coordinates=coordinates)
+
+    def iter_output_data(self, cycle_config: ConfigCycle, cycle_point: CyclePoint) -> Iterator[Data]:
+        point_in_window = self.in_window(cycle_point)
+        for task_ref in cycle_config.tasks:
+            for data_ref in task_ref.outputs:
+                data_config = self.config_data_dict[data_ref.name]
+                # NOTE: output data have the same coordinates as the task producing them
+                for coordinates in self.iter_coordinates(cycle_point, data_config.parameters):
+                    if point_in_window and self.is_selected(task_ref.name, coordinates):
+                        yield Data.from_config(config=data_config, coordinates=coordinates)
+                    else:
+                        yield ExistingData.from_config_output(
+                            config=data_config,
+                            coordinates=coordinates,
+                            producer=task_ref.name,
+                            port=data_ref.port,
+                        )
+
+    def create_tasks(
+        self,
+        cycle_config: ConfigCycle,
+        cycle_point: CyclePoint,
+        datastore: Store[Data],
+        pending: list[Task] | None = None,
+    ) -> list[Task]:
+        """Create the tasks of a cycle point, see Task.from_config for pending"""
+        cycle_tasks = []
+        for task_graph_spec in cycle_config.tasks:
+            task_config = self.config_task_dict[task_graph_spec.name]
+            for coordinates in self.iter_coordinates(cycle_point, task_config.parameters):
+                if not self.is_selected(task_graph_spec.name, coordinates):
+                    continue
+                cycle_tasks.append(
+                    Task.from_config(
+                        config=task_config,
+                        config_rootdir=self.config_rootdir,
+                        cycle_point=cycle_point,
+                        coordinates=coordinates,
+                        datastore=datastore,
+                        graph_spec=task_graph_spec,
+                        pending=pending,
+                    )
+                )
+        return cycle_tasks
@@ -0,0 +1,152 @@
+import dataclasses
+from typing import Any, Literal
+
+from sirocco import core
+from sirocco.core.fingerprint import iter_edges, node_key
+from sirocco.pretty_print import PrettyPrinter
+
+ChangeStatus = Literal["added", "removed", "modified"]
+_SYMBOLS: dict[ChangeStatus, str] = {"added": "+", "removed": "-", "modified": "~"}
+
+
+@dataclasses.dataclass(kw_only=True)
+class NodeChange:
+    """Change of a task or data node, with the details of the modifications"""
+
+    status: ChangeStatus
+    node: core.Task | core.Data  # the old node if removed, the new one otherwise
+    details: list[str] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(kw_only=True)
+class WorkflowDiff:
+    """
+    Changes between two unrolled workflows, grouped by cycle
+
+    Groups are labeled by the cycle of the tasks and of the data they produce,
+    data produced outside of any cycle are grouped under `NO_CYCLE`.
+    """
+
+    NO_CYCLE = "no cycle"
+
+    changes: dict[str, list[NodeChange]] = dataclasses.field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def add(self, group: str, change: NodeChange) -> None:
+        self.changes.setdefault(group, []).append(change)
+
+    def format(self, printer: PrettyPrinter | None = None) -> str:
+        """
+        Text representation of the changes
+
+        Example:
+
+        >>> print(WorkflowDiff().format())
+        no differences
+        """
+        printer = PrettyPrinter() if printer is None else printer
+        if not self.changes:
+            return "no differences"
+        blocks = []
+        for group, changes in self.changes.items():
+            lines = []
+            for change in changes:
+                kind = "task" if isinstance(change.node, core.Task) else "data"
+                lines.append(f"{_SYMBOLS[change.status]} {kind} {printer.format_basic(change.node)}")
+                lines.extend(printer.indent(printer.indent(detail)) for detail in change.details)
+            blocks.append(printer.as_block(group, "\n".join(lines)))
+        return "\n".join(blocks)
+
+
+def diff_workflows(old: core.Workflow, new: core.Workflow) -> WorkflowDiff:
+    """
+    Added, removed and modified tasks and data of new with respect to old
+
+    Nodes are matched by name and coordinates and compared through their structural hashes, skipping the
+    cycles with identical hashes, so the cost is linear in the number of nodes. Node hashes cover everything
+    upstream of the nodes, details are worked out where they differ: settings, edges and namelist entries.
+    Nodes without details only depend on modified nodes and are not reported.
+    """
+    result = WorkflowDiff()
+    if old.structural_hash == new.structural_hash:
+        return result
+    printer = PrettyPrinter()
+
+    old_cycles = {(cycle.name, cycle.coordinates): cycle for cycle in old.cycles}
+    unchanged_cycles = {
+        (cycle.name, cycle.coordinates)
+        for cycle in new.cycles
+        if (old_cycle := old_cycles.get((cycle.name, cycle.coordinates))) is not None
+        and old.cycle_hash(old_cycle) == new.cycle_hash(cycle)
+    }
+
+    def group(workflow: core.Workflow, node: core.Task | core.Data) -> str | None:
+        """Label of the cycle of a node, None if the cycle is unchanged"""
+        task = node if isinstance(node, core.Task) else workflow.producer(node)
+        if task is None:
+            return WorkflowDiff.NO_CYCLE
+        cycle = workflow.cycle_of(task)
+        if (cycle.name, cycle.coordinates) in unchanged_cycles:
+            return None
+        return printer.format_basic(cycle)
+
+    for old_store, new_store in ((old.tasks, new.tasks), (old.data, new.data)):
+        old_nodes = {(node.name, node.coordinates): node for node in old_store}
+        new_keys = set()
+        for node in new_store:
+            new_keys.add(key := (node.name, node.coordinates))
+            if (label := group(new, node)) is None:
+                continue
+            if (old_node := old_nodes.get(key)) is None:
+                result.add(label, NodeChange(status="added", node=node))
+            elif old.node_hash(old_node) != new.node_hash(node) and (details := _details(old_node, node, printer)):
+                result.add(label, NodeChange(status="modified", node=node, details=details))
+        for key, old_node in old_nodes.items():
+            if key not in new_keys and (label := group(old, old_node)) is not None:
+                result.add(label, NodeChange(status="removed", node=old_node))
+    return result
+
+
+def _details(old: core.Task | core.Data, new: core.Task | core.Data, printer: PrettyPrinter) -> list[str]:
+    details = []
+    if type(old) is not type(new):
+        details.append(f"type: {type(old).__name__} -> {type(new).__name__}")
+    details.extend(_mapping_changes(old.settings(), new.settings()))
+    if isinstance(old, core.Task) and isinstance(new, core.Task):
+        old_edges = {(kind, port, node_key(node)): node for kind, port, node in iter_edges(old)}
+        new_edges = {(kind, port, node_key(node)): node for kind, port, node in iter_edges(new)}
+        for symbol, edges, other_edges in (("-", old_edges, new_edges), ("+", new_edges, old_edges)):
+            for (kind, port, key), node in edges.items():
+                if (kind, port, key) not in other_edges:
+                    port_label = "" if port is None else f" {port}"
+                    details.append(f"{symbol} {kind}{port_label}: {printer.format_basic(node)}")
+        details.extend(_mapping_changes(_namelist_entries(old), _namelist_entries(new), prefix="namelist "))
+    return details
+
+
+def _mapping_changes(old: dict[str, Any], new: dict[str, Any], prefix: str = "") -> list[str]:
+    changes = []
+    for key, value in new.items():
+        if key not in old:
+            changes.append(f"+ {prefix}{key}: {value!r}")
+        elif old[key] != value:
+            changes.append(f"~ {prefix}{key}: {old[key]!r} -> {value!r}")
+    changes.extend(f"- {prefix}{key}: {value!r}" for key, value in old.items() if key not in new)
+    return changes
+
+
+def _namelist_entries(task: core.Task) -> dict[str, Any]:
+    """Namelist entries of an ICON task as {'file:section.key': value}, with [i] suffixes for repeated sections"""
+    if not isinstance(task, core.IconTask):
+        return {}
+    entries = {}
+    for namelist in task.namelists:
+        for section, content in namelist.namelist.items():
+            groups = content if isinstance(content, list) else [content]
+            for index, group in enumerate(groups, start=1):
+                section_label = f"{section}[{index}]" if isinstance(content, list) else section
+                for key, value in group.items():
+                    entries[f"{namelist.name}:{section_label}.{key}"] = value
+    return entries
@@ -0,0 +1,147 @@
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import Any, TextIO
+
+from sirocco import core
+from sirocco.core.coordinates import DATE_DIM
+from sirocco.core.fingerprint import iter_edges
+
+# Columns of the exported records and their types. Task records fill the scheduler resources,
+# data records the path and format, edge records go from the dependency to the dependent node.
+RECORD_COLUMNS: dict[str, str] = {
+    "record": "string",  # task, data or edge
+    "id": "int64",  # node id, tasks first and then data
+    "name": "string",
+    "type": "string",  # class of the node, e.g. IconTask or AvailableData
+    "coordinates": "json",
+    "date": "timestamp",
+    "cycle": "string",  # cycle of the task, or of the task producing the data
+    "cycle_date": "timestamp",
+    "plugin": "string",
+    "computer": "string",
+    "host": "string",
+    "account": "string",
+    "uenv": "json",
+    "nodes": "int64",
+    "walltime": "string",
+    "ntasks_per_node": "int64",
+    "mem": "int64",
+    "cpus_per_task": "int64",
+    "mpi_cmd": "string",
+    "path": "string",
+    "format": "string",
+    "kind": "string",  # input, output or wait_on
+    "port": "string",
+    "source": "int64",
+    "target": "int64",
+}
+_RESOURCES = ("host", "account", "uenv", "nodes", "walltime", "ntasks_per_node", "mem", "cpus_per_task", "mpi_cmd")
+
+
+def iter_records(workflow: core.Workflow) -> Iterator[dict[str, Any]]:
+    """
+    One record per task, data node and edge of the unrolled workflow, with the keys of RECORD_COLUMNS
+
+    Records are generated while walking the stores, first the tasks, then the data and finally the edges.
+    """
+    node_ids = {id(node): node_id for node_id, node in enumerate(chain(workflow.tasks, workflow.data))}
+    plugins = {task_class: plugin for plugin, task_class in core.Task.plugin_classes.items()}
+    for task in workflow.tasks:
+        yield _node_record("task", node_ids[id(task)], task, workflow.cycle_of(task)) | {
+            "plugin": plugins[type(task)],
+            "computer": task.computer,
+            **{resource: getattr(task, resource) for resource in _RESOURCES},
+        }
+    for data in workflow.data:
+        producer = workflow.producer(data)
+        cycle = None if producer is None else workflow.cycle_of(producer)
+        path = getattr(data, "path", None)
+        yield _node_record("data", node_ids[id(data)], data, cycle) | {
+            "computer": getattr(data, "computer", None),
+            "path": None if path is None else str(path),
+            "format": data.format,
+        }
+    for task in workflow.tasks:
+        task_id = node_ids[id(task)]
+        for kind, port, node in iter_edges(task):
+            # awaited tasks pruned out of a partial workflow are not in it anymore
+            if (node_id := node_ids.get(id(node))) is None:
+                continue
+            source, target = (task_id, node_id) if kind == "output" else (node_id, task_id)
+            yield dict.fromkeys(RECORD_COLUMNS) | {
+                "record": "edge",
+                "kind": kind,
+                "port": port,
+                "source": source,
+                "target": target,
+            }
+
+
+def _node_record(record: str, node_id: int, node: core.GraphItem, cycle: core.Cycle | None) -> dict[str, Any]:
+    return dict.fromkeys(RECORD_COLUMNS) | {
+        "record": record,
+        "id": node_id,
+        "name": node.name,
+        "type": type(node).__name__,
+        "coordinates": dict(node.coordinates.items()),
+        "date": node.coordinates.get(DATE_DIM),
+        "cycle": None if cycle is None else cycle.name,
+        "cycle_date": None if cycle is None else cycle.coordinates.get(DATE_DIM),
+    }
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def write_jsonl(workflow: core.Workflow, sink: TextIO) -> None:
+    """Write the records of the workflow as JSON Lines, leaving out empty fields"""
+    for record in iter_records(workflow):
+        sink.write(json.dumps({k: v for k, v in record.items() if v is not None}, default=_json_default))
+        sink.write("\n")
+
+
+def write_parquet(workflow: core.Workflow, path: Path, batch_size: int = 65536) -> None:
+    """
+    Write the records of the workflow as a Parquet file, with the columns of RECORD_COLUMNS
+
+    Records are converted to columnar batches of batch_size rows and written as they come.
+    JSON columns are stored as strings, e.g. to be parsed with `json_extract` in DuckDB.
+    Requires pyarrow.
+    """
+    try:
+        import pyarrow as pa  # noqa: PLC0415 optional dependency
+        import pyarrow.parquet as pq  # noqa: PLC0415 optional dependency
+    except ImportError as e:
+        msg = "Writing Parquet files requires pyarrow, install it with `pip install 'sirocco[parquet]'`."
+        raise ImportError(msg) from e
+
+    arrow_types = {"string": pa.string(), "json": pa.string(), "int64": pa.int64(), "timestamp": pa.timestamp("us")}
+    schema = pa.schema([(column, arrow_types[kind]) for column, kind in RECORD_COLUMNS.items()])
+    json_columns = [column for column, kind in RECORD_COLUMNS.items() if kind == "json"]
+
+    def to_batch(records: list[dict[str, Any]]) -> Any:
+        columns = {column: [record[column] for record in records] for column in RECORD_COLUMNS}
+        for column in json_columns:
+            columns[column] = [
+                None if value is None else json.dumps(value, default=_json_default) for value in columns[column]
+            ]
+        return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+    with pq.ParquetWriter(path, schema) as writer:
+        batch: list[dict[str, Any]] = []
+        for record in iter_records(workflow):
+            batch.append(record)
+            if len(batch) == batch_size:
+                writer.write_batch(to_batch(batch))
+                batch = []
+        if batch:
+            writer.write_batch(to_batch(batch))
@@ -0,0 +1,380 @@
+// Viewer for the compact JSON graphs exported by `sirocco visualize --format html`
+//
+// Nodes are grouped by cycle: one lane per cycle name, one column per cycle date. Groups are either
+// collapsed into a single box or expanded, in which case their nodes are laid out in layers following
+// their dependencies. Layouts are only computed for expanded groups and only the groups, nodes and
+// edges intersecting the visible region are drawn, so large graphs stay responsive.
+
+(function () {
+    "use strict";
+
+    const graph = JSON.parse(document.getElementById("graph-data").textContent);
+    const canvas = document.getElementById("graph");
+    const ctx = canvas.getContext("2d");
+    const tooltip = document.getElementById("tooltip");
+
+    const KINDS = ["task", "available", "generated", "stub"];
+    const NODE_W = 160, NODE_H = 36, GAP_X = 48, GAP_Y = 14, PAD = 20, HEADER = 30;
+    const COLLAPSED_W = 200, COLLAPSED_H = 64, GROUP_GAP = 60;
+    const EXPANDED_BY_DEFAULT = 5000;  // maximum number of nodes for which all cycles start expanded
+
+    const n = graph.kind.length;
+    const nCycles = graph.cycles.label.length;
+    const nGroups = nCycles + 1;  // the last group holds the nodes outside of any cycle
+    const groupOf = new Int32Array(n);
+    for (let i = 0; i < n; i++) groupOf[i] = graph.cycle[i] < 0 ? nCycles : graph.cycle[i];
+
+    // --- edges, indexed by source and by target ---
+
+    const edgeFlat = graph.edges.concat(graph.wait_on);
+    const nDataEdges = graph.edges.length / 2;
+    const nEdges = edgeFlat.length / 2;
+
+    function buildCsr(from) {
+        const indptr = new Int32Array(n + 1);
+        for (let e = 0; e < nEdges; e++) indptr[edgeFlat[2 * e + from] + 1]++;
+        for (let i = 0; i < n; i++) indptr[i + 1] += indptr[i];
+        const fill = indptr.slice(0, n);
+        const edgeIds = new Int32Array(nEdges);
+        for (let e = 0; e < nEdges; e++) edgeIds[fill[edgeFlat[2 * e + from]]++] = e;
+        return {indptr, edgeIds};
+    }
+    const outEdges = buildCsr(0);
+    const inEdges = buildCsr(1);
+
+    // --- groups ---
+
+    const members = Array.from({length: nGroups}, () => []);
+    for (let i = 0; i < n; i++) members[groupOf[i]].push(i);
+
+    const dates = [...new Set(graph.cycles.date.filter((date) => date !== null))].sort();
+    const dateSlot = new Map(dates.map((date, index) => [date, index + 1]));
+    const firstDated = graph.cycles.date.findIndex((date) => date !== null);
+    const lanes = new Map();
+    const laneOf = new Int32Array(nGroups);
+    const slotOf = new Int32Array(nGroups);
+    for (let g = 0; g < nCycles; g++) {
+        const name = graph.cycles.name[g];
+        if (!lanes.has(name)) lanes.set(name, lanes.size + 1);
+        laneOf[g] = lanes.get(name);
+        const date = graph.cycles.date[g];
+        if (date !== null) slotOf[g] = dateSlot.get(date);
+        else slotOf[g] = firstDated < 0 || g < firstDated ? 0 : dates.length + 1;
+    }
+    laneOf[nCycles] = 0;
+    slotOf[nCycles] = 0;
+    const nLanes = lanes.size + 1, nSlots = dates.length + 2;
+
+    const expanded = new Uint8Array(nGroups).fill(!graph.collapsed && n <= EXPANDED_BY_DEFAULT ? 1 : 0);
+    const laidOut = new Uint8Array(nGroups);
+    const groupW = new Float64Array(nGroups), groupH = new Float64Array(nGroups);
+    const groupX = new Float64Array(nGroups), groupY = new Float64Array(nGroups);
+    const localX = new Float64Array(n), localY = new Float64Array(n);
+    let totalW = 0, totalH = 0;
+
+    function layoutGroup(g) {
+        // layers by longest path within the group, in topological order
+        const nodes = members[g];
+        const indegree = new Map(nodes.map((i) => [i, 0]));
+        for (const i of nodes) {
+            for (let k = outEdges.indptr[i]; k < outEdges.indptr[i + 1]; k++) {
+                const j = edgeFlat[2 * outEdges.edgeIds[k] + 1];
+                if (indegree.has(j)) indegree.set(j, indegree.get(j) + 1);
+            }
+        }
+        const layer = new Map(nodes.map((i) => [i, 0]));
+        const queue = nodes.filter((i) => indegree.get(i) === 0);
+        for (let q = 0; q < queue.length; q++) {
+            const i = queue[q];
+            for (let k = outEdges.indptr[i]; k < outEdges.indptr[i + 1]; k++) {
+                const j = edgeFlat[2 * outEdges.edgeIds[k] + 1];
+                if (!indegree.has(j)) continue;
+                layer.set(j, Math.max(layer.get(j), layer.get(i) + 1));
+                indegree.set(j, indegree.get(j) - 1);
+                if (indegree.get(j) === 0) queue.push(j);
+            }
+        }
+        const rows = [];
+        for (const i of nodes) {
+            const l = layer.get(i);
+            rows[l] = (rows[l] || 0) + 1;
+            localX[i] = PAD + l * (NODE_W + GAP_X);
+            localY[i] = HEADER + PAD + (rows[l] - 1) * (NODE_H + GAP_Y);
+        }
+        let maxRows = 1;
+        for (const count of rows) maxRows = Math.max(maxRows, count || 0);
+        groupW[g] = Math.max(COLLAPSED_W, 2 * PAD + rows.length * NODE_W + Math.max(0, rows.length - 1) * GAP_X);
+        groupH[g] = HEADER + 2 * PAD + maxRows * NODE_H + (maxRows - 1) * GAP_Y;
+        laidOut[g] = 1;
+    }
+
+    function layoutGroups() {
+        const slotW = new Float64Array(nSlots), laneH = new Float64Array(nLanes);
+        for (let g = 0; g < nGroups; g++) {
+            if (members[g].length === 0) continue;
+            if (expanded[g] && !laidOut[g]) layoutGroup(g);
+            const w = expanded[g] ? groupW[g] : COLLAPSED_W, h = expanded[g] ? groupH[g] : COLLAPSED_H;
+            slotW[slotOf[g]] = Math.max(slotW[slotOf[g]], w);
+            laneH[laneOf[g]] = Math.max(laneH[laneOf[g]], h);
+        }
+        const slotX = new Float64Array(nSlots + 1), laneY = new Float64Array(nLanes + 1);
+        for (let s = 0; s < nSlots; s++) slotX[s + 1] = slotX[s] + slotW[s] + (slotW[s] ? GROUP_GAP : 0);
+        for (let l = 0; l < nLanes; l++) laneY[l + 1] = laneY[l] + laneH[l] + (laneH[l] ? GROUP_GAP : 0);
+        for (let g = 0; g < nGroups; g++) {
+            groupX[g] = slotX[slotOf[g]];
+            groupY[g] = laneY[laneOf[g]];
+        }
+        totalW = slotX[nSlots];
+        totalH = laneY[nLanes];
+    }
+
+    function groupBox(g) {
+        return expanded[g]
+            ? [groupX[g], groupY[g], groupW[g], groupH[g]]
+            : [groupX[g], groupY[g], COLLAPSED_W, COLLAPSED_H];
+    }
+
+    // position of the left and right anchors of a node, or of its group if collapsed
+    function anchor(i, right) {
+        const g = groupOf[i];
+        if (expanded[g]) return [groupX[g] + localX[i] + (right ? NODE_W : 0), groupY[g] + localY[i] + NODE_H / 2];
+        return [groupX[g] + (right ? COLLAPSED_W : 0), groupY[g] + COLLAPSED_H / 2];
+    }
+
+    // --- texts, following the tooltips of VizGraph ---
+
+    function nodeTooltip(i) {
+        const lines = [graph.names[graph.name[i]]];
+        if (graph.kind[i] === 3) lines.push("  outside of the subgraph");
+        graph.dims.forEach((dim, d) => {
+            const value = graph.coords[d][i];
+            if (value >= 0) lines.push(`  ${dim}: ${graph.values[d][value]}`);
+        });
+        return lines.join("\n");
+    }
+
+    function groupTooltip(g) {
+        const label = g < nCycles ? graph.cycles.label[g] : "outside of cycles";
+        return `${label}\n  nodes: ${members[g].length}`;
+    }
+
+    // --- view ---
+
+    let scale = 1, tx = 0, ty = 0, pending = false;
+
+    function resize() {
+        const ratio = window.devicePixelRatio || 1;
+        canvas.width = canvas.clientWidth * ratio;
+        canvas.height = canvas.clientHeight * ratio;
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        redraw();
+    }
+
+    function redraw() {
+        if (!pending) {
+            pending = true;
+            window.requestAnimationFrame(draw);
+        }
+    }
+
+    function visibleRegion() {
+        return [-tx / scale, -ty / scale, canvas.clientWidth / scale, canvas.clientHeight / scale];
+    }
+
+    function intersects(box, region) {
+        return box[0] < region[0] + region[2] && box[0] + box[2] > region[0]
+            && box[1] < region[1] + region[3] && box[1] + box[3] > region[1];
+    }
+
+    function visibleGroups(region) {
+        const groups = [];
+        for (let g = 0; g < nGroups; g++) {
+            if (members[g].length && intersects(groupBox(g), region)) groups.push(g);
+        }
+        return groups;
+    }
+
+    function drawEdge(e) {
+        const [x1, y1] = anchor(edgeFlat[2 * e], true);
+        const [x2, y2] = anchor(edgeFlat[2 * e + 1], false);
+        const bend = Math.max(20, Math.abs(x2 - x1) / 2);
+        ctx.setLineDash(e >= nDataEdges ? [6, 4] : []);
+        ctx.beginPath();
+        ctx.moveTo(x1, y1);
+        ctx.bezierCurveTo(x1 + bend, y1, x2 - bend, y2, x2, y2);
+        ctx.stroke();
+    }
+
+    function drawBox(x, y, w, h, style, label, rounded) {
+        ctx.fillStyle = style.fillcolor;
+        ctx.strokeStyle = style.color;
+        ctx.setLineDash(style.dashed ? [4, 3] : []);
+        ctx.beginPath();
+        if (rounded) ctx.ellipse(x + w / 2, y + h / 2, w / 2, h / 2, 0, 0, 2 * Math.PI);
+        else ctx.rect(x, y, w, h);
+        ctx.fill();
+        ctx.stroke();
+        if (scale > 0.3) {
+            ctx.fillStyle = style.fontcolor;
+            ctx.fillText(label, x + w / 2, y + h / 2, w - 8);
+        }
+    }
+
+    function draw() {
+        pending = false;
+        ctx.save();
+        ctx.clearRect(0, 0, canvas.clientWidth, canvas.clientHeight);
+        ctx.translate(tx, ty);
+        ctx.scale(scale, scale);
+        ctx.textAlign = "center";
+        ctx.textBaseline = "middle";
+        ctx.font = `14px ${graph.styles.fontname}, sans-serif`;
+
+        const region = visibleRegion();
+        const groups = visibleGroups(region);
+        const shown = new Uint8Array(nGroups);
+        for (const g of groups) shown[g] = 1;
+
+        // clusters
+        for (const g of groups) {
+            const [x, y, w, h] = groupBox(g);
+            ctx.setLineDash([]);
+            ctx.fillStyle = graph.styles.cluster;
+            ctx.fillRect(x, y, w, h);
+            if (scale > 0.3) {
+                ctx.fillStyle = "#000";
+                const label = g < nCycles ? graph.cycles.label[g].replace(/\n\s*/g, " ") : "outside of cycles";
+                const text = expanded[g] ? `▾ ${label}` : `▸ ${label} (${members[g].length})`;
+                ctx.fillText(text, x + w / 2, y + (expanded[g] ? HEADER / 2 : h / 2), w - 8);
+            }
+        }
+
+        // edges of the visible nodes, or of the visible collapsed groups
+        ctx.strokeStyle = graph.styles.edge;
+        ctx.lineWidth = 1.5;
+        // edges between collapsed groups are drawn once per pair of groups
+        const drawnGroupEdges = new Set();
+        function consider(e) {
+            const gi = groupOf[edgeFlat[2 * e]], gj = groupOf[edgeFlat[2 * e + 1]];
+            if (!expanded[gi] && !expanded[gj]) {
+                if (gi === gj || drawnGroupEdges.has(gi * nGroups + gj)) return;
+                drawnGroupEdges.add(gi * nGroups + gj);
+            }
+            drawEdge(e);
+        }
+        for (const g of groups) {
+            for (const i of members[g]) {
+                if (expanded[g]) {
+                    const box = [groupX[g] + localX[i], groupY[g] + localY[i], NODE_W, NODE_H];
+                    if (!intersects(box, region)) continue;
+                }
+                for (let k = outEdges.indptr[i]; k < outEdges.indptr[i + 1]; k++) consider(outEdges.edgeIds[k]);
+                for (let k = inEdges.indptr[i]; k < inEdges.indptr[i + 1]; k++) {
+                    // edges from the visible groups are drawn from their source
+                    const e = inEdges.edgeIds[k];
+                    if (!shown[groupOf[edgeFlat[2 * e]]]) consider(e);
+                }
+            }
+        }
+
+        // nodes
+        ctx.lineWidth = 2;
+        for (const g of groups) {
+            if (!expanded[g]) continue;
+            for (const i of members[g]) {
+                const x = groupX[g] + localX[i], y = groupY[g] + localY[i];
+                if (!intersects([x, y, NODE_W, NODE_H], region)) continue;
+                const kind = graph.kind[i], isData = kind === 1 || kind === 2;
+                drawBox(x, y, NODE_W, NODE_H, graph.styles[KINDS[kind]], graph.names[graph.name[i]], isData);
+            }
+        }
+        ctx.restore();
+    }
+
+    // --- interaction ---
+
+    function hit(clientX, clientY) {
+        const rect = canvas.getBoundingClientRect();
+        const x = (clientX - rect.left - tx) / scale, y = (clientY - rect.top - ty) / scale;
+        for (const g of visibleGroups(visibleRegion())) {
+            const [gx, gy, w, h] = groupBox(g);
+            if (x < gx || x > gx + w || y < gy || y > gy + h) continue;
+            if (expanded[g]) {
+                for (const i of members[g]) {
+                    const nx = gx + localX[i], ny = gy + localY[i];
+                    if (x >= nx && x <= nx + NODE_W && y >= ny && y <= ny + NODE_H) return {node: i};
+                }
+                return {group: g, header: y <= gy + HEADER};
+            }
+            return {group: g, header: true};
+        }
+        return null;
+    }
+
+    function toggle(g) {
+        expanded[g] = expanded[g] ? 0 : 1;
+        layoutGroups();
+        redraw();
+    }
+
+    function setAll(value) {
+        expanded.fill(value);
+        layoutGroups();
+        redraw();
+    }
+
+    let drag = null;
+    canvas.addEventListener("mousedown", (event) => {
+        drag = {x: event.clientX, y: event.clientY, moved: false};
+    });
+    window.addEventListener("mouseup", (event) => {
+        if (drag && !drag.moved) {
+            const target = hit(event.clientX, event.clientY);
+            if (target && target.group !== undefined && target.header) toggle(target.group);
+        }
+        drag = null;
+    });
+    canvas.addEventListener("mousemove", (event) => {
+        if (drag) {
+            const dx = event.clientX - drag.x, dy = event.clientY - drag.y;
+            if (Math.abs(dx) + Math.abs(dy) > 2) drag.moved = true;
+            tx += dx;
+            ty += dy;
+            drag.x = event.clientX;
+            drag.y = event.clientY;
+            tooltip.style.display = "none";
+            redraw();
+            return;
+        }
+        const target = hit(event.clientX, event.clientY);
+        if (target === null) {
+            tooltip.style.display = "none";
+            return;
+        }
+        tooltip.textContent = target.node !== undefined ? nodeTooltip(target.node) : groupTooltip(target.group);
+        tooltip.style.left = `${event.clientX + 12}px`;
+        tooltip.style.top = `${event.clientY + 12}px`;
+        tooltip.style.display = "block";
+    });
+    canvas.addEventListener("wheel", (event) => {
+        event.preventDefault();
+        const rect = canvas.getBoundingClientRect();
+        const x = event.clientX - rect.left, y = event.clientY - rect.top;
+        const factor = Math.exp(-event.deltaY * 0.001);
+        const newScale = Math.min(4, Math.max(0.01, scale * factor));
+        tx = x - (x - tx) * newScale / scale;
+        ty = y - (y - ty) * newScale / scale;
+        scale = newScale;
+        redraw();
+    }, {passive: false});
+
+    document.getElementById("expand-all").addEventListener("click", () => setAll(1));
+    document.getElementById("collapse-all").addEventListener("click", () => setAll(0));
+    window.addEventListener("resize", resize);
+
+    layoutGroups();
+    // fit the height of the graph, and its width as long as nodes stay readable
+    scale = Math.min(1, Math.max(0.2, Math.min(canvas.clientWidth / totalW, canvas.clientHeight / totalH)));
+    tx = ty = PAD;
+    resize();
+})();
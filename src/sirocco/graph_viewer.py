@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from functools import cache
+from html import escape
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from sirocco import core
+from sirocco.core.coordinates import DATE_DIM
+from sirocco.core.graph_arrays import TASK_NODE
+from sirocco.vizgraph import VizGraph
+
+# node kinds, see KINDS in graph-viewer.js
+TASK_KIND = 0
+AVAILABLE_KIND = 1
+GENERATED_KIND = 2
+STUB_KIND = 3
+
+
+def graph_json(workflow: core.Workflow, *, collapsed: bool = False) -> dict[str, Any]:
+    """
+    Compact representation of the unrolled graph for the in-browser viewer
+
+    Nodes are given as columns, following `Workflow.graph_arrays`: kind, index in `names`, index of the cycle
+    (-1 outside of any cycle) and, for each dimension, the index of the value in `values` (-1 if missing).
+    Edges are flat lists of (source, target) node ids. Tasks producing or consuming data outside of a subgraph
+    are appended as stub nodes, as in `VizGraph`. Styles and cycle labels are the ones of `VizGraph`.
+    """
+    arrays = workflow.graph_arrays
+    n_nodes = len(arrays)
+    name_ids = {name: index for index, name in enumerate(arrays.names)}
+
+    kind = np.where(arrays.node_type == TASK_NODE, TASK_KIND, GENERATED_KIND)
+    kind[np.array([isinstance(node, core.AvailableData) for node in arrays.nodes], dtype=bool)] = AVAILABLE_KIND
+    values = [[str(value) for value in dim_values] for dim_values in arrays.values]
+    coords = [arrays.coordinates[:, dim_index].tolist() for dim_index in range(len(arrays.dims))]
+
+    stub_names: list[int] = []
+    stub_cycles: list[int] = []
+    stub_edges: list[int] = []
+    for node_id, node in enumerate(arrays.nodes):
+        if not isinstance(node, core.Data):
+            continue
+        stubs = [(node.producer, True)] if isinstance(node, core.ExistingData) else []
+        stubs.extend((consumer, False) for consumer in workflow.outside_consumers(node))
+        for task_name, incoming in stubs:
+            stub_id = n_nodes + len(stub_names)
+            stub_names.append(name_ids.setdefault(task_name, len(name_ids)))
+            stub_cycles.append(int(arrays.cycle_index[node_id]))
+            stub_edges.extend((stub_id, node_id) if incoming else (node_id, stub_id))
+
+    cycles = list(workflow.cycles)
+    stub_kw = VizGraph.stub_node_kw
+    styles = {
+        "task": _colors(VizGraph.task_node_kw),
+        "available": _colors(VizGraph.data_av_node_kw),
+        "generated": _colors(VizGraph.data_gen_node_kw),
+        "stub": {"fillcolor": "#FFFFFF", "color": stub_kw["color"], "fontcolor": stub_kw["fontcolor"], "dashed": True},
+        "edge": VizGraph.edge_base_kw["color"],
+        "cluster": VizGraph.cluster_kw["bgcolor"],
+        "fontname": VizGraph.node_base_kw["fontname"],
+    }
+    return {
+        "workflow": workflow.name,
+        "collapsed": collapsed,
+        "styles": styles,
+        "names": list(name_ids),
+        "dims": list(arrays.dims),
+        "values": values,
+        "kind": kind.tolist() + [STUB_KIND] * len(stub_names),
+        "name": arrays.name_index.tolist() + stub_names,
+        "cycle": arrays.cycle_index.tolist() + stub_cycles,
+        "coords": [column + [-1] * len(stub_names) for column in coords],
+        "edges": _flat_edges(arrays.data_indptr, arrays.data_indices) + stub_edges,
+        "wait_on": _flat_edges(arrays.wait_on_indptr, arrays.wait_on_indices),
+        "cycles": {
+            "name": [cycle.name for cycle in cycles],
+            "label": [VizGraph.tooltip(cycle) for cycle in cycles],
+            "date": [
+                None if (date := cycle.coordinates.get(DATE_DIM)) is None else date.isoformat() for cycle in cycles
+            ],
+        },
+    }
+
+
+def _colors(gv_kw: dict[str, Any]) -> dict[str, str]:
+    return {key: gv_kw[key] for key in ("fillcolor", "color", "fontcolor")}
+
+
+def _flat_edges(indptr: np.ndarray, indices: np.ndarray) -> list[int]:
+    """Edges of a CSR adjacency as a flat list of (source, target) pairs"""
+    sources = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    return np.column_stack((sources, indices)).ravel().tolist()
+
+
+@cache
+def _viewer_assets() -> tuple[str, str]:
+    """Style and script of the viewer, read once per process"""
+    this_dir = Path(__file__).parent
+    return (this_dir / "graph-viewer.css").read_text(), (this_dir / "graph-viewer.js").read_text()
+
+
+def render_html(workflow: core.Workflow, *, collapsed: bool = False) -> str:
+    """
+    Self-contained html page showing the unrolled graph in a viewer which renders the visible region only
+
+    Cycles can be collapsed and expanded by clicking on their title, all of them start collapsed
+    for large graphs or with `collapsed`.
+    """
+    style, script = _viewer_assets()
+    # "</" can't appear in a script element
+    data = json.dumps(graph_json(workflow, collapsed=collapsed), separators=(",", ":")).replace("</", "<\\/")
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            '<html lang="en">',
+            "<head>",
+            '<meta charset="utf-8">',
+            f"<title>{escape(workflow.name)}</title>",
+            f"<style>{style}</style>",
+            "</head>",
+            "<body>",
+            '<canvas id="graph"></canvas>',
+            '<div id="toolbar">',
+            f"<span>{escape(workflow.name)}: drag to pan, scroll to zoom, click on a cycle title to toggle it</span>",
+            '<button id="expand-all">expand all</button>',
+            '<button id="collapse-all">collapse all</button>',
+            "</div>",
+            '<div id="tooltip"></div>',
+            f'<script type="application/json" id="graph-data">{data}</script>',
+            f"<script>{script}</script>",
+            "</body>",
+            "</html>",
+            "",
+        ]
+    )
+
+
+def write_html(workflow: core.Workflow, file_path: Path, *, collapsed: bool = False) -> None:
+    Path(file_path).write_text(render_html(workflow, collapsed=collapsed))
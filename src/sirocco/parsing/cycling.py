@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
 from collections.abc import Iterator  # noqa: TCH003 needed for pydantic
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime  # noqa: TCH003 needed for pydantic
-from typing import Annotated, Self
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Annotated, Self
 
+import numpy as np
 from isoduration.types import Duration  # noqa: TCH002 needed for pydantic
 from pydantic import BaseModel, BeforeValidator, ConfigDict, model_validator
 
 from sirocco.parsing._utils import TimeUtils, convert_to_date, convert_to_duration
 
+if TYPE_CHECKING:
+    from sirocco.parsing.when import When
+
 
 class CyclePoint:
     pass
@@ -35,11 +41,140 @@ class DateCyclePoint(CyclePoint):
     chunk_start_date: datetime
     chunk_stop_date: datetime
     period: Duration
+    index: int | None = None  # position in the timeline
+    timeline: CycleTimeline | None = field(default=None, repr=False, compare=False)
 
     def __str__(self) -> str:
         return f"[{self.chunk_start_date} -- {self.chunk_stop_date}]"
 
 
+@dataclass(frozen=True, eq=False)
+class CycleTimeline:
+    """
+    Ordered chunk dates of a date cycling
+
+    Cycle points are accessed by index in O(1) and dates are mapped to indices in O(log n).
+
+    Example:
+
+        >>> timeline = CycleTimeline.from_dates(
+        ...     start_date=datetime(2026, 1, 1),
+        ...     stop_date=datetime(2027, 3, 1),
+        ...     period=convert_to_duration("P6M"),
+        ... )
+        >>> len(timeline)
+        3
+        >>> print(timeline.cycle_point(2))
+        [2027-01-01 00:00:00 -- 2027-03-01 00:00:00]
+        >>> timeline.index(datetime(2026, 7, 1)), timeline.index(datetime(2026, 8, 1))
+        (1, None)
+        >>> timeline.index_range(start=datetime(2026, 2, 1))
+        range(1, 3)
+        >>> timeline.lag_indices(convert_to_duration("-P6M")).tolist()
+        [-1, 0, 1]
+    """
+
+    start_date: datetime
+    stop_date: datetime
+    period: Duration
+    chunk_start_dates: tuple[datetime, ...]
+    chunk_stop_dates: tuple[datetime, ...]
+    _lag_tables: dict[tuple[str, CycleTimeline], np.ndarray] = field(default_factory=dict, init=False, repr=False)
+    _activity_masks: dict[When, np.ndarray] = field(default_factory=dict, init=False, repr=False)
+
+    @classmethod
+    def from_dates(cls, start_date: datetime, stop_date: datetime, period: Duration) -> Self:
+        chunk_start_dates = []
+        chunk_stop_dates = []
+        begin = start_date
+        while begin < stop_date:
+            end = min(begin + period, stop_date)
+            chunk_start_dates.append(begin)
+            chunk_stop_dates.append(end)
+            begin = end
+        return cls(
+            start_date=start_date,
+            stop_date=stop_date,
+            period=period,
+            chunk_start_dates=tuple(chunk_start_dates),
+            chunk_stop_dates=tuple(chunk_stop_dates),
+        )
+
+    def __len__(self) -> int:
+        return len(self.chunk_start_dates)
+
+    def cycle_point(self, index: int) -> DateCyclePoint:
+        return DateCyclePoint(
+            start_date=self.start_date,
+            stop_date=self.stop_date,
+            chunk_start_date=self.chunk_start_dates[index],
+            chunk_stop_date=self.chunk_stop_dates[index],
+            period=self.period,
+            index=index,
+            timeline=self,
+        )
+
+    def index(self, date: datetime) -> int | None:
+        """Index of the cycle point starting at date, None if there is none"""
+        index = bisect_left(self.chunk_start_dates, date)
+        if index < len(self) and self.chunk_start_dates[index] == date:
+            return index
+        return None
+
+    def lag_indices(self, lag: Duration, target: CycleTimeline | None = None) -> np.ndarray:
+        """
+        Read-only array of the indices in target of the cycle points shifted by lag, computed once per lag and target
+
+        The target defaults to this timeline. Lagged dates are validated against the target when the table is
+        built: the index is -1 where the shifted date is not a cycle point of the target, e.g. before its start.
+        """
+        target = self if target is None else target
+        key = (str(lag), target)
+        if (indices := self._lag_tables.get(key)) is None:
+            lagged = np.array([date + lag for date in self.chunk_start_dates], dtype="datetime64[us]")
+            indices = np.searchsorted(target.chunk_start_dates64, lagged)
+            found = indices < len(target)
+            found[found] = target.chunk_start_dates64[indices[found]] == lagged[found]
+            indices = np.where(found, indices, -1)
+            indices.flags.writeable = False
+            self._lag_tables[key] = indices
+        return indices
+
+    @cached_property
+    def chunk_start_dates64(self) -> np.ndarray:
+        return np.array(self.chunk_start_dates, dtype="datetime64[us]")
+
+    def activity_mask(self, when: When) -> np.ndarray:
+        """Read-only boolean array telling if when is active at each cycle point, computed once per condition"""
+        if (mask := self._activity_masks.get(when)) is None:
+            mask = when.activity_mask(self.chunk_start_dates64)
+            mask.flags.writeable = False
+            self._activity_masks[when] = mask
+        return mask
+
+    def index_range(
+        self, start: datetime | None = None, stop: datetime | None = None, *, include_stop: bool = False
+    ) -> range:
+        """Indices of the cycle points starting in [start, stop), or in [start, stop] with include_stop"""
+        first = 0 if start is None else bisect_left(self.chunk_start_dates, start)
+        if stop is None:
+            last = len(self)
+        else:
+            last = (bisect_right if include_stop else bisect_left)(self.chunk_start_dates, stop)
+        return range(first, max(first, last))
+
+
+# Timelines are cached by value rather than on the DateCycling instances themselves,
+# so that they stay valid when the cycling dates are modified and don't affect model equality.
+# A workflow only has a few distinct cyclings, the least recently used timelines are dropped beyond that.
+_TIMELINE_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=_TIMELINE_CACHE_SIZE)
+def _timeline(start_date: datetime, stop_date: datetime, period: Duration) -> CycleTimeline:
+    return CycleTimeline.from_dates(start_date, stop_date, period)
+
+
 class Cycling(ABC):
     @abstractmethod
     def iter_cycle_points(self) -> Iterator[CyclePoint]:
@@ -50,6 +185,12 @@ class OneOff(Cycling):
     def iter_cycle_points(self) -> Iterator[OneOffPoint]:
         yield OneOffPoint()
 
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
 
 class DateCycling(BaseModel, Cycling):
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -70,7 +211,20 @@ class DateCycling(BaseModel, Cycling):
             raise ValueError(msg)
         return self
 
-    def iter_cycle_points(self) -> Iterator[DateCyclePoint]:
+    @property
+    def timeline(self) -> CycleTimeline:
+        return _timeline(self.start_date, self.stop_date, self.period)
+
+    def iter_cycle_points(
+        self, start: datetime | None = None, stop: datetime | None = None
+    ) -> Iterator[DateCyclePoint]:
+        """Iterate over the cycle points, restricted to the ones starting in [start, stop) if given"""
+        timeline = self.timeline
+        for index in timeline.index_range(start, stop):
+            yield timeline.cycle_point(index)
+
+    def stream_cycle_points(self) -> Iterator[DateCyclePoint]:
+        """Iterate over the cycle points without building the timeline, keeping memory flat for long cyclings"""
         begin = self.start_date
         while begin < self.stop_date:
             end = min(begin + self.period, self.stop_date)
@@ -12,7 +12,11 @@ class TargetCycle:
 
 
 class NoTargetCycle(TargetCycle):
-    pass
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
 
 
 class DateList(BaseModel, TargetCycle):
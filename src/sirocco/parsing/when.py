@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left
 from datetime import datetime
 from typing import Annotated
 
-from pydantic import BaseModel, BeforeValidator
+import numpy as np
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict
 
-from sirocco.parsing._utils import convert_to_date, convert_to_date_or_none
+from sirocco.parsing._utils import convert_to_date_list, convert_to_date_or_none
+
+
+def sorted_unique(dates: tuple[datetime, ...]) -> tuple[datetime, ...]:
+    return tuple(sorted(set(dates)))
 
 
 class When(ABC):
@@ -12,23 +18,51 @@ class When(ABC):
     def is_active(self, date: datetime | None) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def activity_mask(self, dates: np.ndarray) -> np.ndarray:
+        """Boolean array telling if the condition is active at each of the datetime64 dates"""
+        raise NotImplementedError
+
 
 class AnyWhen(When):
     def is_active(self, date: datetime | None) -> bool:  # noqa: ARG002  # dummy argument needed
         return True
 
+    def activity_mask(self, dates: np.ndarray) -> np.ndarray:
+        return np.ones(dates.shape, dtype=bool)
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
 
 class AtDate(When, BaseModel):
-    at: Annotated[datetime, BeforeValidator(convert_to_date)]
+    """Active at one or several dates, kept sorted for membership tests by bisection"""
+
+    model_config = ConfigDict(frozen=True)
+
+    at: Annotated[tuple[datetime, ...], BeforeValidator(convert_to_date_list), AfterValidator(sorted_unique)]
 
     def is_active(self, date: datetime | None) -> bool:
         if date is None:
             msg = "Cannot use a when.at specification in a one-off cycle"
             raise ValueError(msg)
-        return date == self.at
+        index = bisect_left(self.at, date)
+        return index < len(self.at) and self.at[index] == date
+
+    def activity_mask(self, dates: np.ndarray) -> np.ndarray:
+        if not self.at:
+            return np.zeros(dates.shape, dtype=bool)
+        at = np.array(self.at, dtype="datetime64[us]")
+        indices = np.searchsorted(at, dates)
+        return at[np.minimum(indices, len(at) - 1)] == dates
 
 
 class BeforeAfterDate(When, BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     before: Annotated[datetime | None, BeforeValidator(convert_to_date_or_none)] = None
     after: Annotated[datetime | None, BeforeValidator(convert_to_date_or_none)] = None
 
@@ -37,3 +71,11 @@ class BeforeAfterDate(When, BaseModel):
             msg = "Cannot use a when.before or when.after specification in a one-off cycle"
             raise ValueError(msg)
         return (self.before is None or date < self.before) and (self.after is None or date > self.after)
+
+    def activity_mask(self, dates: np.ndarray) -> np.ndarray:
+        mask = np.ones(dates.shape, dtype=bool)
+        if self.before is not None:
+            mask &= dates < np.datetime64(self.before, "us")
+        if self.after is not None:
+            mask &= dates > np.datetime64(self.after, "us")
+        return mask
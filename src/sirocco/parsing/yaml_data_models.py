@@ -27,6 +27,9 @@ from sirocco.parsing.cycling import Cycling, DateCycling, OneOff
 from sirocco.parsing.target_cycle import DateList, LagList, NoTargetCycle, TargetCycle
 from sirocco.parsing.when import AnyWhen, AtDate, BeforeAfterDate, When
 
+if typing.TYPE_CHECKING:
+    from datetime import datetime
+
 ITEM_T = typing.TypeVar("ITEM_T")
 
 
@@ -732,6 +735,59 @@ class ConfigWorkflow(BaseModel):
                     raise ValueError(msg)
         return self
 
+    def extension_start_date(self, previous: ConfigWorkflow) -> datetime:
+        """Date from which this workflow extends a previous version of it.
+
+        The only accepted difference between both versions is the stop date of the date cycles, which must
+        have been moved forward from a common previous stop date lying on a chunk boundary of every cycle.
+
+        Args:
+            previous (ConfigWorkflow): The previous version of the workflow.
+
+        Returns:
+            datetime: The previous stop date, from which new cycle points start.
+
+        Raises:
+            ValueError: If this workflow is not an extension of the previous one.
+        """
+        if (self.name, self.tasks, self.data, self.parameters) != (
+            previous.name,
+            previous.tasks,
+            previous.data,
+            previous.parameters,
+        ):
+            msg = f"Workflow {self.name} can only extend a previous version with the same tasks, data and parameters."
+            raise ValueError(msg)
+        if [cycle.name for cycle in self.cycles] != [cycle.name for cycle in previous.cycles]:
+            msg = f"Workflow {self.name} can only extend a previous version with the same cycles."
+            raise ValueError(msg)
+        previous_stop_dates = {
+            cycle.cycling.stop_date for cycle in previous.cycles if isinstance(cycle.cycling, DateCycling)
+        }
+        if len(previous_stop_dates) != 1:
+            msg = f"Workflow {self.name} can only extend a previous version whose date cycles share their stop date."
+            raise ValueError(msg)
+        (start_date,) = previous_stop_dates
+        for cycle, previous_cycle in zip(self.cycles, previous.cycles, strict=True):
+            if isinstance(cycle.cycling, DateCycling) and isinstance(previous_cycle.cycling, DateCycling):
+                stop_date = cycle.cycling.stop_date
+                moved_previous_cycle = previous_cycle.model_copy(
+                    update={"cycling": previous_cycle.cycling.model_copy(update={"stop_date": stop_date})}
+                )
+                if moved_previous_cycle != cycle:
+                    msg = f"Cycle {cycle.name}: only the stop date can differ from the previous version."
+                    raise ValueError(msg)
+                if stop_date < start_date:
+                    msg = f"Cycle {cycle.name}: stop date {stop_date} lies before previous stop date {start_date}."
+                    raise ValueError(msg)
+                if stop_date != start_date and cycle.cycling.timeline.index(start_date) is None:
+                    msg = f"Cycle {cycle.name}: previous stop date {start_date} does not lie on a chunk boundary."
+                    raise ValueError(msg)
+            elif cycle != previous_cycle:
+                msg = f"Cycle {cycle.name}: only the stop date can differ from the previous version."
+                raise ValueError(msg)
+        return start_date
+
     @classmethod
     def from_config_file(cls, config_path: str) -> Self:
         """Creates a ConfigWorkflow instance from a config file, a yaml with the workflow definition.
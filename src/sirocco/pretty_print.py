@@ -1,7 +1,8 @@
 import dataclasses
 import functools
 import textwrap
-from typing import Any
+from collections.abc import Iterable, Iterator
+from typing import Any, TextIO
 
 from termcolor import colored
 
@@ -100,11 +101,11 @@ class PrettyPrinter:
         ...                 chunk_stop_date=datetime(1000, 1, 2),
         ...                 period="P1D",
         ...             ),
-        ...             coordinates={"date": datetime(1000, 1, 1).date()},
+        ...             coordinates={"date": datetime(1000, 1, 1)},
         ...         )
         ...     )
         ... )
-        foo [date: 1000-01-01]
+        foo [date: 1000-01-01 00:00:00]
         """
         name = obj.name
         if obj.coordinates:
@@ -117,40 +118,97 @@ class PrettyPrinter:
             coords = colored(coords, obj.color) if coords else None
         return f"{name} {coords}" if coords else name
 
-    @format.register
-    def format_workflow(self, obj: core.Workflow) -> str:
-        cycles = "\n".join(self.format(cycle) for cycle in obj.cycles)
-        return self.as_block("cycles", cycles)
+    def iter_block(self, header: str, body: Iterable[str]) -> Iterator[str]:
+        """
+        Lines of `as_block`, from the lines of the block body.
 
-    @format.register
-    def format_cycle(self, obj: core.Cycle) -> str:
-        tasks = self.as_block("tasks", "\n".join(self.format(task) for task in obj.tasks))
-        return self.as_item(self.as_block(self.format_basic(obj), tasks))
+        Lines are streamed, the text of a body being represented by `body.split("\\n")`.
 
-    @format.register
-    def format_task(self, obj: core.Task) -> str:
-        sections = []
+        Example:
+
+        >>> list(PrettyPrinter().iter_block("header", ["foo", "", "bar"]))
+        ['header:', '  foo', '', '  bar']
+        """
+        prefix = " " * self.indentation
+        yield f"{header}:"
+        for line in body:
+            yield prefix + line if line.strip() else line
+
+    def iter_item(self, content: Iterable[str]) -> Iterator[str]:
+        """
+        Lines of `as_item`, from the lines of the item content.
+
+        As in `as_item`, the trailing newline of multi line content is dropped.
+
+        Example:
+
+        >>> list(PrettyPrinter().iter_item(["header:", "  multiple", "  lines", ""]))
+        ['- header:', '    multiple', '    lines']
+        """
+        lines = iter(content)
+        if (first := next(lines, None)) is None:
+            yield "- "
+            return
+        yield f"- {first}"
+        if (second := next(lines, None)) is None:
+            return
+        if (third := next(lines, None)) is None:
+            # single line content is kept as is, with its trailing newline if any
+            yield self._indent_item_line(second)
+            return
+        yield self._indent_item_line(second)
+        # look one line ahead to drop a last empty line
+        previous = third
+        for line in lines:
+            yield self._indent_item_line(previous)
+            previous = line
+        if previous:
+            yield self._indent_item_line(previous)
+
+    @staticmethod
+    def _indent_item_line(line: str) -> str:
+        return f"  {line}" if line.strip() else line
+
+    @staticmethod
+    def iter_joined(texts: Iterable[Iterable[str]]) -> Iterator[str]:
+        """Lines of the texts joined by newlines"""
+        empty = True
+        for text in texts:
+            empty = False
+            yield from text
+        if empty:
+            yield ""
+
+    @functools.singledispatchmethod
+    def iter_lines(self, obj: Any) -> Iterator[str]:
+        """
+        Lines of the formatted obj, generated while walking the graph.
+
+        Joined by newlines, they give `format(obj)`. The default implementation splits the output of `format`.
+        """
+        yield from self.format(obj).split("\n")
+
+    @iter_lines.register
+    def _iter_workflow_lines(self, obj: core.Workflow) -> Iterator[str]:
+        yield from self.iter_block("cycles", self.iter_joined(self.iter_lines(cycle) for cycle in obj.cycles))
+
+    @iter_lines.register
+    def _iter_cycle_lines(self, obj: core.Cycle) -> Iterator[str]:
+        tasks = self.iter_block("tasks", self.iter_joined(self.iter_lines(task) for task in obj.tasks))
+        yield from self.iter_item(self.iter_block(self.format_basic(obj), tasks))
+
+    @iter_lines.register
+    def _iter_task_lines(self, obj: core.Task) -> Iterator[str]:
+        yield from self.iter_item(self.iter_block(self.format_basic(obj), self._iter_task_sections(obj)))
+
+    def _iter_task_sections(self, obj: core.Task) -> Iterator[str]:
+        sections: list[Iterable[str]] = []
         if obj.inputs:
-            sections.append(
-                self.as_block(
-                    "input",
-                    "\n".join(self.as_item(self.format_basic(inp)) for inp in obj.input_data_nodes()),
-                )
-            )
+            sections.append(self._iter_node_list("input", obj.input_data_nodes()))
         if obj.outputs:
-            sections.append(
-                self.as_block(
-                    "output",
-                    "\n".join(self.as_item(self.format_basic(output)) for output in obj.output_data_nodes()),
-                )
-            )
+            sections.append(self._iter_node_list("output", obj.output_data_nodes()))
         if obj.wait_on:
-            sections.append(
-                self.as_block(
-                    "wait on",
-                    "\n".join(self.as_item(self.format_basic(waiton)) for waiton in obj.wait_on),
-                )
-            )
+            sections.append(self._iter_node_list("wait on", obj.wait_on))
 
         # Handling remaining member variables
         repr_attrs = [field_name for field_name, field in obj.__dataclass_fields__.items() if field.repr]
@@ -166,11 +224,33 @@ class PrettyPrinter:
                 continue
             formatted_attr = self.format(attr)
             formatted_attr_name = attr_name.replace("_", " ")
-            sections.append(f"{formatted_attr_name}: {formatted_attr}")
-
-        return self.as_item(
-            self.as_block(
-                self.format_basic(obj),
-                "\n".join(sections),
-            )
-        )
+            sections.append(f"{formatted_attr_name}: {formatted_attr}".split("\n"))
+
+        yield from self.iter_joined(sections)
+
+    def _iter_node_list(self, header: str, nodes: Iterable[core.GraphItem]) -> Iterator[str]:
+        return self.iter_block(header, self.iter_joined([f"- {self.format_basic(node)}"] for node in nodes))
+
+    def write(self, obj: Any, sink: TextIO) -> None:
+        """
+        Write `format(obj)` to a file-like sink, line by line.
+
+        The formatted text is never held in memory as a whole, which keeps the memory
+        usage independent of the size of the workflow.
+        """
+        for index, line in enumerate(self.iter_lines(obj)):
+            if index:
+                sink.write("\n")
+            sink.write(line)
+
+    @format.register
+    def format_workflow(self, obj: core.Workflow) -> str:
+        return "\n".join(self.iter_lines(obj))
+
+    @format.register
+    def format_cycle(self, obj: core.Cycle) -> str:
+        return "\n".join(self.iter_lines(obj))
+
+    @format.register
+    def format_task(self, obj: core.Task) -> str:
+        return "\n".join(self.iter_lines(obj))
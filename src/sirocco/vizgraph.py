@@ -1,16 +1,29 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import shutil
+import subprocess
+from collections import Counter
 from colorsys import hsv_to_rgb
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 from itertools import chain
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
+from xml.sax.saxutils import escape
 
-from lxml import etree
 from pygraphviz import AGraph
 
-if TYPE_CHECKING:
-    from sirocco.core.graph_items import Store
 from sirocco import core
+from sirocco.core.coordinates import DATE_DIM
+from sirocco.core.fingerprint import node_key
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import datetime
+
+    from sirocco.core.graph_items import GraphItem, Store
 
 
 def hsv_to_hex(h: float, s: float, v: float) -> str:
@@ -25,6 +38,106 @@ def node_colors(h: float) -> dict[str, str]:
     return {"fillcolor": fill, "color": border, "fontcolor": font}
 
 
+@cache
+def graphviz_version() -> str:
+    """Version reported by the graphviz `dot` executable"""
+    if (dot := shutil.which("dot")) is None:
+        return "unknown"
+    result = subprocess.run([dot, "-V"], capture_output=True, text=True, check=False)
+    return (result.stderr or result.stdout).strip()
+
+
+@cache
+def interactivity_payload() -> tuple[bytes, bytes]:
+    """Style and script elements making svg graphs interactive, read once per process"""
+    this_dir = Path(__file__).parent
+    style = escape((this_dir / "svg-interactive-style.css").read_text())
+    # a CDATA section can't contain its own end marker, split it across two sections
+    script = (this_dir / "svg-interactive-script.js").read_text().replace("]]>", "]]]]><![CDATA[>")
+    return f"<style>{style}</style>".encode(), f"<script><![CDATA[{script}]]></script>".encode()
+
+
+def _layout_group(source: str) -> tuple[str, dict[str, str], dict[str, dict[str, str]], dict[str, str]]:
+    """
+    Lay out a graph given as dot source with dot
+
+    Returns the bounding box, the node positions, the positions of the edges by id and of their labels
+    and the bounding box and label position of the cluster, if any.
+    """
+    agraph = AGraph(string=source)
+    agraph.layout(prog="dot")
+    node_pos = {str(node): node.attr["pos"] for node in agraph.nodes()}
+    edge_pos = {
+        edge.attr["id"]: {key: edge.attr[key] for key in ("pos", "lp") if edge.attr.get(key)} for edge in agraph.edges()
+    }
+    cluster_attr = {}
+    for cluster in agraph.subgraphs():
+        cluster_attr = {key: cluster.graph_attr[key] for key in ("bb", "lp") if cluster.graph_attr.get(key)}
+    return agraph.graph_attr["bb"], node_pos, edge_pos, cluster_attr
+
+
+def _parse_bb(bb: str) -> tuple[float, float, float, float]:
+    llx, lly, urx, ury = (float(value) for value in bb.split(","))
+    return llx, lly, urx, ury
+
+
+def _translate(pos: str, dx: float, dy: float) -> str:
+    """
+    Translate a graphviz position, bounding box or spline
+
+    Examples:
+
+    >>> _translate("e,1,2 3,4!", 10, 100)
+    'e,11,102 13,104!'
+    >>> _translate("0,0,10,20", 1, 2)
+    '1,2,11,22'
+    """
+
+    def shift(values: list[str]) -> list[str]:
+        # fixed point, graphviz does not read exponents
+        shifted = (float(value) + (dy if i % 2 else dx) for i, value in enumerate(values))
+        return [f"{value:.2f}".rstrip("0").rstrip(".") for value in shifted]
+
+    points = []
+    for point in pos.split():
+        pinned = point.endswith("!")
+        values = point.rstrip("!").split(",")
+        prefix = [values.pop(0)] if values[0] in ("e", "s") else []
+        points.append(",".join(prefix + shift(values)) + ("!" if pinned else ""))
+    return " ".join(points)
+
+
+def format_lag(date: datetime, ref_date: datetime) -> str | None:
+    """
+    ISO 8601 duration from ref_date to date, None if they are equal
+
+    Examples:
+
+    >>> from datetime import datetime
+    >>> format_lag(datetime(2026, 1, 1), datetime(2026, 3, 1))
+    '-P2M'
+    >>> format_lag(datetime(2027, 1, 1), datetime(2026, 1, 1))
+    'P1Y'
+    >>> format_lag(datetime(2026, 1, 2, 6), datetime(2026, 1, 1))
+    'P1DT6H'
+    >>> format_lag(datetime(2026, 1, 1), datetime(2026, 1, 1)) is None
+    True
+    """
+    if date == ref_date:
+        return None
+    sign = "-" if date < ref_date else ""
+    start, end = sorted((date, ref_date))
+    if (start.day, start.time()) == (end.day, end.time()):
+        months = (end.year - start.year) * 12 + end.month - start.month
+        return f"{sign}P{months // 12}Y" if months % 12 == 0 else f"{sign}P{months}M"
+    delta = end - start
+    hours, rest = divmod(delta.seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    days_part = f"{delta.days}D" if delta.days else ""
+    time_part = "".join(f"{value}{unit}" for value, unit in ((hours, "H"), (minutes, "M"), (seconds, "S")) if value)
+    return f"{sign}P{days_part}{'T' if time_part else ''}{time_part}"
+
+
 class VizGraph:
     """Class for visualizing a Sirocco workflow"""
 
@@ -38,13 +151,29 @@ class VizGraph:
     io_edge_kw: ClassVar[dict[str, Any]] = edge_base_kw
     wait_on_edge_kw: ClassVar[dict[str, Any]] = edge_base_kw | {"style": "dashed"}
     cluster_kw: ClassVar[dict[str, Any]] = {"bgcolor": "#F6F5F4", "color": None, "fontsize": 16}
+    # boundary of a subgraph: tasks outside of it and their edges
+    stub_node_kw: ClassVar[dict[str, Any]] = node_base_kw | {
+        "shape": "box",
+        "style": "dashed",
+        "color": "#77767B",
+        "fontcolor": "#77767B",
+    }
+    stub_edge_kw: ClassVar[dict[str, Any]] = edge_base_kw | {"style": "dotted"}
+    # space between clusters laid out in parallel, in points
+    group_gap: ClassVar[float] = 36
 
-    def __init__(self, name: str, cycles: Store, data: Store) -> None:
-        self.name = name
-        self.agraph = AGraph(name=name, fontname="Fira Sans", newrank=True)
+    def __init__(
+        self,
+        name: str,
+        cycles: Store,
+        data: Store,
+        outside_consumers: Callable[[core.Data], Iterable[str]] | None = None,
+    ) -> None:
+        self._init_graph(name)
         for data_node in data:
             gv_kw = self.data_av_node_kw if isinstance(data_node, core.AvailableData) else self.data_gen_node_kw
             self.agraph.add_node(data_node, tooltip=self.tooltip(data_node), label=data_node.name, **gv_kw)
+            self.add_boundary_stubs(data_node, outside_consumers)
 
         k = 1
         for cycle in cycles:
@@ -71,47 +200,384 @@ class VizGraph:
                 tooltip=self.tooltip(cycle),
                 **self.cluster_kw,
             )
+            self._clusters.append((f"cluster_{cycle.name}_{k}", cycle.name, cycle.coordinates.get(DATE_DIM)))
             k += 1
 
+    def _init_graph(self, name: str, **graph_kw: Any) -> None:
+        """Empty graph and state shared by all the views"""
+        self.name = name
+        self.agraph = AGraph(name=name, fontname="Fira Sans", newrank=True, **graph_kw)
+        # structural hash of the workflow the graph is built from, see cache_key
+        self.source_hash: str | None = None
+        self._stub_keys: list[str] = []
+        # cluster name, cycle name and date of the cycle clusters, see layout
+        self._clusters: list[tuple[str, str, datetime | None]] = []
+
+    def graph_node(self, node: GraphItem) -> Any:
+        """Node of the graph standing for an unrolled node"""
+        return node
+
+    def graph_node_key(self, node: GraphItem) -> str:
+        """Identifier of the graph node standing for an unrolled node, reproducible across runs"""
+        return node_key(node)
+
+    def add_boundary_stubs(
+        self, data_node: core.Data, outside_consumers: Callable[[core.Data], Iterable[str]] | None
+    ) -> None:
+        """Stubs for the edges of data_node leaving the subgraph, if any"""
+        if isinstance(data_node, core.ExistingData):
+            self.add_stub(data_node.producer, data_node, incoming=True)
+        for consumer in () if outside_consumers is None else outside_consumers(data_node):
+            self.add_stub(consumer, data_node, incoming=False)
+
+    def add_stub(self, task_name: str, data_node: core.Data, *, incoming: bool) -> None:
+        """Node for a task outside of the subgraph, producing or consuming data_node, added once per graph node"""
+        data_graph_node = self.graph_node(data_node)
+        stub = f"{'producer' if incoming else 'consumer'} {task_name} of {data_graph_node}"
+        if self.agraph.has_node(stub):
+            return
+        tooltip = f"{task_name}\n  {'produces' if incoming else 'consumes'} {data_node.name} outside of the subgraph"
+        self.agraph.add_node(stub, label=task_name, tooltip=tooltip, **self.stub_node_kw)
+        self._stub_keys.append(f"{incoming} {task_name} {self.graph_node_key(data_node)}")
+        if incoming:
+            self.agraph.add_edge(stub, data_graph_node, **self.stub_edge_kw)
+        else:
+            self.agraph.add_edge(data_graph_node, stub, **self.stub_edge_kw)
+
     @staticmethod
     def tooltip(node) -> str:
         return "\n".join(chain([node.name], (f"  {k}: {v}" for k, v in node.coordinates.items())))
 
-    def draw(self, file_path: Path | None = None, **kwargs):
-        # draw graphviz dot graph to svg file
-        self.agraph.layout(prog="dot")
-        if file_path is None:
-            file_path = Path(f"./{self.name}.svg")
+    def cache_options(self) -> list[str]:
+        """Options of the view, besides the workflow and the styles, which change the rendered graph"""
+        return self._stub_keys
+
+    def cache_key(self, **kwargs) -> str | None:
+        """
+        Key of the rendered SVG in a cache, None if the graph was not built from a workflow
+
+        It covers the structural hash of the workflow, its name which titles the SVG, the options of the view,
+        the styles, the interactivity payload, the graphviz version and the drawing arguments.
+        """
+        if self.source_hash is None:
+            return None
+        styles = {name: getattr(self, name) for name in dir(type(self)) if name.endswith("_kw")}
+        digest = hashlib.sha256()
+        for part in (
+            self.source_hash,
+            self.name,
+            type(self).__name__,
+            *self.cache_options(),
+            repr(sorted(styles.items())),
+            *(payload.decode() for payload in interactivity_payload()),
+            graphviz_version(),
+            repr(sorted(kwargs.items())),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def layout(self, processes: int | None = None) -> None:
+        """
+        Lay out the graph with dot, or each cycle cluster independently on a pool of processes
+
+        In the parallel mode, the cluster layouts are placed along the time axis, one column per date and one
+        lane per cycle, with the nodes outside of clusters in front. Node positions and the edges within the
+        clusters are kept, the edges between clusters are then routed by the `nop2` engine, which leaves the
+        given positions untouched.
+        """
+        if processes is None or processes <= 1 or not self._clusters:
+            self.agraph.layout(prog="dot")
+            return
+
+        groups: list[tuple[str | None, datetime | None, Any, list[str]]] = []
+        for cluster_name, cycle_name, date in self._clusters:
+            cluster = self.agraph.get_subgraph(cluster_name)
+            groups.append((cycle_name, date, cluster, cluster.nodes()))
+        clustered = {node for _, _, _, nodes in groups for node in nodes}
+        if outside := [node for node in self.agraph.nodes() if node not in clustered]:
+            groups.insert(0, (None, None, None, outside))
+
+        # graph of each group with its inner edges, identified by their index
+        edges = self.agraph.edges()
+        group_of = {node: index for index, (_, _, _, nodes) in enumerate(groups) for node in nodes}
+        inner_edges: list[list[int]] = [[] for _ in groups]
+        for edge_index, (source, target) in enumerate(edges):
+            if group_of[source] == group_of[target]:
+                inner_edges[group_of[source]].append(edge_index)
+        sources = []
+        for (_, _, cluster, nodes), edge_indices in zip(groups, inner_edges, strict=True):
+            group_graph = AGraph(directed=self.agraph.directed, strict=self.agraph.strict, **self.agraph.graph_attr)
+            container = (
+                group_graph if cluster is None else group_graph.add_subgraph(name=cluster.name, **cluster.graph_attr)
+            )
+            for node in nodes:
+                container.add_node(node, **self.agraph.get_node(node).attr)
+            for edge_index in edge_indices:
+                group_graph.add_edge(*edges[edge_index], id=str(edge_index), **edges[edge_index].attr)
+            sources.append(group_graph.string())
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            layouts = list(executor.map(_layout_group, sources))
+
+        # columns of dates and lanes of cycles, one-off cycles go before or after the dates
+        dates = sorted({date for _, date, _, _ in groups if date is not None})
+        date_slots = {date: slot for slot, date in enumerate(dates, start=1)}
+        lanes: dict[str | None, int] = {}
+        slots, group_lanes = [], []
+        after_dates = False
+        for group_cycle, group_date, _, _ in groups:
+            group_lanes.append(lanes.setdefault(group_cycle, len(lanes)))
+            after_dates = after_dates or group_date is not None
+            slots.append(date_slots[group_date] if group_date is not None else len(dates) + 1 if after_dates else 0)
+        boxes = [_parse_bb(bb) for bb, _, _, _ in layouts]
+        slot_widths = [0.0] * (len(dates) + 2)
+        lane_heights = [0.0] * len(lanes)
+        for (llx, lly, urx, ury), slot, lane in zip(boxes, slots, group_lanes, strict=True):
+            slot_widths[slot] = max(slot_widths[slot], urx - llx)
+            lane_heights[lane] = max(lane_heights[lane], ury - lly)
+        slot_x = [
+            sum(width + self.group_gap for width in slot_widths[:slot] if width) for slot in range(len(slot_widths))
+        ]
+        lane_top = [-sum(height + self.group_gap for height in lane_heights[:lane]) for lane in range(len(lanes))]
+
+        for (_, _, cluster, nodes), (llx, _, _, ury), slot, lane, (_, node_pos, edge_pos, cluster_attr) in zip(
+            groups, boxes, slots, group_lanes, layouts, strict=True
+        ):
+            dx, dy = slot_x[slot] - llx, lane_top[lane] - ury
+            for node in nodes:
+                self.agraph.get_node(node).attr["pos"] = _translate(node_pos[node], dx, dy)
+            for edge_id, attr in edge_pos.items():
+                edge = edges[int(edge_id)]
+                for key, value in attr.items():
+                    edge.attr[key] = _translate(value, dx, dy)
+            if cluster is not None:
+                for key, value in cluster_attr.items():
+                    cluster.graph_attr[key] = _translate(value, dx, dy)
+        # AGraph.layout ignores command line arguments, nop2 is the engine behind `neato -n2`
+        self.agraph.layout(prog="nop2")
+
+    def render(self, processes: int | None = None, **kwargs) -> bytes:
+        """Lay out the graph and render it to an interactive svg document in memory"""
+        return b"".join(self._svg_parts(processes, **kwargs))
 
-        self.agraph.draw(path=file_path, format="svg", **kwargs)
+    def _svg_parts(self, processes: int | None = None, **kwargs) -> list[bytes | memoryview]:
+        """Parts of the interactive svg document, sliced from the rendered svg without copying it"""
+        self.layout(processes)
+        svg_bytes = self.agraph.draw(format="svg", **kwargs)
 
         # Add interactive capabilities to the svg graph thanks to
         # https://github.com/BartBrood/dynamic-SVG-from-Graphviz
+        # The root element gets an 'onload' attribute, the css style and the scripts are appended to it.
+        root_start = svg_bytes.index(b"<svg") + len(b"<svg")
+        root_end = svg_bytes.rindex(b"</svg>")
+        style, script = interactivity_payload()
+        svg = memoryview(svg_bytes)
+        return [
+            svg[:root_start],
+            b' onload="addInteractivity(evt)"',
+            svg[root_start:root_end],
+            style,
+            script,
+            svg[root_end:],
+        ]
 
-        # Parse svg
-        svg = etree.parse(file_path)  # noqa: S320 this svg is safe as generated internaly
-        svg_root = svg.getroot()
-        # Add 'onload' tag
-        svg_root.set("onload", "addInteractivity(evt)")
-        # Add css style for interactivity
-        this_dir = Path(__file__).parent
-        style_file_path = this_dir / "svg-interactive-style.css"
-        node = etree.Element("style")
-        node.text = style_file_path.read_text()
-        svg_root.append(node)
-        # Add scripts
-        js_file_path = this_dir / "svg-interactive-script.js"
-        node = etree.Element("script")
-        node.text = etree.CDATA(js_file_path.read_text())
-        svg_root.append(node)
-
-        # write svg again
-        svg.write(file_path)
+    def draw(
+        self,
+        file_path: Path | None = None,
+        cache_dir: Path | None = None,
+        processes: int | None = None,
+        **kwargs,
+    ) -> bool:
+        """
+        Draw the graph to an interactive svg file
+
+        With a cache_dir, rendered files are stored under their cache_key and reused as long as neither the
+        workflow, nor the view, nor the rendering changes. Returns whether the file was taken from the cache.
+        With processes > 1, the cycle clusters are laid out in parallel, see layout.
+        """
+        file_path = Path(f"./{self.name}.svg") if file_path is None else Path(file_path)
+        cached_path = None
+        parallel = processes is not None and processes > 1
+        if cache_dir is not None and (key := self.cache_key(parallel_layout=parallel, **kwargs)) is not None:
+            cached_path = Path(cache_dir) / f"{key}.svg"
+            if cached_path.exists():
+                shutil.copyfile(cached_path, file_path)
+                return True
+
+        with file_path.open("wb") as svg_file:
+            svg_file.writelines(self._svg_parts(processes, **kwargs))
+
+        if cached_path is not None:
+            # copy to a temporary file first, cache directories may be shared between processes
+            cached_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cached_path.with_suffix(f".{os.getpid()}.tmp")
+            shutil.copyfile(file_path, tmp_path)
+            tmp_path.replace(cached_path)
+        return False
 
     @classmethod
     def from_core_workflow(cls, workflow: core.Workflow):
-        return cls(workflow.name, workflow.cycles, workflow.data)
+        viz_graph = cls(workflow.name, workflow.cycles, workflow.data, outside_consumers=workflow.outside_consumers)
+        viz_graph.source_hash = workflow.structural_hash
+        return viz_graph
 
     @classmethod
     def from_config_file(cls, config_path: str):
         return cls.from_core_workflow(core.Workflow.from_config_file(config_path))
+
+
+class CollapsedVizGraph(VizGraph):
+    """
+    Aggregated view of a Sirocco workflow, whose size depends on the configuration rather than on the unrolling
+
+    The cycle points of each cycle are collapsed into one representative cycle. Nodes gather all the unrolled
+    tasks or data sharing the same name and parameter values, along with the values of `collapsed_parameters`,
+    and are annotated with their number of instances. Edges between dates are labeled with their lag, e.g.
+    "-P2M" for an input produced two months before the task consuming it, and don't constrain the layout.
+    The boundary of a subgraph is shown with one stub per outside task and group.
+    """
+
+    lag_edge_kw: ClassVar[dict[str, Any]] = {"constraint": False, "fontname": "Fira Sans", "fontsize": 12}
+
+    def __init__(
+        self,
+        name: str,
+        cycles: Store,
+        data: Store,
+        collapsed_parameters: Iterable[str] = (),
+        outside_consumers: Callable[[core.Data], Iterable[str]] | None = None,
+    ) -> None:
+        # no cycle clusters to lay out in parallel, the graph is small enough for dot in any case
+        self._init_graph(name, strict=False)
+        self.collapsed_parameters = frozenset(collapsed_parameters)
+
+        # gather the groups in a single pass, only the groups are added to the graph
+        representatives: dict[str, GraphItem] = {}
+        counts: Counter[str] = Counter()
+        dates: dict[str, list[datetime]] = {}
+        cycle_counts: Counter[str] = Counter()
+        cycle_nodes: dict[str, dict[str, None]] = {}
+        edges: dict[tuple[str, str, str | None, bool], None] = {}
+
+        def extend_range(key: str, item: GraphItem) -> None:
+            if (date := item.coordinates.get(DATE_DIM)) is not None:
+                date_range = dates.setdefault(key, [date, date])
+                date_range[0], date_range[1] = min(date_range[0], date), max(date_range[1], date)
+
+        def add(node: GraphItem) -> str:
+            key = self.group_key(node)
+            representatives.setdefault(key, node)
+            counts[key] += 1
+            extend_range(key, node)
+            return key
+
+        for data_node in data:
+            add(data_node)
+        for cycle in cycles:
+            cycle_counts[cycle.name] += 1
+            extend_range(cycle.name, cycle)
+            members = cycle_nodes.setdefault(cycle.name, {})
+            for task_node in cycle.tasks:
+                task_key = add(task_node)
+                members[task_key] = None
+                for data_node in task_node.input_data_nodes():
+                    edges[self.group_key(data_node), task_key, self.lag(data_node, task_node), False] = None
+                for data_node in task_node.output_data_nodes():
+                    data_key = self.group_key(data_node)
+                    edges[task_key, data_key, None, False] = None
+                    members[data_key] = None
+                for wait_task_node in task_node.wait_on:
+                    edges[self.group_key(wait_task_node), task_key, self.lag(wait_task_node, task_node), True] = None
+
+        for key, node in representatives.items():
+            if isinstance(node, core.Task):
+                gv_kw = self.task_node_kw
+            else:
+                gv_kw = self.data_av_node_kw if isinstance(node, core.AvailableData) else self.data_gen_node_kw
+            label = self.group_label(node)
+            if counts[key] > 1:
+                label += f"\nx{counts[key]}"
+            tooltip = self.group_tooltip(node, counts[key], dates.get(key))
+            self.agraph.add_node(key, label=label, tooltip=tooltip, **gv_kw)
+        for data_node in data:
+            self.add_boundary_stubs(data_node, outside_consumers)
+
+        for source, target, lag, wait_on in edges:
+            if source not in representatives or target not in representatives:
+                # awaited tasks pruned out of a partial workflow
+                continue
+            gv_kw = self.wait_on_edge_kw if wait_on else self.io_edge_kw
+            if lag is not None:
+                gv_kw = gv_kw | self.lag_edge_kw | {"label": lag}
+            self.agraph.add_edge(source, target, **gv_kw)
+
+        for k, (cycle_name, members) in enumerate(cycle_nodes.items(), start=1):
+            label = f"{cycle_name} x{cycle_counts[cycle_name]}"
+            tooltip = "\n".join(
+                [cycle_name, f"  cycle points: {cycle_counts[cycle_name]}", *self.range_lines(dates.get(cycle_name))]
+            )
+            self.agraph.add_subgraph(
+                list(members),
+                name=f"cluster_{cycle_name}_{k}",
+                clusterrank="global",
+                label=label,
+                tooltip=tooltip,
+                **self.cluster_kw,
+            )
+
+    def graph_node(self, node: GraphItem) -> str:
+        return self.group_key(node)
+
+    def graph_node_key(self, node: GraphItem) -> str:
+        return self.group_key(node)
+
+    def group_coordinates(self, node: GraphItem) -> dict[str, Any]:
+        return {
+            dim: value
+            for dim, value in node.coordinates.items()
+            if dim != DATE_DIM and dim not in self.collapsed_parameters
+        }
+
+    def group_key(self, node: GraphItem) -> str:
+        kind = "task" if isinstance(node, core.Task) else "data"
+        return f"{kind}:{node.name}{self.group_coordinates(node)!r}"
+
+    def group_label(self, node: GraphItem) -> str:
+        return "\n".join(chain([node.name], (f"{k}: {v}" for k, v in self.group_coordinates(node).items())))
+
+    def group_tooltip(self, node: GraphItem, count: int, date_range: list[datetime] | None) -> str:
+        lines = [node.name]
+        lines.extend(f"  {k}: {v}" for k, v in self.group_coordinates(node).items())
+        lines.extend(f"  {dim}: collapsed" for dim in node.coordinates.dims if dim in self.collapsed_parameters)
+        lines.append(f"  instances: {count}")
+        lines.extend(self.range_lines(date_range))
+        return "\n".join(lines)
+
+    @staticmethod
+    def range_lines(date_range: list[datetime] | None) -> list[str]:
+        if date_range is None:
+            return []
+        return [f"  from: {date_range[0]}", f"  to: {date_range[1]}"]
+
+    @staticmethod
+    def lag(node: GraphItem, task: core.Task) -> str | None:
+        """Lag of node with respect to the task it is connected to, if both have a date"""
+        date, task_date = node.coordinates.get(DATE_DIM), task.coordinates.get(DATE_DIM)
+        if date is None or task_date is None:
+            return None
+        return format_lag(date, task_date)
+
+    def cache_options(self) -> list[str]:
+        return [*super().cache_options(), *sorted(self.collapsed_parameters)]
+
+    @classmethod
+    def from_core_workflow(cls, workflow: core.Workflow, collapsed_parameters: Iterable[str] = ()):
+        viz_graph = cls(
+            workflow.name,
+            workflow.cycles,
+            workflow.data,
+            collapsed_parameters=collapsed_parameters,
+            outside_consumers=workflow.outside_consumers,
+        )
+        viz_graph.source_hash = workflow.structural_hash
+        return viz_graph
@@ -19,6 +19,8 @@ from sirocco.core.graph_items import GeneratedData
 from sirocco.parsing._utils import TimeUtils
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from aiida_workgraph.socket import TaskSocket  # type: ignore[import-untyped]
     from aiida_workgraph.sockets.builtins import SocketAny
 
@@ -94,6 +96,8 @@ class AiidaWorkGraph:
         for data in self._core_workflow.data:
             if isinstance(data, core.AvailableData):
                 self._add_aiida_input_data_node(data)
+            elif isinstance(data, core.ExistingData):
+                self._add_aiida_existing_data_node(data)
 
         # create workgraph task nodes and output sockets
         for task in self._core_workflow.tasks:
@@ -156,8 +160,13 @@ class AiidaWorkGraph:
         The graph item object is uniquely determined by its name and its coordinates. There is the possibility that
         through the replacement of invalid chars in the coordinates duplication can happen but it is unlikely.
         """
+        return cls.get_aiida_label(obj.name, obj.coordinates)
+
+    @classmethod
+    def get_aiida_label(cls, name: str, coordinates: Mapping[str, Any]) -> str:
+        """Returns the AiiDA label of the graph item with the given name and coordinates."""
         return cls.replace_invalid_chars_in_label(
-            f"{obj.name}" + "__".join(f"_{key}_{value}" for key, value in obj.coordinates.items())
+            f"{name}" + "__".join(f"_{key}_{value}" for key, value in coordinates.items())
         )
 
     @staticmethod
@@ -171,7 +180,7 @@ class AiidaWorkGraph:
     def label_placeholder(cls, data: core.Data) -> str:
         return f"{{{cls.get_aiida_label_from_graph_item(data)}}}"
 
-    def data_from_core(self, core_available_data: core.AvailableData) -> WorkgraphDataNode:
+    def data_from_core(self, core_available_data: core.AvailableData | core.ExistingData) -> WorkgraphDataNode:
         return self._aiida_data_nodes[self.get_aiida_label_from_graph_item(core_available_data)]
 
     def socket_from_core(self, core_generated_data: core.GeneratedData) -> TaskSocket:
@@ -215,6 +224,43 @@ class AiidaWorkGraph:
                 remote_path=str(data.path), label=label, computer=computer
             )
 
+    def _add_aiida_existing_data_node(self, data: core.ExistingData):
+        """
+        Load the output of the last successful run of the task producing `data`, which is not part of the workflow.
+
+        Only the runs of this workflow are considered, that is the workgraphs labelled with its name.
+        """
+        label = self.get_aiida_label_from_graph_item(data)
+        # The producing task has the same coordinates as its output data
+        producer_label = self.get_aiida_label(data.producer, data.coordinates)
+        # Outputs are either linked through their port or through their path, see _link_output_node_to_task
+        output_link_labels = [ShellParser.format_link_label(str(data.path))]
+        if data.port is not None:
+            output_link_labels.append(data.port)
+
+        query = aiida.orm.QueryBuilder()
+        # the process node of a workgraph is labelled with the name of the workgraph, see __init__
+        query.append(aiida.orm.WorkflowNode, tag="workgraph", filters={"label": self._core_workflow.name})
+        query.append(
+            aiida.orm.CalcJobNode,
+            with_incoming="workgraph",
+            edge_filters={"label": producer_label},
+            filters={"attributes.exit_status": 0},
+            tag="producer",
+        )
+        query.append(
+            aiida.orm.Data, with_incoming="producer", edge_filters={"label": {"in": output_link_labels}}, project="*"
+        )
+        query.order_by({"producer": {"ctime": "desc"}})
+        if (result := query.first()) is None:
+            msg = (
+                f"Could not find existing data {data.name} with coordinates {data.coordinates}: "
+                f"no successful previous run of task {producer_label!r} in workflow "
+                f"{self._core_workflow.name!r} produced it."
+            )
+            raise ValueError(msg)
+        self._aiida_data_nodes[label] = result[0]
+
     @functools.singledispatchmethod
     def create_task_node(self, task: core.Task):
         """dispatch creating task nodes based on task type"""
@@ -430,7 +476,7 @@ class AiidaWorkGraph:
         workgraph_task.add_input("workgraph.any", f"nodes.{input_label}")
 
         # resolve data
-        if isinstance(input_, core.AvailableData):
+        if isinstance(input_, core.AvailableData | core.ExistingData):
             if not hasattr(workgraph_task.inputs.nodes, f"{input_label}"):
                 msg = f"Socket {input_label!r} was not found in workgraph. Please contact a developer."
                 raise ValueError(msg)
@@ -451,7 +497,7 @@ class AiidaWorkGraph:
         workgraph_task = self.task_from_core(task)
 
         # resolve data
-        if isinstance(input_, core.AvailableData):
+        if isinstance(input_, core.AvailableData | core.ExistingData):
             setattr(workgraph_task.inputs, f"{port}", self.data_from_core(input_))
         elif isinstance(input_, core.GeneratedData):
             setattr(workgraph_task.inputs, f"{port}", self.socket_from_core(input_))
@@ -1,4 +1,5 @@
 import logging
+from io import StringIO
 from pathlib import Path
 
 import pytest
@@ -17,9 +18,15 @@ def test_parse_config_file(config_paths, pprinter):
     if test_str != reference_str:
         new_path = Path(config_paths["txt"]).with_suffix(".new.txt")
         new_path.write_text(test_str)
-        assert (
-            reference_str == test_str
-        ), f"Workflow graph doesn't match serialized data. New graph string dumped to {new_path}."
+        assert reference_str == test_str, (
+            f"Workflow graph doesn't match serialized data. New graph string dumped to {new_path}."
+        )
+
+
+def test_write_config_file(config_paths, pprinter):
+    sink = StringIO()
+    pprinter.write(Workflow.from_config_file(config_paths["yml"]), sink)
+    assert sink.getvalue() == config_paths["txt"].read_text()
 
 
 def test_vizgraph(config_paths):
@@ -61,9 +68,9 @@ def test_run_workgraph(config_paths):
         for node in output_node.called_descendants:
             LOGGER.error("%s workdir: %s", node.process_label, node.get_remote_workdir())
             LOGGER.error("%s report:\n%s", node.process_label, get_calcjob_report(node))
-    assert (
-        output_node.is_finished_ok
-    ), f"Not successful run. Got exit code {output_node.exit_code} with message {output_node.exit_message}."
+    assert output_node.is_finished_ok, (
+        f"Not successful run. Got exit code {output_node.exit_code} with message {output_node.exit_message}."
+    )
 
 
 @pytest.mark.requires_icon
@@ -103,9 +110,9 @@ def test_run_workgraph_with_icon(icon_filepath_executable, config_paths, tmp_pat
             LOGGER.error("%s workdir: %s", node.process_label, node.get_remote_workdir())
             LOGGER.error("%s report:\n%s", node.process_label, get_calcjob_report(node))
 
-    assert (
-        output_node.is_finished_ok
-    ), f"Not successful run. Got exit code {output_node.exit_code} with message {output_node.exit_message}."
+    assert output_node.is_finished_ok, (
+        f"Not successful run. Got exit code {output_node.exit_code} with message {output_node.exit_message}."
+    )
 
 
 # configs containing task using icon plugin
@@ -1,8 +1,19 @@
+import tracemalloc
+from datetime import datetime
+from itertools import chain
+
+import pytest
+
 from sirocco import pretty_print
-from sirocco.core import AvailableData, Workflow
+from sirocco.core import AvailableData, ExistingData, LazyWorkflow, Workflow
 
 # NOTE: import of ShellTask is required to populated in Task.plugin_classes in __init_subclass__
 from sirocco.core._tasks.shell_task import ShellTask  # noqa: F401
+from sirocco.core.coordinates import Coordinates
+from sirocco.core.graph_arrays import DATA_NODE, TASK_NODE
+from sirocco.core.graph_items import Array, LagOutOfRangeError
+from sirocco.parsing import ConfigWorkflow
+from sirocco.parsing.when import AnyWhen
 
 
 def test_minimal_workflow(minimal_config):
@@ -19,3 +30,415 @@ def test_minimal_workflow(minimal_config):
 def test_invert_task_io_workflow(minimal_invert_task_io_config):
     testee = Workflow.from_config_workflow(minimal_invert_task_io_config)
     pretty_print.PrettyPrinter().format(testee)
+
+    # task_b consumes the output of task_a which is unrolled after it
+    (task_b,) = (task for task in testee.tasks if task.name == "task_b")
+    assert [data.name for data in task_b.input_data_nodes()] == ["output_a"]
+
+
+def test_targets_workflow(minimal_invert_task_io_config):
+    testee = Workflow.from_config_workflow(minimal_invert_task_io_config, targets=["output_a"])
+
+    assert [task.name for task in testee.tasks] == ["task_a"]
+    assert sorted(data.name for data in testee.data) == ["available", "output_a"]
+    assert [task.name for cycle in testee.cycles for task in cycle.tasks] == ["task_a"]
+
+
+def test_targets_workflow_keeps_upstream(minimal_invert_task_io_config):
+    testee = Workflow.from_config_workflow(minimal_invert_task_io_config, targets=["task_b"])
+
+    assert sorted(task.name for task in testee.tasks) == ["task_a", "task_b"]
+    assert sorted(data.name for data in testee.data) == ["available", "output_a", "output_b"]
+
+
+def test_targets_workflow_unknown_target(minimal_invert_task_io_config):
+    with pytest.raises(ValueError, match=r".*\['nonexistent'\] are neither tasks nor data.*"):
+        Workflow.from_config_workflow(minimal_invert_task_io_config, targets=["nonexistent"])
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_targets_workflow_parameters(config_paths):
+    full = Workflow.from_config_file(str(config_paths["yml"]))
+    testee = Workflow.from_config_file(str(config_paths["yml"]), targets=["analysis_foo"])
+
+    assert {task.name for task in testee.tasks} == {"icon", "statistics_foo"}
+    assert {data.name for data in testee.data} == {
+        "initial_conditions",
+        "forcing",
+        "icon_output",
+        "icon_restart",
+        "analysis_foo",
+    }
+    assert len(list(testee.tasks)) == len([task for task in full.tasks if task.name in ("icon", "statistics_foo")])
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_subgraph_without_restriction(config_paths, pprinter):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    assert pprinter.format(workflow.subgraph()) == pprinter.format(workflow)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_subgraph_date_window(config_paths):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    # NOTE: We currently don't use timezone-aware times in config YAML, thus ignore DTZ001 for now.
+    testee = workflow.subgraph(start=datetime(2026, 7, 1), stop=datetime(2027, 1, 1))  # noqa: DTZ001
+
+    assert sorted(task.name for task in testee.tasks) == ["icon", "icon", "statistics_foo", "statistics_foo_bar"]
+    assert {task.coordinates["date"] for task in testee.tasks} == {datetime(2026, 7, 1)}  # noqa: DTZ001
+    assert len(list(testee.cycles)) == 1
+    existing = [data for data in testee.data if isinstance(data, ExistingData)]
+    assert {(data.name, data.producer, data.coordinates["foo"], data.coordinates["date"]) for data in existing} == {
+        ("icon_restart", "icon", 0, datetime(2026, 1, 1)),  # noqa: DTZ001
+        ("icon_restart", "icon", 1, datetime(2026, 1, 1)),  # noqa: DTZ001
+    }
+    # initial conditions are only used at the start date
+    assert [data.name for data in testee.data if isinstance(data, AvailableData)] == ["forcing"]
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_subgraph_tasks(config_paths):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    testee = workflow.subgraph(tasks=["statistics_foo"])
+
+    assert {task.name for task in testee.tasks} == {"statistics_foo"}
+    assert len(list(testee.tasks)) == 4
+    for task in testee.tasks:
+        assert all(isinstance(data, ExistingData) for data in task.input_data_nodes())
+        assert not any(isinstance(data, ExistingData) for data in task.output_data_nodes())
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_subgraph_parameters(config_paths):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    testee = workflow.subgraph(tasks=["icon", "statistics_foo"], parameters={"foo": [0]})
+
+    assert {task.coordinates["foo"] for task in testee.tasks if task.name == "icon"} == {0}
+    for task in testee.tasks:
+        if task.name == "statistics_foo":
+            assert {(data.coordinates["foo"], isinstance(data, ExistingData)) for data in task.input_data_nodes()} == {
+                (0, False),
+                (1, True),
+            }
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["small-shell"])
+def test_lag_out_of_range(config_paths):
+    config_workflow = ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    (restart_input,) = (item for item in config_workflow.cycles[0].tasks[0].inputs if item.port == "restart")
+    restart_input.when = AnyWhen()
+    with pytest.raises(LagOutOfRangeError, match=r"icon_restart: lag -P2M from 2026-01-01 00:00:00 leads out"):
+        Workflow.from_config_workflow(config_workflow)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["small-shell", "parameters"])
+def test_lazy_workflow(config_paths, pprinter):
+    eager = Workflow.from_config_file(str(config_paths["yml"]))
+    # cycles are formatted as they are yielded, before their tasks get evicted
+    testee = LazyWorkflow.from_config_file(str(config_paths["yml"]))
+    lazy_cycles = [pprinter.format(cycle) for cycle in testee.iter_cycles()]
+
+    assert sorted(lazy_cycles) == sorted(pprinter.format(cycle) for cycle in eager.cycles)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["small-shell"])
+def test_lazy_workflow_horizon(config_paths):
+    config_workflow = ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    (icon_cycle,) = (cycle for cycle in config_workflow.cycles if cycle.name == "bimonthly_tasks")
+    icon_cycle.cycling.stop_date = datetime(2126, 1, 1)  # noqa: DTZ001
+    testee = LazyWorkflow.from_config_workflow(config_workflow)
+
+    n_cycles = 0
+    for cycle in testee.iter_cycles():
+        n_cycles += 1
+        # current and previous cycle point, plus the one the cleanup waits on
+        assert sum(1 for _ in testee.tasks) <= 4
+        assert sum(1 for _ in testee.data) <= 8
+        if cycle.name == "lastly":
+            (cleanup,) = cycle.tasks
+            assert [task.coordinates["date"] for task in cleanup.wait_on] == [datetime(2026, 5, 1)]  # noqa: DTZ001
+    assert n_cycles == 600 + 1
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_store_select(config_paths):
+    testee = Workflow.from_config_file(str(config_paths["yml"]))
+    dates = [datetime(2026, 1, 1), datetime(2026, 7, 1), datetime(2027, 1, 1), datetime(2027, 7, 1)]  # noqa: DTZ001
+
+    icon_tasks = testee.tasks.select(name="icon", date=slice(dates[1], None))
+    assert [(task.coordinates["date"], task.coordinates["foo"]) for task in icon_tasks] == [
+        (date, foo) for date in dates[1:] for foo in (0, 1)
+    ]
+    assert {task.name for task in testee.tasks.select(date=dates[2])} == {
+        "icon",
+        "statistics_foo",
+        "statistics_foo_bar",
+        "merge",
+    }
+    assert [task.coordinates["date"] for task in testee.tasks.select(name="icon", foo=1, bar=3.0)] == dates
+    assert testee.tasks.select(name="merge", foo=0) == []
+    assert testee.tasks.select(name="nonexistent") == []
+
+    (restart,) = testee.data.select(name="icon_restart", date=dates[0], foo=0)
+    producer = testee.producer(restart)
+    assert producer is not None
+    assert (producer.name, producer.coordinates) == ("icon", restart.coordinates)
+    assert [task.coordinates["date"] for task in testee.consumers(restart)] == [dates[1]]
+    assert testee.cycle_of(producer).name == "bimonthly_tasks"
+    (forcing,) = testee.data.select(name="forcing")
+    assert testee.producer(forcing) is None
+    assert len(testee.consumers(forcing)) == 8
+
+    # the index built by the first selection follows later evictions and additions
+    assert restart in testee.data.evict_before(dates[1])
+    assert testee.data.select(date=dates[0]) == []
+    testee.data.add(restart)
+    assert testee.data.select(name="icon_restart", date=slice(None, dates[1])) == [restart]
+
+
+def test_coordinates_keep_value_types():
+    assert repr(Coordinates({"bar": 3.0})) == "{'bar': 3.0}"
+    assert repr(Coordinates({"bar": 3})) == "{'bar': 3}"
+    assert Coordinates({"bar": 1})["bar"] is not True
+    assert Coordinates({"bar": True})["bar"] is True
+    assert Coordinates({"bar": 3}) != Coordinates({"bar": 3.0})
+    # the same rule applies to plain mappings
+    assert Coordinates({"bar": 3}) == {"bar": 3}
+    assert Coordinates({"bar": 3}) != {"bar": 3.0}
+    assert {"bar": 3.0} == Coordinates({"bar": 3.0})  # noqa: SIM300 reflected comparison
+    assert Coordinates({"bar": 3}) != {"bar": 3, "foo": 0}
+    assert Coordinates({"bar": 3}) != {"bar": [3]}
+
+
+def test_array_setitem():
+    testee = Array[str]("foo", parameters={"foo": [1, 0]})
+    testee[{"date": datetime(2026, 1, 1), "foo": 0}] = "first"  # noqa: DTZ001
+    testee[Coordinates({"date": datetime(2026, 1, 1), "foo": 1})] = "second"  # noqa: DTZ001
+
+    assert testee[{"date": datetime(2026, 1, 1), "foo": 0}] == "first"  # noqa: DTZ001
+    assert testee[Coordinates({"date": datetime(2026, 1, 1), "foo": 1})] == "second"  # noqa: DTZ001
+    assert list(testee) == ["first", "second"]
+    with pytest.raises(KeyError, match="already used"):
+        testee[{"date": datetime(2026, 1, 1), "foo": 0}] = "third"  # noqa: DTZ001
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_graph_arrays(config_paths):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    testee = workflow.graph_arrays
+
+    assert testee is workflow.graph_arrays
+    assert len(testee) == 18 + 28
+    assert (testee.node_type == TASK_NODE).sum() == 18
+    assert (testee.node_type == DATA_NODE).sum() == 28
+    assert len(testee.data_indices) == sum(
+        1 for task in workflow.tasks for _ in chain(task.input_data_nodes(), task.output_data_nodes())
+    )
+    cycles = list(workflow.cycles)
+    date_column = testee.dims.index("date")
+    for task in workflow.tasks:
+        task_id = testee.node_id(task)
+        assert testee.nodes[task_id] is task
+        assert testee.names[testee.name_index[task_id]] == task.name
+        assert cycles[testee.cycle_index[task_id]] is workflow.cycle_of(task)
+        assert testee.values[date_column][testee.coordinates[task_id, date_column]] == task.coordinates["date"]
+        successors = testee.data_indices[testee.data_indptr[task_id] : testee.data_indptr[task_id + 1]]
+        assert [id(testee.nodes[node_id]) for node_id in successors] == [id(data) for data in task.output_data_nodes()]
+    (forcing,) = workflow.data.select(name="forcing")
+    forcing_id = testee.node_id(forcing)
+    assert testee.cycle_index[forcing_id] == -1
+    assert not testee.has_coordinate[forcing_id].any()
+    assert (testee.coordinates[forcing_id] == -1).all()
+    assert len(testee.successors(forcing_id)) == 8
+    # the value tables of the workflow travel with the arrays, whatever else the process has encoded
+    assert list(testee.values[date_column]) == sorted(testee.values[date_column])
+    assert testee.values[testee.dims.index("foo")] == (0, 1)
+    assert testee.values[testee.dims.index("bar")] == (3.0,)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_declared_parameter_order(config_paths):
+    config_workflow = ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    config_workflow.parameters["foo"] = [1, 0]
+    testee = Workflow.from_config_workflow(config_workflow)
+
+    for task in testee.tasks.select(name="statistics_foo"):
+        assert [data.coordinates["foo"] for data in task.input_data_nodes()] == [1, 0]
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_structural_hash(config_paths):
+    testee = Workflow.from_config_file(str(config_paths["yml"]))
+
+    assert testee.structural_hash == Workflow.from_config_file(str(config_paths["yml"])).structural_hash
+    assert testee.structural_hash != testee.subgraph(tasks=["icon"]).structural_hash
+
+    config_workflow = ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    (merge,) = (task for task in config_workflow.tasks if task.name == "merge")
+    merge.command = "python merge.py --fast {PORT::None}"
+    modified = Workflow.from_config_workflow(config_workflow)
+    assert modified.structural_hash != testee.structural_hash
+    assert {
+        (task.name, task.coordinates["date"])
+        for task in modified.tasks
+        if modified.node_hash(task) != testee.node_hash(testee.tasks[task.name, task.coordinates])
+    } == {("merge", datetime(2026, 1, 1)), ("merge", datetime(2027, 1, 1))}  # noqa: DTZ001
+    assert {
+        data.name
+        for data in modified.data
+        if modified.node_hash(data) != testee.node_hash(testee.data[data.name, data.coordinates])
+    } == {"yearly_analysis"}
+    assert {
+        cycle.name
+        for cycle in modified.cycles
+        if modified.cycle_hash(cycle) != testee.cycle_hash(testee.cycles[cycle.name, cycle.coordinates])
+    } == {"yearly"}
+
+    # a change upstream reaches all the nodes depending on it
+    (icon,) = (task for task in config_workflow.tasks if task.name == "icon")
+    icon.command = f"{icon.command} --fast"
+    modified = Workflow.from_config_workflow(config_workflow)
+    changed = {
+        node.name
+        for store, reference in ((modified.tasks, testee.tasks), (modified.data, testee.data))
+        for node in store
+        if modified.node_hash(node) != testee.node_hash(reference[node.name, node.coordinates])
+    }
+    assert changed == {
+        "icon",
+        "icon_output",
+        "icon_restart",
+        "statistics_foo",
+        "analysis_foo",
+        "statistics_foo_bar",
+        "analysis_foo_bar",
+        "merge",
+        "yearly_analysis",
+    }
+
+
+def test_subgraph_unknown_task(minimal_config):
+    with pytest.raises(ValueError, match=r".*\['nonexistent'\] are not tasks.*"):
+        Workflow.from_config_workflow(minimal_config).subgraph(tasks=["nonexistent"])
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_extension(config_paths):
+    previous = ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    for cycle in previous.cycles:
+        cycle.cycling.stop_date = datetime(2027, 1, 1)  # noqa: DTZ001
+    testee = Workflow.from_config_extension(previous, ConfigWorkflow.from_config_file(str(config_paths["yml"])))
+
+    assert {task.coordinates["date"] for task in testee.tasks} == {
+        datetime(2027, 1, 1),  # noqa: DTZ001
+        datetime(2027, 7, 1),  # noqa: DTZ001
+    }
+    for task in testee.tasks:
+        if task.name == "icon" and task.coordinates["date"] == datetime(2027, 1, 1):  # noqa: DTZ001
+            (restart,) = task.inputs["restart"]
+            assert isinstance(restart, ExistingData)
+            assert restart.coordinates["date"] == datetime(2026, 7, 1)  # noqa: DTZ001
+
+
+BENCHMARK_CONFIG = """
+cycles:
+  - daily:
+      cycling:
+        start_date: '2000-01-01T00:00'
+        stop_date: '2002-01-01T00:00'
+        period: P1D
+      tasks:
+        - model:
+            inputs:
+              - initial_conditions:
+                  when:
+                    at: '2000-01-01T00:00'
+                  port: init
+              - restart:
+                  when:
+                    after: '2000-01-01T00:00'
+                  target_cycle:
+                    lag: -P1D
+                  parameters:
+                    member: single
+                  port: restart
+            outputs: [restart, output]
+        - postprocess:
+            inputs:
+              - output:
+                  parameters:
+                    member: single
+                  port: input
+            outputs: [postprocessed]
+tasks:
+  - model:
+      plugin: shell
+      computer: localhost
+      command: model
+      parameters: [member]
+  - postprocess:
+      plugin: shell
+      computer: localhost
+      command: postprocess
+      parameters: [member]
+data:
+  available:
+    - initial_conditions:
+        computer: localhost
+        path: /initial_conditions
+  generated:
+    - restart:
+        path: restart
+        parameters: [member]
+    - output:
+        path: output
+        parameters: [member]
+    - postprocessed:
+        path: postprocessed
+        parameters: [member]
+parameters:
+  member: [%s]
+"""
+
+
+@pytest.mark.slow
+def test_unrolling_large_graph(tmp_path):
+    """Unroll a graph with 1e5+ tasks and check its size and lagged links, this is not a timing benchmark"""
+    n_members = 70
+    config_path = tmp_path / "benchmark.yml"
+    config_path.write_text(BENCHMARK_CONFIG % ", ".join(str(member) for member in range(n_members)))
+    testee = Workflow.from_config_file(str(config_path))
+
+    assert sum(1 for _ in testee.tasks) == 2 * 731 * n_members
+    (last_model,) = testee.tasks.select(name="model", date=datetime(2001, 12, 31), member=n_members - 1)  # noqa: DTZ001
+    (restart,) = last_model.inputs["restart"]
+    assert restart.coordinates["date"] == datetime(2001, 12, 30)  # noqa: DTZ001
+    assert restart.coordinates["member"] == n_members - 1
+
+
+@pytest.mark.slow
+def test_streaming_pretty_print(tmp_path, pprinter):
+    """Print a graph with 1e5+ tasks and check that the memory used does not grow with it"""
+    config_path = tmp_path / "benchmark.yml"
+    config_path.write_text(BENCHMARK_CONFIG % ", ".join(str(member) for member in range(70)))
+    testee = Workflow.from_config_file(str(config_path))
+
+    with (tmp_path / "workflow.txt").open("w") as sink:
+        tracemalloc.start()
+        pprinter.write(testee, sink)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert peak < 1_000_000
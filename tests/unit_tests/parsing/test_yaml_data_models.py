@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import pytest
 
 from sirocco.parsing import yaml_data_models as models
@@ -7,6 +9,39 @@ def test_base_data():
     models.ConfigBaseData(name="name", format=None)
 
 
+def test_date_cycling_timeline():
+    cycling = models.DateCycling(start_date="2026-01-01T00:00", stop_date="2027-01-01T00:00", period="P3M")
+    timeline = cycling.timeline
+    assert len(timeline) == 4
+    assert cycling.timeline is timeline
+    assert [point.index for point in cycling.iter_cycle_points()] == [0, 1, 2, 3]
+    assert timeline.index(datetime(2026, 7, 1)) == 2  # noqa: DTZ001
+    assert timeline.index(datetime(2026, 8, 1)) is None  # noqa: DTZ001
+    window = list(cycling.iter_cycle_points(start=datetime(2026, 2, 1), stop=datetime(2026, 10, 1)))  # noqa: DTZ001
+    assert [point.chunk_start_date for point in window] == [datetime(2026, 4, 1), datetime(2026, 7, 1)]  # noqa: DTZ001
+    # the timeline follows changes of the cycling dates
+    cycling.stop_date = datetime(2027, 7, 1)  # noqa: DTZ001
+    assert len(cycling.timeline) == 6
+
+
+@pytest.mark.parametrize(
+    "when_spec",
+    [
+        {"at": "2026-04-01T00:00"},
+        {"at": ["2026-10-01T00:00", "2026-01-01T00:00", "2026-02-01T00:00"]},
+        {"before": "2026-07-01T00:00"},
+        {"after": "2026-04-01T00:00", "before": "2026-10-01T00:00"},
+        {},
+    ],
+)
+def test_when_activity_mask(when_spec):
+    when = models.select_when(when_spec) if when_spec else models.AnyWhen()
+    cycling = models.DateCycling(start_date="2026-01-01T00:00", stop_date="2027-01-01T00:00", period="P3M")
+    mask = cycling.timeline.activity_mask(when)
+    assert mask.tolist() == [when.is_active(point.chunk_start_date) for point in cycling.iter_cycle_points()]
+    assert cycling.timeline.activity_mask(when) is mask
+
+
 def test_load_workflow_config(minimal_config_path):
     testee = models.ConfigWorkflow.from_config_file(str(minimal_config_path))
     assert testee.name == "minimal"
@@ -32,3 +67,30 @@ def test_from_config_file_is_empty(tmp_path):
     empty_file.write_text("")
     with pytest.raises(ValueError, match=r".*empty_file is empty.*"):
         _ = models.ConfigWorkflow.from_config_file(empty_file)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_extension_start_date(config_paths):
+    previous = models.ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    extended = models.ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    # NOTE: We currently don't use timezone-aware times in config YAML, thus ignore DTZ001 for now.
+    for cycle in previous.cycles:
+        cycle.cycling.stop_date = datetime(2027, 1, 1)  # noqa: DTZ001
+    assert extended.extension_start_date(previous) == datetime(2027, 1, 1)  # noqa: DTZ001
+
+    # the previous stop date must lie on a chunk boundary
+    for cycle in previous.cycles:
+        cycle.cycling.stop_date = datetime(2026, 10, 1)  # noqa: DTZ001
+    with pytest.raises(ValueError, match=r".*does not lie on a chunk boundary.*"):
+        extended.extension_start_date(previous)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_extension_start_date_other_changes(config_paths):
+    previous = models.ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    extended = models.ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    extended.parameters = {"foo": [0, 1, 2], "bar": [3.0]}
+    with pytest.raises(ValueError, match=r".*same tasks, data and parameters.*"):
+        extended.extension_start_date(previous)
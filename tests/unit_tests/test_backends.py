@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+import pytest
+
+from sirocco import backends, vizgraph
+
+
+@pytest.mark.parametrize("module", ["sirocco.parsing", "sirocco.core"])
+def test_light_import(module):
+    script = f"import sys, {module}; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    imported = set(result.stdout.split())
+    assert module in imported
+    heavy = {"aiida", "aiida_workgraph", "pygraphviz", "sirocco.workgraph", "sirocco.vizgraph"}
+    assert not heavy & imported
+    if module == "sirocco.parsing":
+        assert "sirocco.core" not in imported
+
+
+def test_load_backend():
+    assert {"workgraph", "vizgraph"} <= set(backends.available_backends())
+    assert backends.load_backend("vizgraph") is vizgraph
+    with pytest.raises(KeyError, match="Unknown backend 'nonexistent'"):
+        backends.load_backend("nonexistent")
@@ -4,14 +4,19 @@ These tests focus on the CLI layer, testing command parsing and basic integratio
 underlying functionality which should be tested elsewhere.
 """
 
+import json
 import re
 import subprocess
+import sys
 from unittest.mock import Mock
 
 import pytest
 import typer.testing
 
-from sirocco.cli import app
+from sirocco.cli import app, parse_parameter_values
+
+# import time of the CLI, generous to not fail on slow machines, but far from the time needed to load AiiDA
+CLI_IMPORT_BUDGET_US = 1_500_000
 
 
 def strip_ansi(text):
@@ -77,7 +82,7 @@ def mock_failed_run(mock_aiida_wg):
 def mock_create_aiida_workflow_factory(mock_wg):
     """Factory function to create a mock_create_aiida_workflow function."""
 
-    def mock_create_aiida_workflow(_workflow_file):
+    def mock_create_aiida_workflow(_workflow_file, **_kwargs):
         return mock_wg
 
     return mock_create_aiida_workflow
@@ -97,6 +102,31 @@ class TestCLICommands:
         assert "run" in result.stdout
         assert "submit" in result.stdout
 
+    def test_cli_import_is_light(self):
+        """Test that importing the CLI neither loads AiiDA nor graphviz and stays within its time budget."""
+        command = [sys.executable, "-X", "importtime", "-c", "import sirocco.cli"]
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        assert result.returncode == 0
+        # lines of the form "import time: <self [us]> | <cumulative [us]> | <indented module name>"
+        imports = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, module = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                imports[module.strip()] = int(cumulative)
+        heavy = {"aiida", "aiida_workgraph", "aiida_icon", "aiida_shell", "pygraphviz", "sirocco.workgraph"}
+        assert not heavy & set(imports)
+        assert imports["sirocco.cli"] < CLI_IMPORT_BUDGET_US
+
+    def test_verify_without_aiida(self, minimal_config_path):
+        """Test that the help and the verify command work when AiiDA can't be imported."""
+        # a None entry in sys.modules makes any import of the module fail
+        script = "import sys; sys.modules['aiida'] = None; from sirocco.cli import app; app()"
+        for args in (["--help"], ["verify", str(minimal_config_path)]):
+            result = subprocess.run([sys.executable, "-c", script, *args], capture_output=True, text=True, check=False)
+            assert result.returncode == 0, result.stderr
+
     @pytest.mark.parametrize("command", ["verify", "represent", "visualize", "run", "submit"])
     def test_command_with_nonexistent_workflow(self, runner, command):
         """Test commands with nonexistent workflow files."""
@@ -173,6 +203,40 @@ class TestCLICommands:
         assert "cycles:" in result.stdout  # Should contain workflow structure
         assert "minimal" in result.stdout  # Should contain workflow name
 
+    def test_represent_command_unknown_target(self, runner, minimal_config_path):
+        """Test the represent command fails for a target that is not part of the workflow."""
+
+        result = runner.invoke(app, ["represent", str(minimal_config_path), "--target", "nonexistent"])
+
+        assert result.exit_code == 1
+        assert "❌ Failed to represent workflow" in result.stdout
+
+    def test_represent_command_jsonl(self, runner, minimal_config_path):
+        """Test the represent command exporting records as JSON Lines."""
+
+        result = runner.invoke(app, ["represent", str(minimal_config_path), "--format", "jsonl"])
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+        assert [(record["record"], record["name"]) for record in records] == [("task", "a"), ("data", "c")]
+        assert records[0]["cycle"] == "minimal"
+        assert records[1]["path"] == "/c.txt"
+
+    def test_represent_command_parquet_requires_output(self, runner, minimal_config_path):
+        """Test the represent command refuses to write Parquet to stdout."""
+
+        result = runner.invoke(app, ["represent", str(minimal_config_path), "--format", "parquet"])
+
+        assert result.exit_code == 2
+
+    def test_diff_command(self, runner, minimal_config_path):
+        """Test the diff command on identical workflows."""
+
+        result = runner.invoke(app, ["diff", str(minimal_config_path), str(minimal_config_path)])
+
+        assert result.exit_code == 0
+        assert "no differences" in result.stdout
+
     @pytest.mark.usefixtures("aiida_localhost")
     def test_run_command(self, runner, minimal_config_path, mock_successful_run, monkeypatch):
         """Test the run command."""
@@ -225,6 +289,13 @@ class TestCLICommands:
         assert "❌ Workflow submission failed" in result.stdout
 
 
+def test_parse_parameter_values():
+    assert parse_parameter_values(None) is None
+    assert parse_parameter_values(["foo=0", "foo=1", "bar=3.0", "baz=a"]) == {"foo": [0, 1], "bar": [3.0], "baz": ["a"]}
+    with pytest.raises(typer.BadParameter):
+        parse_parameter_values(["foo"])
+
+
 def test_create_aiida_workflow_invalid_file(capsys):
     """Test workflow preparation with invalid config file."""
     from sirocco.cli import create_aiida_workflow
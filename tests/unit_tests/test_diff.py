@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+
+from sirocco.core import Workflow
+from sirocco.diff import diff_workflows
+from sirocco.parsing import ConfigWorkflow
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_diff_workflows(config_paths):
+    old = Workflow.from_config_file(str(config_paths["yml"]))
+    assert not diff_workflows(old, Workflow.from_config_file(str(config_paths["yml"])))
+
+    config_workflow = ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    (merge,) = (task for task in config_workflow.tasks if task.name == "merge")
+    merge.command = "python merge.py --fast {PORT::None}"
+    (yearly,) = (cycle for cycle in config_workflow.cycles if cycle.name == "yearly")
+    yearly.cycling.stop_date = datetime(2027, 1, 1)  # noqa: DTZ001
+    testee = diff_workflows(old, Workflow.from_config_workflow(config_workflow))
+
+    assert {
+        (group, change.status, change.node.name, change.node.coordinates["date"])
+        for group, changes in testee.changes.items()
+        for change in changes
+    } == {
+        ("yearly [date: 2026-01-01 00:00:00]", "modified", "merge", datetime(2026, 1, 1)),  # noqa: DTZ001
+        ("yearly [date: 2027-01-01 00:00:00]", "removed", "merge", datetime(2027, 1, 1)),  # noqa: DTZ001
+        ("yearly [date: 2027-01-01 00:00:00]", "removed", "yearly_analysis", datetime(2027, 1, 1)),  # noqa: DTZ001
+    }
+    (modified,) = testee.changes["yearly [date: 2026-01-01 00:00:00]"]
+    assert modified.details == ["~ command: 'python merge.py {PORT::None}' -> 'python merge.py --fast {PORT::None}'"]
+    assert "~ task merge [date: 2026-01-01 00:00:00]" in testee.format()
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["small-shell"])
+def test_diff_workflows_edges(config_paths):
+    old = Workflow.from_config_file(str(config_paths["yml"]))
+    config_workflow = ConfigWorkflow.from_config_file(str(config_paths["yml"]))
+    (lastly,) = (cycle for cycle in config_workflow.cycles if cycle.name == "lastly")
+    lastly.tasks[0].wait_on[0].target_cycle.dates = [datetime(2026, 3, 1)]  # noqa: DTZ001
+    testee = diff_workflows(old, Workflow.from_config_workflow(config_workflow))
+
+    (change,) = testee.changes["lastly"]
+    assert change.status == "modified"
+    assert change.details == [
+        "- wait_on: icon [date: 2026-05-01 00:00:00]",
+        "+ wait_on: icon [date: 2026-03-01 00:00:00]",
+    ]
@@ -0,0 +1,59 @@
+import io
+import json
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from sirocco.core import Workflow
+from sirocco.core.fingerprint import iter_edges
+from sirocco.export import RECORD_COLUMNS, iter_records, write_jsonl, write_parquet
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_write_jsonl(config_paths):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    sink = io.StringIO()
+    write_jsonl(workflow, sink)
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+
+    n_edges = sum(1 for task in workflow.tasks for _ in iter_edges(task))
+    assert Counter(record["record"] for record in records) == {"task": 18, "data": 28, "edge": n_edges}
+    assert all(set(record) <= set(RECORD_COLUMNS) for record in records)
+
+    nodes = {record["id"]: record for record in records if record["record"] != "edge"}
+    (merge,) = (
+        record for record in records if record.get("name") == "merge" and record["date"] == "2027-01-01T00:00:00"
+    )
+    assert merge["cycle"] == "yearly"
+    assert merge["coordinates"] == {"date": "2027-01-01T00:00:00"}
+    assert merge["computer"] == "remote"
+    inputs = [
+        nodes[record["source"]]
+        for record in records
+        if record["record"] == "edge" and record["kind"] == "input" and record["target"] == merge["id"]
+    ]
+    assert {(node["name"], node["date"]) for node in inputs} == {
+        ("analysis_foo_bar", "2027-01-01T00:00:00"),
+        ("analysis_foo_bar", "2027-07-01T00:00:00"),
+    }
+    assert all(node["cycle"] == "bimonthly_tasks" for node in inputs)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["small-shell"])
+def test_write_parquet(config_paths, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    write_parquet(workflow, tmp_path / "workflow.parquet", batch_size=4)
+
+    table = pq.read_table(tmp_path / "workflow.parquet")
+    assert table.column_names == list(RECORD_COLUMNS)
+    records = list(iter_records(workflow))
+    assert table.num_rows == len(records)
+    assert table.column("date").to_pylist() == [record["date"] for record in records]
+    first_task = table.slice(0, 1).to_pylist()[0]
+    assert first_task["record"] == "task"
+    assert first_task["date"] == datetime(2026, 1, 1)  # noqa: DTZ001
+    assert json.loads(first_task["coordinates"]) == {"date": "2026-01-01T00:00:00"}
@@ -0,0 +1,149 @@
+import json
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from itertools import pairwise
+
+import pytest
+
+from sirocco.core import Workflow
+from sirocco.graph_viewer import STUB_KIND, TASK_KIND, graph_json, render_html
+from sirocco.vizgraph import CollapsedVizGraph, VizGraph
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_collapsed_vizgraph(config_paths):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    viz_graph = CollapsedVizGraph.from_core_workflow(workflow)
+    agraph = viz_graph.agraph
+
+    # one node per name and parameter values, one cluster per cycle
+    assert len(agraph.nodes()) == 14
+    assert sorted(cluster.graph_attr["label"] for cluster in agraph.subgraphs()) == [
+        "bimonthly_tasks x4",
+        "yearly x2",
+    ]
+    (icon,) = workflow.tasks.select("icon", date=datetime(2026, 7, 1), foo=0)  # noqa: DTZ001
+    (icon_restart,) = workflow.data.select("icon_restart", date=icon.coordinates["date"], foo=0)
+    icon_key = viz_graph.group_key(icon)
+    assert agraph.get_node(icon_key).attr["label"].endswith("x4")
+    lags = {(*edge, edge.attr.get("label")) for edge in agraph.edges()}
+    assert (viz_graph.group_key(icon_restart), icon_key, "-P6M") in lags
+    assert {label for _, target, label in lags if target.startswith("task:merge")} >= {"P6M"}
+
+    collapsed = CollapsedVizGraph.from_core_workflow(workflow, collapsed_parameters=("foo", "bar"))
+    task_labels = {node.attr["label"] for node in collapsed.agraph.nodes() if node.startswith("task:")}
+    assert task_labels == {"icon\nx8", "statistics_foo\nx4", "statistics_foo_bar\nx4", "merge\nx2"}
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_vizgraph_window_stubs(config_paths):
+    workflow = Workflow.from_config_file(
+        str(config_paths["yml"]),
+        start=datetime(2027, 1, 1),  # noqa: DTZ001
+        stop=datetime(2027, 7, 1),  # noqa: DTZ001
+    )
+    (icon_restart,) = workflow.data.select("icon_restart", date=datetime(2027, 1, 1), foo=0)  # noqa: DTZ001
+    assert workflow.outside_consumers(icon_restart) == ["icon"]
+
+    agraph = VizGraph.from_core_workflow(workflow).agraph
+    assert len(agraph.nodes()) < len(VizGraph.from_config_file(str(config_paths["yml"])).agraph.nodes())
+    stubs = {(node.attr["label"], node.startswith("producer")) for node in agraph.nodes() if " of " in node}
+    # restarts from the previous cycle point and for the next one, late analysis for the yearly merge
+    assert stubs == {("icon", True), ("icon", False), ("statistics_foo_bar", True)}
+
+    # one stub per outside task and group in the collapsed view
+    agraph = CollapsedVizGraph.from_core_workflow(workflow, collapsed_parameters=("foo", "bar")).agraph
+    stubs = [(node.attr["label"], node.startswith("producer")) for node in agraph.nodes() if " of " in node]
+    assert sorted(stubs) == [("icon", False), ("icon", True), ("statistics_foo_bar", True)]
+    stub_edges = [edge for edge in agraph.edges() if " of " in edge[0] or " of " in edge[1]]
+    assert len(stub_edges) == len(stubs)
+    assert all((target if " of " in source else source).startswith("data:") for source, target in stub_edges)
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["small-shell"])
+def test_vizgraph_cache(config_paths, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first, second, collapsed = (tmp_path / f"{name}.svg" for name in ("first", "second", "collapsed"))
+
+    assert not VizGraph.from_config_file(str(config_paths["yml"])).draw(file_path=first, cache_dir=cache_dir)
+    assert len(list(cache_dir.iterdir())) == 1
+    # unrolled again from scratch, the workflow is unchanged
+    assert VizGraph.from_config_file(str(config_paths["yml"])).draw(file_path=second, cache_dir=cache_dir)
+    assert second.read_bytes() == first.read_bytes()
+
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    assert not CollapsedVizGraph.from_core_workflow(workflow).draw(file_path=collapsed, cache_dir=cache_dir)
+    assert len(list(cache_dir.iterdir())) == 2
+
+    # same structure under another name, which titles the svg
+    workflow.name = "renamed"
+    assert not VizGraph.from_core_workflow(workflow).draw(file_path=second, cache_dir=cache_dir)
+    assert b"<title>renamed</title>" in second.read_bytes()
+    assert len(list(cache_dir.iterdir())) == 3
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["small-shell"])
+def test_vizgraph_render(config_paths):
+    svg = VizGraph.from_config_file(str(config_paths["yml"])).render()
+
+    root = ET.fromstring(svg)
+    assert root.get("onload") == "addInteractivity(evt)"
+    assert [child.tag.rpartition("}")[2] for child in root][-2:] == ["style", "script"]
+    assert "addInteractivity" in root[-1].text
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_vizgraph_parallel_layout(config_paths):
+    viz_graph = VizGraph.from_config_file(str(config_paths["yml"]))
+    svg = viz_graph.render(processes=2)
+
+    ET.fromstring(svg)
+    agraph = viz_graph.agraph
+    assert all(node.attr["pos"] for node in agraph.nodes())
+    assert all(edge.attr["pos"] for edge in agraph.edges())
+    # cycle points are placed along the time axis, without overlapping
+    clusters = {cluster.name: cluster for cluster in agraph.subgraphs()}
+    bimonthly = sorted(
+        (date, *(float(value) for value in clusters[name].graph_attr["bb"].split(",")[::2]))
+        for name, cycle_name, date in viz_graph._clusters  # noqa: SLF001 | private-member-access
+        if cycle_name == "bimonthly_tasks"
+    )
+    assert len(bimonthly) == 4
+    assert all(right < next_left for (_, _, right), (_, next_left, _) in pairwise(bimonthly))
+
+
+@pytest.mark.usefixtures("config_case")
+@pytest.mark.parametrize("config_case", ["parameters"])
+def test_graph_json(config_paths):
+    workflow = Workflow.from_config_file(str(config_paths["yml"]))
+    graph = graph_json(workflow)
+
+    assert graph["kind"].count(TASK_KIND) == 18
+    assert len(graph["kind"]) == 18 + 28
+    n_edges = sum(len(list(task.input_data_nodes())) + len(list(task.output_data_nodes())) for task in workflow.tasks)
+    assert len(graph["edges"]) == 2 * n_edges
+    assert all(len(column) == len(graph["kind"]) for column in graph["coords"])
+    assert graph["cycles"]["label"] == [VizGraph.tooltip(cycle) for cycle in workflow.cycles]
+    assert graph["styles"]["task"]["fillcolor"] == VizGraph.task_node_kw["fillcolor"]
+    # the names and values tables give back the nodes
+    date_dim = graph["dims"].index("date")
+    dates = [graph["values"][date_dim][code] if code >= 0 else None for code in graph["coords"][date_dim]]
+    (merge,) = (
+        i
+        for i, name in enumerate(graph["name"])
+        if graph["names"][name] == "merge" and dates[i] == "2027-01-01 00:00:00"
+    )
+    assert graph["cycles"]["name"][graph["cycle"][merge]] == "yearly"
+
+    window = workflow.subgraph(start=datetime(2027, 1, 1), stop=datetime(2027, 7, 1))  # noqa: DTZ001
+    assert graph_json(window)["kind"].count(STUB_KIND) == 3 + 2  # incoming restarts and analysis, outgoing restarts
+
+    html = render_html(workflow)
+    data = re.search(r'<script type="application/json" id="graph-data">(.*?)</script>', html, re.DOTALL)
+    assert json.loads(data.group(1)) == json.loads(json.dumps(graph))
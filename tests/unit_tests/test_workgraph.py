@@ -1,6 +1,11 @@
+from datetime import datetime
+
+import aiida.orm
 import pytest
+from aiida.common.links import LinkType
+from aiida_shell.parsers.shell import ShellParser
 
-from sirocco.core import Workflow
+from sirocco.core import ExistingData, Workflow
 from sirocco.parsing.yaml_data_models import ConfigWorkflow
 from sirocco.workgraph import AiidaWorkGraph
 
@@ -130,3 +135,36 @@ def test_waiting_on(config_paths):
     aiida_workflow = AiidaWorkGraph(core_workflow)
 
     assert len(aiida_workflow._workgraph.tasks["cleanup"].waiting_on) == 1  # noqa: SLF001
+
+
+def store_previous_run(workflow_name: str, producer_label: str, output_link_label: str) -> aiida.orm.Data:
+    """Store the provenance of a finished workgraph run in which a task produced a data node"""
+    workgraph = aiida.orm.WorkflowNode(label=workflow_name).store()
+    producer = aiida.orm.CalcJobNode()
+    producer.base.links.add_incoming(workgraph, link_type=LinkType.CALL_CALC, link_label=producer_label)
+    producer.store()
+    producer.set_exit_status(0)
+    output = aiida.orm.Data()
+    output.base.links.add_incoming(producer, link_type=LinkType.CREATE, link_label=output_link_label)
+    output.store()
+    return output
+
+
+@pytest.mark.usefixtures("config_case", "aiida_localhost", "aiida_remote_computer")
+@pytest.mark.parametrize("config_case", ["small-shell"])
+def test_existing_data(config_paths):
+    core_workflow = Workflow.from_config_file(str(config_paths["yml"]), start=datetime(2026, 3, 1))  # noqa: DTZ001
+    (restart,) = (data for data in core_workflow.data if isinstance(data, ExistingData))
+    producer_label = AiidaWorkGraph.get_aiida_label(restart.producer, restart.coordinates)
+    output_link_label = ShellParser.format_link_label(str(restart.path))
+
+    # only runs of other workflows
+    store_previous_run(f"other_{core_workflow.name}", producer_label, output_link_label)
+    with pytest.raises(ValueError, match="Could not find existing data icon_restart"):
+        AiidaWorkGraph(core_workflow)
+
+    # a later run of another workflow doesn't shadow the run of this one
+    previous_output = store_previous_run(core_workflow.name, producer_label, output_link_label)
+    store_previous_run(f"other_{core_workflow.name}", producer_label, output_link_label)
+    aiida_workflow = AiidaWorkGraph(core_workflow)
+    assert aiida_workflow.data_from_core(restart).uuid == previous_output.uuid